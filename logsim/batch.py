@@ -0,0 +1,121 @@
+"""Run many simulation scenarios of one circuit across a process pool.
+
+Used in the Logic Simulator project to run regression and parameter sweeps
+on more than one core. The parsed circuit is pickled once and sent to every
+worker, which rebuilds a fresh copy of it for each scenario.
+
+Classes
+-------
+BatchRunner - runs simulation scenarios of a parsed circuit in parallel.
+"""
+import multiprocessing
+import pickle
+
+# Pickled (names, devices, network, monitors) of the circuit, set in each
+# worker process by init_worker
+worker_circuit = None
+
+
+def init_worker(circuit):
+    """Store the pickled circuit in the worker process."""
+    global worker_circuit
+    worker_circuit = circuit
+
+
+def run_worker(scenario):
+    """Run one scenario on a fresh copy of the worker's circuit."""
+    return BatchRunner.run_circuit(worker_circuit, scenario)
+
+
+class BatchRunner:
+
+    """Run simulation scenarios of a parsed circuit in parallel.
+
+    A scenario is a dictionary with the switch states to set, the number of
+    cycles to run, and the seed used for the cold startup of the devices.
+    Each scenario runs from scratch, like the run command of the user
+    interfaces, on its own copy of the circuit.
+
+    Parameters
+    ----------
+    names: instance of the names.Names() class.
+    devices: instance of the devices.Devices() class.
+    network: instance of the network.Network() class.
+    monitors: instance of the monitors.Monitors() class.
+    processes: number of worker processes, or None for one per core.
+
+    Public methods
+    --------------
+    make_scenario(switches=None, cycles=10, seed=None): Returns a scenario
+                                                        dictionary.
+
+    run_circuit(circuit, scenario): Runs one scenario on a fresh copy of a
+                                    pickled circuit.
+
+    run(self, scenarios): Runs all the scenarios and returns their results.
+    """
+
+    def __init__(self, names, devices, network, monitors, processes=None):
+        """Pickle the circuit once for all the workers."""
+        self.circuit = pickle.dumps((names, devices, network, monitors))
+        self.processes = processes
+
+    @staticmethod
+    def make_scenario(switches=None, cycles=10, seed=None):
+        """Return a scenario dictionary.
+
+        switches maps switch name strings to their state, 0 (LOW) or 1
+        (HIGH).
+        """
+        if switches is None:
+            switches = {}
+        return {"switches": switches,
+                "cycles": cycles,
+                "seed": seed}
+
+    @staticmethod
+    def run_circuit(circuit, scenario):
+        """Run one scenario on a fresh copy of the pickled circuit.
+
+        Return a result dictionary with the monitor traces
+        {(device_id, output_id): [signal_list]}, the number of cycles
+        completed, whether the network oscillated and its period in cycles,
+        if it was found to be periodic.
+        """
+        (names, devices, network, monitors) = pickle.loads(circuit)
+        result = {"traces": None,
+                  "cycles_completed": 0,
+                  "oscillating": False,
+                  "period": None,
+                  "error": None}
+
+        for switch_name, state in scenario["switches"].items():
+            switch_id = names.query(switch_name)
+            if switch_id is None or not devices.set_switch(switch_id, state):
+                result["error"] = "".join(["Invalid switch: ", switch_name])
+                return result
+
+        monitors.reset_monitors()
+        # Reseeded even without a seed, or every copy would start alike
+        devices.set_seed(scenario["seed"])
+        devices.cold_startup()
+        result["cycles_completed"] = network.execute_cycles(
+            scenario["cycles"], monitors.record_signals)
+        result["oscillating"] = (result["cycles_completed"]
+                                 < scenario["cycles"])
+        result["period"] = network.period
+        result["traces"] = monitors.monitors_dictionary
+        return result
+
+    def run(self, scenarios):
+        """Run all the scenarios and return their results in order.
+
+        The scenarios run in the calling process if only one process is
+        requested.
+        """
+        if self.processes == 1:
+            return [self.run_circuit(self.circuit, scenario)
+                    for scenario in scenarios]
+        with multiprocessing.Pool(self.processes, initializer=init_worker,
+                                  initargs=(self.circuit,)) as pool:
+            return pool.map(run_worker, scenarios)
@@ -0,0 +1,5 @@
+"""Performance benchmarks for the Logic Simulator.
+
+Run each benchmark as a module from the logsim directory, for example:
+python -m benchmarks.bench_lookup
+"""
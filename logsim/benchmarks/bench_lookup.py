@@ -0,0 +1,77 @@
+"""Benchmark device lookups and simulation cycles against network size.
+
+Builds networks of switches feeding 2-input AND gates, with a fixed number of
+monitors, and times get_device, find_devices and one execute_network cycle.
+Device IDs are plain integers rather than interned names so that building
+very large networks does not depend on the speed of the names table.
+
+Usage
+-----
+python -m benchmarks.bench_lookup [size ...]
+"""
+import sys
+import time
+
+from names import Names
+from devices import Devices
+from network import Network
+from monitors import Monitors
+
+
+def build_network(size):
+    """Return (devices, network, monitors) with size devices in total."""
+    names = Names()
+    devices = Devices(names)
+    network = Network(names, devices)
+    monitors = Monitors(names, devices, network)
+    [I1, I2] = names.lookup(["I1", "I2"])
+
+    first_id = 1000  # clear of the IDs taken by keywords
+    switch_count = size // 2
+    for i in range(switch_count):
+        devices.make_device(first_id + i, devices.SWITCH, i % 2)
+    for i in range(size - switch_count):
+        gate_id = first_id + switch_count + i
+        devices.make_device(gate_id, devices.AND, 2)
+        network.make_connection(first_id + i % switch_count, None,
+                                gate_id, I1)
+        network.make_connection(first_id + (i + 1) % switch_count, None,
+                                gate_id, I2)
+    for i in range(10):
+        monitors.make_monitor(first_id + switch_count + i, None)
+    return devices, network, monitors
+
+
+def time_call(function, repeats):
+    """Return the mean time in seconds of repeats calls of function."""
+    start = time.perf_counter()
+    for _ in range(repeats):
+        function()
+    return (time.perf_counter() - start) / repeats
+
+
+def main(arg_list):
+    """Print lookup and per-cycle timings for each network size."""
+    sizes = [int(arg) for arg in arg_list] or [1000, 10000, 100000]
+    print("{:>8} {:>14} {:>14} {:>12} {:>16}".format(
+        "devices", "get_device/ns", "find_clock/us", "cycle/ms",
+        "cycle/device/us"))
+    for size in sizes:
+        devices, network, monitors = build_network(size)
+        probe_id = 1000 + size - 1
+        lookup = time_call(lambda: devices.get_device(probe_id), 100000)
+        find = time_call(lambda: devices.find_devices(devices.CLOCK), 10000)
+
+        def cycle():
+            network.execute_network()
+            monitors.record_signals()
+
+        cycle()  # settle the first cycle
+        cycle_time = time_call(cycle, 5)
+        print("{:>8} {:>14.1f} {:>14.2f} {:>12.2f} {:>16.3f}".format(
+            size, lookup * 1e9, find * 1e6, cycle_time * 1e3,
+            cycle_time / size * 1e6))
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
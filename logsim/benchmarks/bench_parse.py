@@ -0,0 +1,82 @@
+"""Benchmark parsing definition files against file size.
+
+Writes definition files of switches feeding 2-input AND gates, with a fixed
+number of monitors, and times Parser.parse_network on each. The time per
+device should stay roughly constant as the file grows.
+
+Usage
+-----
+python -m benchmarks.bench_parse [size ...]
+"""
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+
+from names import Names
+from devices import Devices
+from network import Network
+from monitors import Monitors
+from scanner import Scanner
+from parse import Parser
+
+
+def write_definition_file(definition_file, size):
+    """Write a definition file with size devices in total."""
+    switch_count = size // 2
+    gate_count = size - switch_count
+    lines = ["INIT;"]
+    for i in range(switch_count):
+        lines.append("SW{} is SWITCH initially_at {};".format(i, i % 2))
+    for i in range(gate_count):
+        lines.append("AND{} is AND with 2 inputs;".format(i))
+    lines.append("CONNECT;")
+    for i in range(gate_count):
+        lines.append("SW{} connect_to AND{}.I1;".format(i % switch_count, i))
+        lines.append("SW{} connect_to AND{}.I2;".format(
+            (i + 1) % switch_count, i))
+    lines.append("MONITOR;")
+    lines.append("Initial_monitor_at {};".format(
+        " ".join("AND{}".format(i) for i in range(min(10, gate_count)))))
+    definition_file.write("\n".join(lines))
+
+
+def parse_file(path):
+    """Return the time in seconds taken to scan and parse the file."""
+    names = Names()
+    devices = Devices(names)
+    network = Network(names, devices)
+    monitors = Monitors(names, devices, network)
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        scanner = Scanner(path, names, devices, network, monitors)
+        parser = Parser(names, devices, network, monitors, scanner)
+        parsed = parser.parse_network()
+    parse_time = time.perf_counter() - start
+    if not parsed:
+        raise RuntimeError("Generated definition file did not parse.")
+    return parse_time
+
+
+def main(arg_list):
+    """Print the parse time for each file size."""
+    sizes = [int(arg) for arg in arg_list] or [1000, 10000, 100000]
+    print("{:>8} {:>10} {:>12} {:>16}".format(
+        "devices", "kbytes", "parse/s", "parse/device/us"))
+    for size in sizes:
+        with tempfile.NamedTemporaryFile("w", suffix=".txt",
+                                         delete=False) as definition_file:
+            write_definition_file(definition_file, size)
+        try:
+            file_size = os.path.getsize(definition_file.name)
+            parse_time = parse_file(definition_file.name)
+        finally:
+            os.remove(definition_file.name)
+        print("{:>8} {:>10.1f} {:>12.3f} {:>16.2f}".format(
+            size, file_size / 1e3, parse_time, parse_time / size * 1e6))
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,179 @@
+"""Benchmark each stage of simulating the synthetic circuits.
+
+For every circuit of benchmarks.netlists and every size, writes the
+definition file and times separately:
+- scanning it into symbols;
+- parsing the symbols into the network;
+- one execute_network cycle, on average;
+- one record_signals call, on average;
+- a whole run through execute_cycles, with fast-forward and period detection.
+
+A table is printed, and with -o each result is appended to a JSON Lines file
+as one object, so that the results can be tracked over time.
+
+Usage
+-----
+python -m benchmarks.bench_simulation [-c cycles] [-m mode] [-s sizes]
+                                      [-o results.jsonl] [circuit ...]
+
+mode is one of sweep, event, compiled and vectorized, and sizes is a comma
+separated list of sizes.
+"""
+import contextlib
+import datetime
+import getopt
+import io
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+from names import Names
+from devices import Devices
+from network import Network
+from monitors import Monitors
+from scanner import Scanner
+from parse import Parser
+from benchmarks.netlists import generators
+
+
+def get_commit():
+    """Return the current git commit of the source, or None."""
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            stderr=subprocess.DEVNULL).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def benchmark_file(path, cycles, mode):
+    """Return a dictionary of the times taken by each stage for a file.
+
+    mode is the name of the Network attribute of the execution mode.
+    """
+    names = Names()
+    devices = Devices(names)
+    network = Network(names, devices)
+    monitors = Monitors(names, devices, network)
+    result = {}
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        scanner = Scanner(path, names, devices, network, monitors)
+        while scanner.get_symbol().type != scanner.EOF:
+            pass
+        result["scan_s"] = time.perf_counter() - start
+
+        # The parser replays the symbols recorded by the scan
+        scanner.restart()
+        start = time.perf_counter()
+        parser = Parser(names, devices, network, monitors, scanner)
+        parsed = parser.parse_network()
+        result["parse_s"] = time.perf_counter() - start
+    if not parsed:
+        raise RuntimeError("Generated definition file did not parse.")
+    if not network.set_execution_mode(getattr(network, mode)):
+        raise RuntimeError("Execution mode not available.")
+    result["devices"] = len(devices.devices_list)
+
+    random.seed(1)
+    devices.cold_startup()
+    execute_time = 0
+    record_time = 0
+    for _ in range(cycles):
+        start = time.perf_counter()
+        if not network.execute_network():
+            raise RuntimeError("Generated network oscillates.")
+        middle = time.perf_counter()
+        monitors.record_signals()
+        execute_time += middle - start
+        record_time += time.perf_counter() - middle
+    result["execute_per_cycle_us"] = execute_time / cycles * 1e6
+    result["record_per_cycle_us"] = record_time / cycles * 1e6
+
+    random.seed(1)
+    devices.cold_startup()
+    monitors.reset_monitors()
+    network.fast_forward = True
+    network.detect_period = True
+    start = time.perf_counter()
+    if network.execute_cycles(cycles, monitors.record_signals) < cycles:
+        raise RuntimeError("Generated network oscillates.")
+    result["execute_cycles_s"] = time.perf_counter() - start
+    result["period"] = network.period
+    return result
+
+
+def main(arg_list):
+    """Print, and optionally save, the times for each circuit and size."""
+    usage_message = ("Usage:\n"
+                     "python -m benchmarks.bench_simulation [-c cycles] "
+                     "[-m mode] [-s sizes] [-o results.jsonl] [circuit ...]")
+    # Network attribute of each execution mode
+    modes = {"sweep": "SWEEP", "event": "EVENT_DRIVEN",
+             "compiled": "COMPILED", "vectorized": "VECTORIZED"}
+    try:
+        options, arguments = getopt.getopt(arg_list, "c:m:s:o:")
+    except getopt.GetoptError:
+        print(usage_message)
+        sys.exit()
+
+    cycles = 1000
+    mode_name = "sweep"
+    sizes = [100, 1000]
+    output_path = None
+    for option, value in options:
+        if option == "-c":
+            cycles = int(value)
+        elif option == "-m":
+            mode_name = value
+        elif option == "-s":
+            sizes = [int(size) for size in value.split(",")]
+        elif option == "-o":
+            output_path = value
+    circuits = arguments or list(generators)
+    if mode_name not in modes or any([circuit not in generators
+                                      for circuit in circuits]):
+        print(usage_message)
+        sys.exit()
+
+    run = {"timestamp": datetime.datetime.now().isoformat(),
+           "commit": get_commit(),
+           "python": platform.python_version(),
+           "mode": mode_name,
+           "cycles": cycles}
+    print("{:>8} {:>6} {:>7} {:>9} {:>9} {:>12} {:>11} {:>10}".format(
+        "circuit", "size", "devices", "scan/s", "parse/s", "execute/us",
+        "record/us", "run/s"))
+    for circuit in circuits:
+        for size in sizes:
+            with tempfile.NamedTemporaryFile("w", suffix=".txt",
+                                             delete=False) as definition_file:
+                generators[circuit](definition_file, size)
+            try:
+                result = benchmark_file(definition_file.name, cycles,
+                                        modes[mode_name])
+            finally:
+                os.remove(definition_file.name)
+            result.update(run)
+            result.update({"circuit": circuit, "size": size})
+            print("{:>8} {:>6} {:>7} {:>9.4f} {:>9.4f} {:>12.1f} {:>11.1f} "
+                  "{:>10.4f}".format(
+                      circuit, size, result["devices"], result["scan_s"],
+                      result["parse_s"], result["execute_per_cycle_us"],
+                      result["record_per_cycle_us"],
+                      result["execute_cycles_s"]))
+            if output_path is not None:
+                with open(output_path, "a") as output_file:
+                    output_file.write(json.dumps(result, sort_keys=True))
+                    output_file.write("\n")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,204 @@
+"""Generate synthetic definition files for the benchmarks.
+
+Each generator writes a definition file in the INIT/CONNECT/MONITOR grammar
+whose size is set by a single parameter, so that the benchmarks can measure
+how the simulator scales with the circuit.
+
+Functions
+---------
+write_gate_chain(definition_file, size, depth=16): Writes chains of
+                                                   inverters.
+
+write_wide_tree(definition_file, size): Writes a binary tree of XOR gates.
+
+write_ripple_adder(definition_file, size): Writes a ripple-carry adder.
+
+write_counter(definition_file, size): Writes a synchronous counter of
+                                      D-types.
+
+write_siggen_logic(definition_file, size): Writes gates driven by SIGGENs.
+"""
+
+
+def write_sections(definition_file, devices, connections, monitors):
+    """Write the three sections of a definition file.
+
+    devices and connections are lists of statements without the final
+    semicolon, and monitors is a list of signal names.
+    """
+    lines = ["INIT;"]
+    lines.extend([device + ";" for device in devices])
+    lines.append("CONNECT;")
+    lines.extend([connection + ";" for connection in connections])
+    lines.append("MONITOR;")
+    lines.append("Initial_monitor_at {};".format(" ".join(monitors)))
+    definition_file.write("\n".join(lines))
+    definition_file.write("\n")
+
+
+def write_gate_chain(definition_file, size, depth=16):
+    """Write a clock driving chains of size single-input NAND gates in all.
+
+    Every clock edge ripples through each chain of depth gates. The sweep
+    mode settles one gate of a chain per iteration, so depth is kept below
+    its iteration limit.
+    """
+    devices = ["CK1 is CLOCK with_simulation_cycles 5"]
+    connections = []
+    monitors = ["CK1"]
+    source = "CK1"
+    for i in range(1, size + 1):
+        devices.append("N{} is NAND with 1 inputs".format(i))
+        connections.append("{} connect_to N{}.I1".format(source, i))
+        source = "N{}".format(i)
+        if i % depth == 0 or i == size:
+            if len(monitors) < 9:
+                monitors.append(source)
+            source = "CK1"
+    write_sections(definition_file, devices, connections, monitors)
+
+
+def write_wide_tree(definition_file, size):
+    """Write a binary tree of XOR gates with size leaves, at least two.
+
+    The leaves are switches, except for one clock, so the root changes
+    every half period through log2(size) levels of gates.
+    """
+    devices = ["CK1 is CLOCK with_simulation_cycles 3"]
+    level = ["CK1"]
+    for i in range(1, max(size, 2)):
+        devices.append("SW{} is SWITCH initially_at {}".format(i, i % 2))
+        level.append("SW{}".format(i))
+
+    connections = []
+    gate_number = 0
+    while len(level) > 1:
+        next_level = []
+        for i in range(0, len(level) - 1, 2):
+            gate_number += 1
+            gate = "G{}".format(gate_number)
+            devices.append("{} is XOR".format(gate))
+            connections.append("{} connect_to {}.I1".format(level[i], gate))
+            connections.append("{} connect_to {}.I2".format(level[i + 1],
+                                                            gate))
+            next_level.append(gate)
+        if len(level) % 2:
+            next_level.append(level[-1])
+        level = next_level
+    write_sections(definition_file, devices, connections, level)
+
+
+def write_ripple_adder(definition_file, size):
+    """Write a ripple-carry adder of size bits.
+
+    The carry in is a clock. The operand bits propagate the carry, except
+    every eighth bit, which kills it. A carry then ripples through eight
+    bits on each rising edge, which the sweep mode settles well within
+    its iteration limit.
+    """
+    devices = ["CK1 is CLOCK with_simulation_cycles 4"]
+    connections = []
+    monitors = []
+    carry = "CK1"
+    for i in range(1, size + 1):
+        if i % 8:
+            [a, b] = [i % 2, 1 - i % 2]  # propagate
+        else:
+            [a, b] = [0, 0]  # kill
+        devices.extend([
+            "A{} is SWITCH initially_at {}".format(i, a),
+            "B{} is SWITCH initially_at {}".format(i, b),
+            "P{} is XOR".format(i),
+            "S{} is XOR".format(i),
+            "G{} is AND with 2 inputs".format(i),
+            "T{} is AND with 2 inputs".format(i),
+            "C{} is OR with 2 inputs".format(i)])
+        connections.extend([
+            "A{0} connect_to P{0}.I1".format(i),
+            "B{0} connect_to P{0}.I2".format(i),
+            "P{0} connect_to S{0}.I1".format(i),
+            "{0} connect_to S{1}.I2".format(carry, i),
+            "A{0} connect_to G{0}.I1".format(i),
+            "B{0} connect_to G{0}.I2".format(i),
+            "P{0} connect_to T{0}.I1".format(i),
+            "{0} connect_to T{1}.I2".format(carry, i),
+            "G{0} connect_to C{0}.I1".format(i),
+            "T{0} connect_to C{0}.I2".format(i)])
+        carry = "C{}".format(i)
+        if i <= 8:
+            monitors.append("S{}".format(i))
+    monitors.append(carry)
+    write_sections(definition_file, devices, connections, monitors)
+
+
+def write_counter(definition_file, size):
+    """Write a synchronous binary counter of size D-types.
+
+    All the D-types are clocked by one clock. Each one toggles when all
+    the lower bits are HIGH, through a chain of AND gates, so the counter
+    only repeats after 2**size clock periods.
+    """
+    devices = ["CK1 is CLOCK with_simulation_cycles 1",
+               "SW1 is SWITCH initially_at 0"]
+    connections = []
+    monitors = []
+    carry = None  # signal that is HIGH when all lower bits are HIGH
+    for i in range(1, size + 1):
+        devices.append("D{} is DTYPE".format(i))
+        connections.extend([
+            "CK1 connect_to D{}.CLK".format(i),
+            "SW1 connect_to D{}.SET".format(i),
+            "SW1 connect_to D{}.CLEAR".format(i)])
+        if carry is None:
+            connections.append("D{0}.QBAR connect_to D{0}.DATA".format(i))
+            carry = "D{}.Q".format(i)
+        else:
+            devices.append("T{} is XOR".format(i))
+            connections.extend([
+                "D{0}.Q connect_to T{0}.I1".format(i),
+                "{} connect_to T{}.I2".format(carry, i),
+                "T{0} connect_to D{0}.DATA".format(i)])
+            if i < size:
+                devices.append("K{} is AND with 2 inputs".format(i))
+                connections.extend([
+                    "{} connect_to K{}.I1".format(carry, i),
+                    "D{0}.Q connect_to K{0}.I2".format(i)])
+                carry = "K{}".format(i)
+        if i <= 8:
+            monitors.append("D{}.Q".format(i))
+    write_sections(definition_file, devices, connections, monitors)
+
+
+def write_siggen_logic(definition_file, size):
+    """Write size XOR and AND gates driven by eight SIGGENs.
+
+    The waveforms have coprime lengths, so the inputs of the gates change
+    on most cycles and the circuit has a long period. Each gate also reads
+    the gate eight before it, in chains at most eight gates deep.
+    """
+    waveforms = ["01", "001", "00111", "0001011", "00101100111",
+                 "0010110011101", "00111010110001011",
+                 "0001110110100100111"]
+    devices = ["SG{} is SIGGEN with \"{}\"".format(i + 1, waveform)
+               for i, waveform in enumerate(waveforms)]
+    connections = []
+    for i in range(1, size + 1):
+        kind = "XOR" if i % 2 else "AND with 2 inputs"
+        devices.append("L{} is {}".format(i, kind))
+        first = "SG{}".format(i % len(waveforms) + 1)
+        if ((i - 1) // len(waveforms)) % len(waveforms):
+            second = "L{}".format(i - len(waveforms))
+        else:
+            second = "SG{}".format((i + 3) % len(waveforms) + 1)
+        connections.append("{} connect_to L{}.I1".format(first, i))
+        connections.append("{} connect_to L{}.I2".format(second, i))
+    monitors = ["L{}".format(i) for i in range(max(1, size - 7), size + 1)]
+    write_sections(definition_file, devices, connections, monitors)
+
+
+# Generator of each benchmark circuit, by name
+generators = {"chain": write_gate_chain,
+              "tree": write_wide_tree,
+              "adder": write_ripple_adder,
+              "counter": write_counter,
+              "siggen": write_siggen_logic}
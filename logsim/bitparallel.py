@@ -0,0 +1,203 @@
+"""Simulate many switch patterns at once with bit-parallel signals.
+
+Used in the Logic Simulator project to run the same network under many
+switch settings in one pass, instead of one execute_network call for each.
+
+Classes
+-------
+BitParallelNetlist - executes the compiled plan on words of patterns.
+"""
+from netlist import CompiledNetlist
+
+
+class BitParallelNetlist(CompiledNetlist):
+
+    """Execute the compiled evaluation plan on words of stimulus patterns.
+
+    Every slot holds an integer word whose bit k is the signal of that slot
+    under pattern k, so one pass over the gates evaluates width independent
+    patterns with bitwise operations. Switches can take a different state in
+    each pattern, while clocks, SIGGENs and RCs are shared by all of them.
+    D-type memories are words as well, loaded from the devices by reset().
+
+    Parameters
+    ----------
+    devices: instance of the devices.Devices() class.
+    network: instance of the network.Network() class.
+    width: number of patterns simulated at once.
+
+    Public methods
+    --------------
+    compile(self): Builds the evaluation plan and resets the words.
+
+    reset(self): Loads the device states into every pattern.
+
+    set_switch_patterns(self, device_id, states): Sets the state of a switch
+                                                  in each pattern.
+
+    get_word(self, device_id, output_id): Returns the word of an output.
+
+    get_pattern_signal(self, device_id, output_id, pattern): Returns the
+                                signal of an output under one pattern.
+
+    execute(self): Executes the network for one simulation cycle.
+
+    run(self, cycles, monitors): Runs the network for the given number of
+                                 cycles and records the monitor words.
+    """
+
+    def __init__(self, devices, network, width=64):
+        """Initialise the word variables."""
+        super().__init__(devices, network)
+        if not isinstance(width, int):
+            raise TypeError("Expected width to be an integer.")
+        elif width <= 0:
+            raise ValueError("Expected width to be positive.")
+        self.width = width
+        self.mask = (1 << width) - 1  # word with every pattern HIGH
+        self.memory = []  # D-type memory words, in the order of d_types
+        self.switch_words = {}  # {device_id: switch state word}
+
+    def compile(self):
+        """Build the evaluation plan and reset the words.
+
+        Return True if successful.
+        """
+        if not super().compile():
+            return False
+        self.reset()
+        return True
+
+    def spread(self, signal):
+        """Return the word with signal in every pattern."""
+        if signal == self.devices.HIGH:
+            return self.mask
+        return 0
+
+    def reset(self):
+        """Load the current device states into every pattern."""
+        self.signals = [self.spread(self.settle(outputs[output_id])) for
+                        (outputs, output_id) in self.slot_outputs]
+        self.memory = [self.spread(d_type[0].dtype_memory) for
+                       d_type in self.d_types]
+        self.switch_words = {device.device_id:
+                             self.spread(device.switch_state)
+                             for (device, slot) in self.switches}
+
+    def set_switch_patterns(self, device_id, states):
+        """Set the state of the switch in each pattern.
+
+        states is a list of signals, LOW or HIGH, one for each pattern. Return
+        True if successful.
+        """
+        if device_id not in self.switch_words or len(states) > self.width:
+            return False
+        word = 0
+        for pattern, state in enumerate(states):
+            if state == self.devices.HIGH:
+                word |= 1 << pattern
+            elif state != self.devices.LOW:
+                return False
+        self.switch_words[device_id] = word
+        return True
+
+    def get_word(self, device_id, output_id):
+        """Return the word of the given output, or None if it is absent."""
+        slot = self.get_slot(device_id, output_id)
+        if slot is None:
+            return None
+        return self.signals[slot]
+
+    def get_pattern_signal(self, device_id, output_id, pattern):
+        """Return the signal of the given output under one pattern."""
+        word = self.get_word(device_id, output_id)
+        if word is None:
+            return None
+        return (word >> pattern) & 1
+
+    def evaluate_gates(self):
+        """Evaluate every gate once, in level order, on whole words."""
+        signals = self.signals
+        mask = self.mask
+        devices = self.devices
+        AND, OR, NAND, NOR = devices.AND, devices.OR, devices.NAND, devices.NOR
+        for (gate_kind, output_slot, input_slots) in self.gates:
+            if gate_kind in (AND, NAND):
+                word = mask
+                for slot in input_slots:
+                    word &= signals[slot]
+                if gate_kind == NAND:
+                    word ^= mask
+            elif gate_kind in (OR, NOR):
+                word = 0
+                for slot in input_slots:
+                    word |= signals[slot]
+                if gate_kind == NOR:
+                    word ^= mask
+            else:  # XOR
+                word = signals[input_slots[0]] ^ signals[input_slots[1]]
+            signals[output_slot] = word
+
+    def update_d_types(self, before):
+        """Update the memory and outputs of every D-type in turn.
+
+        As in CompiledNetlist.update_d_types, with the patterns where a
+        D-type latches found from its CLK words before and now.
+        """
+        signals = self.signals
+        mask = self.mask
+        for i, (device, q, qbar, clk, data, set_, clear) in enumerate(
+                self.d_types):
+            clock_word = signals[clk] & ~before[clk]
+            memory = ((self.memory[i] & ~clock_word)
+                      | (before[data] & clock_word))
+            memory |= before[set_] & signals[set_]
+            memory &= ~(before[clear] & signals[clear]) & mask
+            self.memory[i] = memory
+            before[q] = signals[q]
+            before[qbar] = signals[qbar]
+            signals[q] = memory
+            signals[qbar] = memory ^ mask
+
+    def execute(self):
+        """Execute the network for one simulation cycle in every pattern.
+
+        Return True if successful and the network settles in every pattern.
+        """
+        signals = self.signals
+
+        self.network.update_clocks()
+        self.network.update_siggen()
+        self.network.update_rc()
+
+        # The words as the D-types see them, as in CompiledNetlist
+        before = list(signals)
+        for (device, slot) in self.clocks:
+            signal = self.settle(device.outputs[None])
+            device.outputs[None] = signal
+            signals[slot] = self.spread(signal)
+        for (device, slot) in self.switches:
+            signals[slot] = self.switch_words[device.device_id]
+
+        for iteration in range(self.network.iteration_limit):
+            self.update_d_types(before)
+            if iteration == 0:
+                for (device, slot) in self.clocks + self.switches:
+                    before[slot] = signals[slot]
+            elif signals == before:
+                return True
+            for (gate_kind, output_slot, input_slots) in self.gates:
+                before[output_slot] = signals[output_slot]
+            self.evaluate_gates()
+        return False
+
+    def run(self, cycles, monitors):
+        """Run the network and record the monitor words after each cycle.
+
+        Return True if successful and the network settles in every cycle.
+        """
+        for _ in range(cycles):
+            if not self.execute():
+                return False
+            monitors.record_batch_signals(self)
+        return True
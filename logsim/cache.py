@@ -0,0 +1,347 @@
+"""Cache compiled circuits on disk.
+
+Used in the Logic Simulator project to skip scanning and parsing a definition
+file that has been opened before.
+
+Classes
+-------
+CircuitCache - stores and loads the built circuit of definition files.
+"""
+import hashlib
+import os
+import struct
+import tempfile
+import zlib
+
+from names import Names
+from devices import Devices
+from network import Network
+from monitors import Monitors
+from scanner import Scanner
+from parse import Parser
+
+
+class CircuitCache:
+
+    """Store and load the built circuit of definition files.
+
+    After a definition file is parsed successfully, the circuit is written
+    to the cache directory as data only, so a cache file can never run
+    code when it is loaded. The file starts with a header, packed
+    little-endian: the magic bytes b"LSCC" and the format version (uint16).
+    The rest is zlib-compressed and holds, for every device in order, its
+    name, kind and the property it was made with, its output signals, D-type
+    memory and clock, RC and SIGGEN counters, then the connections to the
+    inputs of every device and the monitored signal names. Strings are
+    stored as UTF-8 with their length (uint16), and None as -1 or as an
+    empty string. A cached circuit is rebuilt from these as the parser
+    builds it, and its devices are left in the state they were saved in.
+
+    The entry is keyed by a hash of the file contents and of the simulator
+    version, so editing the file or changing the simulator makes the old
+    entry unreachable. The simulator version is a hash of the source of the
+    modules that build and make up the circuit.
+
+    Parameters
+    ----------
+    cache_dir: directory of the cache files. Defaults to the LOGSIM_CACHE
+               environment variable, or to ~/.cache/logsim.
+
+    Public methods
+    --------------
+    get_version(self): Returns the simulator version.
+
+    get_key(self, path): Returns the cache key of a definition file.
+
+    load(self, path): Returns the cached circuit of a definition file.
+
+    save(self, path, names, devices, network, monitors): Stores the circuit
+                                                 of a definition file.
+
+    load_or_parse(self, path): Returns the circuit of a definition file,
+                               parsing it only if it is not cached.
+    """
+
+    MAGIC = b"LSCC"
+    VERSION = 1
+    header_format = "<4sH"
+    state_format = "<bqq"  # dtype_memory, clock and SIGGEN counters
+    NONE = -1  # stored in place of None
+
+    # Modules that build the circuit or whose objects are stored in it
+    simulator_modules = ["names", "devices", "network", "monitors", "traces",
+                         "vcd", "netlist", "vectorized", "scanner", "parse",
+                         "error", "cache"]
+
+    def __init__(self, cache_dir=None):
+        """Initialise the cache directory."""
+        if cache_dir is None:
+            cache_dir = os.environ.get(
+                "LOGSIM_CACHE", os.path.join(os.path.expanduser("~"),
+                                             ".cache", "logsim"))
+        self.cache_dir = cache_dir
+        self.version = None
+
+    def get_version(self):
+        """Return the simulator version, a hash of the simulator source."""
+        if self.version is None:
+            version_hash = hashlib.sha256()
+            source_dir = os.path.dirname(os.path.abspath(__file__))
+            for module in self.simulator_modules:
+                with open(os.path.join(source_dir, module + ".py"),
+                          "rb") as source_file:
+                    version_hash.update(source_file.read())
+            self.version = version_hash.hexdigest()
+        return self.version
+
+    def get_key(self, path):
+        """Return the cache key of the definition file at path.
+
+        Return None if the file cannot be read.
+        """
+        try:
+            with open(path, "rb") as definition_file:
+                contents = definition_file.read()
+        except OSError:
+            return None
+        key_hash = hashlib.sha256(self.get_version().encode())
+        key_hash.update(contents)
+        return key_hash.hexdigest()
+
+    def get_cache_path(self, key):
+        """Return the path of the cache file with the given key."""
+        return os.path.join(self.cache_dir, key + ".circuit")
+
+    def load(self, path):
+        """Return the cached (names, devices, network, monitors) of a file.
+
+        Return None if the file is not cached or its entry cannot be read.
+        The circuit is rebuilt with new Names, Devices, Network and Monitors
+        instances, in the device state it was saved in, and the later cold
+        start-ups of its devices are seeded anew.
+        """
+        key = self.get_key(path)
+        if key is None:
+            return None
+        try:
+            with open(self.get_cache_path(key), "rb") as cache_file:
+                data = cache_file.read()
+            header_size = struct.calcsize(self.header_format)
+            (magic, version) = struct.unpack_from(self.header_format, data)
+            if magic != self.MAGIC or version != self.VERSION:
+                return None
+            return self.read_circuit(zlib.decompress(data[header_size:]))
+        except (OSError, struct.error, zlib.error, UnicodeDecodeError,
+                ValueError):
+            return None
+
+    def save(self, path, names, devices, network, monitors):
+        """Store the circuit built from the definition file at path.
+
+        The cache file is written under a temporary name and then renamed,
+        so that a reader never sees a partly written entry. Return True if
+        successful.
+        """
+        key = self.get_key(path)
+        if key is None:
+            return False
+
+        def get_name(name_id):
+            if name_id is None:  # the single output of most devices
+                return ""
+            return names.get_name_string(name_id)
+
+        body = [struct.pack("<I", len(devices.devices_list))]
+        for device in devices.devices_list:
+            body.append(self.pack_string(get_name(device.device_id)))
+            body.append(self.pack_string(get_name(device.device_kind)))
+            body.append(self.pack_string(self.get_property(devices,
+                                                           device)))
+            signals = [self.encode(signal)
+                       for signal in device.outputs.values()]
+            body.append(struct.pack("<B{}b".format(len(signals)),
+                                    len(signals), *signals))
+            body.append(struct.pack(
+                self.state_format, self.encode(device.dtype_memory),
+                self.encode(device.clock_counter),
+                self.encode(device.siggen_counter)))
+        for device in devices.devices_list:
+            body.append(struct.pack("<B", len(device.inputs)))
+            for input_id, connection in device.inputs.items():
+                if connection is None:
+                    connection = (None, None)
+                body.append(self.pack_string(get_name(input_id)))
+                body.append(self.pack_string(get_name(connection[0])))
+                body.append(self.pack_string(get_name(connection[1])))
+        body.append(struct.pack("<I", len(monitors.monitors_dictionary)))
+        for (device_id, output_id) in monitors.monitors_dictionary:
+            body.append(self.pack_string(
+                devices.get_signal_name(device_id, output_id)))
+
+        data = (struct.pack(self.header_format, self.MAGIC, self.VERSION)
+                + zlib.compress(b"".join(body)))
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            (handle, temporary_path) = tempfile.mkstemp(dir=self.cache_dir)
+            with os.fdopen(handle, "wb") as cache_file:
+                cache_file.write(data)
+            os.replace(temporary_path, self.get_cache_path(key))
+        except OSError:
+            return False
+        return True
+
+    def encode(self, value):
+        """Return value, or NONE if it is None."""
+        return self.NONE if value is None else value
+
+    def decode(self, value):
+        """Return the value stored as value."""
+        return None if value == self.NONE else value
+
+    @staticmethod
+    def pack_string(string):
+        """Return the string packed with its length."""
+        data = string.encode()
+        return struct.pack("<H", len(data)) + data
+
+    @staticmethod
+    def unpack_string(body, offset):
+        """Return the string packed at offset, and the offset after it."""
+        (length,) = struct.unpack_from("<H", body, offset)
+        offset += 2
+        if offset + length > len(body):
+            raise struct.error("string past the end of the body")
+        return [body[offset:offset + length].decode(), offset + length]
+
+    @staticmethod
+    def get_property(devices, device):
+        """Return the property the device was made with, as a string.
+
+        The string is empty for the devices made without a property.
+        """
+        device_kind = device.device_kind
+        if device_kind == devices.SWITCH:
+            return str(device.switch_state)
+        elif device_kind == devices.CLOCK:
+            return str(device.clock_half_period)
+        elif device_kind == devices.RC:
+            return str(device.simulation_cycles)
+        elif device_kind == devices.SIGGEN:
+            # Rebuild the waveform from the cycles it switches at
+            waveform = []
+            signal = device.siggen_initial
+            start = 0
+            for switch_point in device.siggen_switch_point:
+                waveform.append(str(signal) * (switch_point - start))
+                signal = 1 - signal
+                start = switch_point
+            return "".join(waveform)
+        elif device_kind in devices.gate_types and device_kind != devices.XOR:
+            return str(len(device.inputs))
+        return ""
+
+    def read_circuit(self, body):
+        """Return the circuit rebuilt from the body of a cache file.
+
+        Return None if the body does not describe a valid circuit.
+        """
+        names = Names()
+        devices = Devices(names)
+        network = Network(names, devices)
+        monitors = Monitors(names, devices, network)
+
+        def get_id(name):
+            if not name:
+                return None
+            [name_id] = names.lookup([name])
+            return name_id
+
+        offset = 0
+        (device_count,) = struct.unpack_from("<I", body, offset)
+        offset += 4
+        device_list = []
+        device_states = []
+        for _ in range(device_count):
+            [device_name, offset] = self.unpack_string(body, offset)
+            [kind_name, offset] = self.unpack_string(body, offset)
+            [device_property, offset] = self.unpack_string(body, offset)
+            device_kind = get_id(kind_name)
+            if device_kind != devices.SIGGEN:
+                device_property = (int(device_property) if device_property
+                                   else None)
+            device_list.append((get_id(device_name), device_kind,
+                                device_property))
+            (output_count,) = struct.unpack_from("<B", body, offset)
+            signals = struct.unpack_from("<{}b".format(output_count), body,
+                                         offset + 1)
+            offset += 1 + output_count
+            state = struct.unpack_from(self.state_format, body, offset)
+            offset += struct.calcsize(self.state_format)
+            device_states.append(
+                [[self.decode(signal) for signal in signals]]
+                + [self.decode(value) for value in state])
+        if any([error != devices.NO_ERROR
+                for error in devices.make_devices(device_list)]):
+            return None
+
+        for device, (signals, memory, counter, siggen_counter) in zip(
+                devices.devices_list, device_states):
+            if len(signals) != len(device.outputs):
+                return None
+            device.outputs.update(zip(list(device.outputs), signals))
+            device.dtype_memory = memory
+            device.clock_counter = counter
+            device.siggen_counter = siggen_counter
+
+        for device in devices.devices_list:
+            (input_count,) = struct.unpack_from("<B", body, offset)
+            offset += 1
+            for _ in range(input_count):
+                connection = []
+                for _ in range(3):  # input, connected device and output
+                    [name, offset] = self.unpack_string(body, offset)
+                    connection.append(get_id(name))
+                [input_id, first_device_id, first_port_id] = connection
+                if first_device_id is None:
+                    continue
+                if network.make_connection(
+                        first_device_id, first_port_id, device.device_id,
+                        input_id) != network.NO_ERROR:
+                    return None
+
+        (monitor_count,) = struct.unpack_from("<I", body, offset)
+        offset += 4
+        for _ in range(monitor_count):
+            [signal_name, offset] = self.unpack_string(body, offset)
+            [device_id, output_id] = devices.get_signal_ids(signal_name)
+            if monitors.make_monitor(device_id,
+                                     output_id) != monitors.NO_ERROR:
+                return None
+
+        if not network.check_network():
+            return None
+        network.compile_network()
+        return (names, devices, network, monitors)
+
+    def load_or_parse(self, path):
+        """Return (names, devices, network, monitors) built from a file.
+
+        The circuit is loaded from the cache if possible. Otherwise the file
+        is scanned and parsed, and the circuit is cached if it compiled.
+        Return None if the file does not compile.
+        """
+        circuit = self.load(path)
+        if circuit is not None:
+            print("File loaded from the compiled circuit cache!")
+            return circuit
+
+        names = Names()
+        devices = Devices(names)
+        network = Network(names, devices)
+        monitors = Monitors(names, devices, network)
+        scanner = Scanner(path, names, devices, network, monitors)
+        parser = Parser(names, devices, network, monitors, scanner)
+        if not parser.parse_network():
+            return None
+        self.save(path, names, devices, network, monitors)
+        return (names, devices, network, monitors)
@@ -0,0 +1,236 @@
+"""Save and restore the state of a running simulation.
+
+Used in the Logic Simulator project to pause a long simulation and resume it
+later, or on another machine, from the same warm state instead of a cold
+start-up.
+
+Classes
+-------
+Checkpoint - saves and restores the simulation state in a binary file.
+"""
+import hashlib
+import os
+import struct
+import tempfile
+import zlib
+
+from traces import SignalTrace
+
+
+class Checkpoint:
+
+    """Save and restore the simulation state in a compact binary file.
+
+    A checkpoint file starts with a header, packed little-endian:
+    the magic bytes b"LSCP", the format version (uint16), the number of
+    cycles completed (uint64) and the SHA-256 fingerprint of the circuit.
+    The rest is zlib-compressed and holds, for every device in order, its
+    output signals, D-type memory, switch state and clock, RC and SIGGEN
+    counters, followed by each monitor's signal name and trace as runs of
+    equal signals. Signals are stored as signed bytes and None as -1.
+
+    A checkpoint can only be restored into the circuit it was saved from,
+    built from the same definition file, which the fingerprint checks.
+
+    Parameters
+    ----------
+    names: instance of the names.Names() class.
+    devices: instance of the devices.Devices() class.
+    network: instance of the network.Network() class.
+    monitors: instance of the monitors.Monitors() class.
+
+    Public methods
+    --------------
+    get_fingerprint(self): Returns the fingerprint of the circuit.
+
+    save(self, path, cycles_completed): Saves the simulation state to a file.
+
+    restore(self, path): Restores the simulation state from a file and
+                         returns the number of cycles completed.
+    """
+
+    MAGIC = b"LSCP"
+    VERSION = 1
+    header_format = "<4sHQ32s"
+    device_format = "<bbqq"  # dtype_memory, switch_state, counters
+    NONE = -1  # stored in place of None
+
+    def __init__(self, names, devices, network, monitors):
+        """Initialise the circuit to checkpoint."""
+        self.names = names
+        self.devices = devices
+        self.network = network
+        self.monitors = monitors
+
+    def get_fingerprint(self):
+        """Return the SHA-256 digest of the devices and connections.
+
+        Names are hashed as strings, so the fingerprint does not depend on
+        the order names were looked up in.
+        """
+        def get_name(name_id):
+            if name_id is None:  # the single output of most devices
+                return None
+            return self.names.get_name_string(name_id)
+
+        fingerprint = hashlib.sha256()
+        for device in self.devices.devices_list:
+            inputs = sorted([(get_name(input_id),) + (
+                (get_name(connection[0]), get_name(connection[1]))
+                if connection is not None else ())
+                for input_id, connection in device.inputs.items()],
+                key=repr)
+            fingerprint.update(repr((
+                get_name(device.device_id), get_name(device.device_kind),
+                inputs, [get_name(output_id) for output_id in device.outputs],
+                device.clock_half_period, device.simulation_cycles,
+                device.siggen_initial, device.siggen_period,
+                device.siggen_switch_point)).encode())
+        return fingerprint.digest()
+
+    def encode(self, value):
+        """Return value, or NONE if it is None."""
+        return self.NONE if value is None else value
+
+    def decode(self, value):
+        """Return the value stored as value."""
+        return None if value == self.NONE else value
+
+    def save(self, path, cycles_completed):
+        """Save the simulation state to the file at path.
+
+        The file is written under a temporary name and then renamed, so
+        that an interrupted save leaves any earlier checkpoint intact.
+        Return True if successful.
+        """
+        body = [struct.pack("<I", len(self.devices.devices_list))]
+        for device in self.devices.devices_list:
+            signals = [self.encode(signal)
+                       for signal in device.outputs.values()]
+            body.append(struct.pack("<B{}b".format(len(signals)),
+                                    len(signals), *signals))
+            body.append(struct.pack(
+                self.device_format, self.encode(device.dtype_memory),
+                self.encode(device.switch_state),
+                self.encode(device.clock_counter),
+                self.encode(device.siggen_counter)))
+
+        body.append(struct.pack("<I", len(self.monitors.monitors_dictionary)))
+        for (device_id, output_id), trace in \
+                self.monitors.monitors_dictionary.items():
+            name = self.devices.get_signal_name(device_id,
+                                                output_id).encode()
+            runs = trace.get_runs()
+            body.append(struct.pack("<H", len(name)) + name)
+            body.append(struct.pack("<I", len(runs)))
+            body.append(struct.pack(
+                "<{}b".format(len(runs)),
+                *[self.encode(signal) for signal, _ in runs]))
+            body.append(struct.pack("<{}Q".format(len(runs)),
+                                    *[length for _, length in runs]))
+
+        header = struct.pack(self.header_format, self.MAGIC, self.VERSION,
+                             cycles_completed, self.get_fingerprint())
+        data = header + zlib.compress(b"".join(body))
+        try:
+            (handle, temporary_path) = tempfile.mkstemp(
+                dir=os.path.dirname(os.path.abspath(path)))
+            with os.fdopen(handle, "wb") as checkpoint_file:
+                checkpoint_file.write(data)
+            os.replace(temporary_path, path)
+        except OSError:
+            return False
+        return True
+
+    def restore(self, path):
+        """Restore the simulation state from the file at path.
+
+        The device state and monitor traces are replaced, and the state
+        cached by the network execution modes is dropped. Return the number
+        of cycles completed, or None if the file cannot be read, is not a
+        checkpoint or was saved from another circuit. The state is left
+        unchanged in that case.
+        """
+        try:
+            with open(path, "rb") as checkpoint_file:
+                data = checkpoint_file.read()
+            header_size = struct.calcsize(self.header_format)
+            (magic, version, cycles_completed,
+             fingerprint) = struct.unpack_from(self.header_format, data)
+            if (magic != self.MAGIC or version != self.VERSION
+                    or fingerprint != self.get_fingerprint()):
+                return None
+            body = zlib.decompress(data[header_size:])
+            [device_states, traces] = self.read_body(body)
+        except (OSError, struct.error, zlib.error, UnicodeDecodeError):
+            return None
+        if device_states is None:
+            return None
+
+        for device, (signals, memory, switch_state, counter,
+                     siggen_counter) in zip(self.devices.devices_list,
+                                            device_states):
+            device.outputs.update(zip(list(device.outputs), signals))
+            device.dtype_memory = memory
+            device.switch_state = switch_state
+            device.clock_counter = counter
+            device.siggen_counter = siggen_counter
+        self.monitors.monitors_dictionary.clear()
+        self.monitors.monitors_dictionary.update(traces)
+        # Traces saved while streaming to a VCD file are shorter
+        self.monitors.streamed_cycles = cycles_completed - max(
+            [len(trace) for trace in traces.values()],
+            default=cycles_completed)
+        self.network.forget_signals()
+        return cycles_completed
+
+    def read_body(self, body):
+        """Return the device states and monitor traces stored in body.
+
+        Return [None, None] if they do not fit the circuit.
+        """
+        offset = 0
+        (device_count,) = struct.unpack_from("<I", body, offset)
+        offset += 4
+        if device_count != len(self.devices.devices_list):
+            return [None, None]
+        device_size = struct.calcsize(self.device_format)
+        device_states = []
+        for device in self.devices.devices_list:
+            (output_count,) = struct.unpack_from("<B", body, offset)
+            if output_count != len(device.outputs):
+                return [None, None]
+            signals = struct.unpack_from("<{}b".format(output_count), body,
+                                         offset + 1)
+            offset += 1 + output_count
+            state = struct.unpack_from(self.device_format, body, offset)
+            offset += device_size
+            device_states.append(
+                [[self.decode(signal) for signal in signals]]
+                + [self.decode(value) for value in state])
+
+        traces = {}
+        (monitor_count,) = struct.unpack_from("<I", body, offset)
+        offset += 4
+        for _ in range(monitor_count):
+            (name_length,) = struct.unpack_from("<H", body, offset)
+            offset += 2
+            name = body[offset:offset + name_length].decode()
+            offset += name_length
+            [device_id, output_id] = self.devices.get_signal_ids(name)
+            device = self.devices.get_device(device_id)
+            if device is None or output_id not in device.outputs:
+                return [None, None]
+            (run_count,) = struct.unpack_from("<I", body, offset)
+            offset += 4
+            signals = struct.unpack_from("<{}b".format(run_count), body,
+                                         offset)
+            offset += run_count
+            lengths = struct.unpack_from("<{}Q".format(run_count), body,
+                                         offset)
+            offset += 8 * run_count
+            trace = SignalTrace(run_length=self.monitors.run_length)
+            for signal, length in zip(signals, lengths):
+                trace.append(self.decode(signal), length)
+            traces[(device_id, output_id)] = trace
+        return [device_states, traces]
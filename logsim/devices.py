@@ -57,7 +57,8 @@ class Devices:
     """Make and store devices.
 
     This class contains many functions for making devices and ports.
-    It stores all the devices in a list.
+    It stores all the devices in a list, indexed by device ID and by device
+    kind so that lookups do not scan the list.
 
     Parameters
     ----------
@@ -111,11 +112,23 @@ class Devices:
 
     make_d_type(self, device_id): Makes a D-type device.
 
+    set_seed(self, seed): Seeds the random start-up states of the devices.
+
     cold_startup(self): Simulates cold start-up of D-types, clocks, RC and
                                          SIGGEN.
 
+    request_cold_startup(self): Runs a cold start-up now, or later if the
+                                cold start-up is deferred.
+
+    set_deferred_startup(self, deferred): Defers the cold start-up of the
+                                devices made from now on, or runs the
+                                deferred cold start-up.
+
     make_device(self, device_id, device_kind, device_property=None): Creates
                        the specified device and returns errors if unsuccessful.
+
+    make_devices(self, device_list): Creates many devices with a single cold
+                       start-up and returns the error of each.
     """
 
     def __init__(self, names):
@@ -125,6 +138,11 @@ class Devices:
 
         self.devices_list = []
 
+        # devices_dictionary stores {device_id: Device}
+        self.devices_dictionary = {}
+        # kind_dictionary stores {device_kind: [device_id_list]}
+        self.kind_dictionary = {}
+
         gate_strings = ["AND", "OR", "NAND", "NOR", "XOR"]
         device_strings = ["CLOCK", "SWITCH", "DTYPE", "RC", "SIGGEN"]
         dtype_inputs = ["CLK", "SET", "CLEAR", "DATA"]
@@ -148,12 +166,18 @@ class Devices:
 
         self.max_gate_inputs = 16
 
+        # Whether the cold start-up of new devices is deferred, and whether
+        # a deferred cold start-up is waiting to run
+        self.deferred_startup = False
+        self.startup_pending = False
+
+        # Random number generator of the cold start-up, owned by this
+        # simulator so that seeded runs are reproducible
+        self.random = random.Random()
+
     def get_device(self, device_id):
         """Return the Device object corresponding to device_id."""
-        for device in self.devices_list:
-            if device.device_id == device_id:
-                return device
-        return None
+        return self.devices_dictionary.get(device_id)
 
     def find_devices(self, device_kind=None):
         """Return a list of device IDs of the specified device_kind.
@@ -161,19 +185,18 @@ class Devices:
         Return a list of all device IDs in the network if no device_kind is
         specified.
         """
-        device_id_list = []
-        for device in self.devices_list:
-            if device_kind is None:
-                device_id_list.append(device.device_id)
-            elif device.device_kind == device_kind:
-                device_id_list.append(device.device_id)
-        return device_id_list
+        if device_kind is None:
+            return [device.device_id for device in self.devices_list]
+        return list(self.kind_dictionary.get(device_kind, []))
 
     def add_device(self, device_id, device_kind):
         """Add the specified device to the network."""
         new_device = Device(device_id)
         new_device.device_kind = device_kind
         self.devices_list.append(new_device)
+        # Keep the first device if the same ID is added twice
+        self.devices_dictionary.setdefault(device_id, new_device)
+        self.kind_dictionary.setdefault(device_kind, []).append(device_id)
 
     def add_input(self, device_id, input_id):
         """Add the specified input to the specified device.
@@ -261,7 +284,9 @@ class Devices:
         self.add_device(device_id, self.CLOCK)
         device = self.get_device(device_id)
         device.clock_half_period = clock_half_period
-        self.cold_startup()  # clock initialised to a random point in its cycle
+        self.add_output(device_id, output_id=None)
+        # clock initialised to a random point in its cycle
+        self.request_cold_startup()
 
     # Paopao
     def make_rc(self, device_id, simulation_cycles):
@@ -270,7 +295,8 @@ class Devices:
         device = self.get_device(device_id)
         device.simulation_cycles = simulation_cycles
         device.clock_counter = 0
-        self.cold_startup()
+        self.add_output(device_id, output_id=None, signal=self.HIGH)
+        self.request_cold_startup()
 
     def varify_siggen(self, waveform):
         """Check whether the waveform of SIGGEN is in correct form."""
@@ -305,7 +331,9 @@ class Devices:
             device.siggen_initial = self.LOW
         else:
             device.siggen_initial = self.HIGH
-        self.cold_startup()
+        self.add_output(device_id, output_id=None,
+                        signal=device.siggen_initial)
+        self.request_cold_startup()
 
     def make_gate(self, device_id, device_kind, no_of_inputs):
         """Make logic gates with the specified number of inputs."""
@@ -324,7 +352,15 @@ class Devices:
             self.add_input(device_id, input_id)
         for output_id in self.dtype_output_ids:
             self.add_output(device_id, output_id)
-        self.cold_startup()  # D-type initialised to a random state
+        self.request_cold_startup()  # D-type initialised to a random state
+
+    def set_seed(self, seed):
+        """Seed the random states of the following cold start-ups.
+
+        The same seed gives the same start-up states for the same devices.
+        If seed is None, the generator is seeded from the operating system.
+        """
+        self.random.seed(seed)
 
     def cold_startup(self):
         """Simulate cold start-up of D-types, clocks and SIGGENs.
@@ -335,15 +371,16 @@ class Devices:
         """
         for device in self.devices_list:
             if device.device_kind == self.D_TYPE:
-                device.dtype_memory = random.choice([self.LOW, self.HIGH])
+                device.dtype_memory = self.random.choice([self.LOW,
+                                                          self.HIGH])
 
             elif device.device_kind == self.CLOCK:
-                clock_signal = random.choice([self.LOW, self.HIGH])
+                clock_signal = self.random.choice([self.LOW, self.HIGH])
                 self.add_output(device.device_id, output_id=None,
                                 signal=clock_signal)
                 # Initialise it to a random point in its cycle.
                 device.clock_counter = \
-                    random.randrange(device.clock_half_period)
+                    self.random.randrange(device.clock_half_period)
             elif device.device_kind == self.SIGGEN:
                 device.siggen_counter = 0
                 self.add_output(device.device_id, output_id=None,
@@ -353,6 +390,42 @@ class Devices:
                 self.add_output(device.device_id, output_id=None,
                                 signal=self.HIGH)
 
+    def request_cold_startup(self):
+        """Run a cold start-up, or mark it as pending if it is deferred.
+
+        Called whenever a D-type, clock, RC or SIGGEN is made. Running a
+        cold start-up walks all the devices, so deferring it while many
+        devices are made keeps building the network linear in its size.
+        """
+        if self.deferred_startup:
+            self.startup_pending = True
+        else:
+            self.cold_startup()
+
+    def set_deferred_startup(self, deferred):
+        """Defer the cold start-up of the devices made from now on.
+
+        If deferred is False, stop deferring and run the pending cold
+        start-up, if any.
+        """
+        self.deferred_startup = deferred
+        if not deferred and self.startup_pending:
+            self.startup_pending = False
+            self.cold_startup()
+
+    def make_devices(self, device_list):
+        """Create the devices in device_list with a single cold start-up.
+
+        device_list is a list of (device_id, device_kind, device_property)
+        tuples. Return the list of the errors returned by make_device, one
+        for each device.
+        """
+        was_deferred = self.deferred_startup
+        self.set_deferred_startup(True)
+        error_list = [self.make_device(*device) for device in device_list]
+        self.set_deferred_startup(was_deferred)
+        return error_list
+
     def make_device(self, device_id, device_kind, device_property=None):
         """Create the specified device.
 
@@ -11,16 +11,16 @@ Gui - configures the main window and all the widgets.
 import wx
 import os
 import builtins
+import threading
 import wx.glcanvas as wxcanvas
 from OpenGL import GL, GLUT
 from pathlib import Path
 
-from names import Names
-from devices import Devices
-from network import Network
-from monitors import Monitors
-from scanner import Scanner
-from parse import Parser
+from cache import CircuitCache
+from checkpoint import Checkpoint
+from profiler import Profiler
+from waveform import WaveformGeometry
+from worker import SimulationWorker
 
 builtins._ = wx.GetTranslation
 
@@ -36,6 +36,7 @@ class MyGLCanvas(wxcanvas.GLCanvas):
     parent: parent window.
     devices: instance of the devices.Devices() class.
     monitors: instance of the monitors.Monitors() class.
+    simulation_lock: threading.Lock() held while the traces are recorded.
 
     Public methods
     --------------
@@ -52,6 +53,19 @@ class MyGLCanvas(wxcanvas.GLCanvas):
     render_text(self, text, x_pos, y_pos): Handles text drawing
                                            operations.
 
+    draw_vertices(self, mode, vertices, count, x_pos, y_pos, x_scale,
+                  y_scale): Draws a vertex array placed and scaled on the
+                            canvas.
+
+    get_visible_cycles(self, x_start, cycle_width): Returns the range of
+                                       cycles in view and the cycles per
+                                       pixel.
+
+    get_visible_heights(self): Returns the range of heights in view.
+
+    get_label_step(self, cycle_width): Returns the number of cycles between
+                                       the ticks and labels of the time axis.
+
     reset_view(self): Return to the initial view point
 
     capture_image(self): Capture the OpenGL canvas content as
@@ -60,10 +74,11 @@ class MyGLCanvas(wxcanvas.GLCanvas):
     save_image(self, file_path): Save the image on the computer
     """
 
-    def __init__(self, parent, devices, monitors):
+    def __init__(self, parent, devices, monitors, simulation_lock):
         """Initialise variables"""
         self.devices = devices
         self.monitors = monitors
+        self.simulation_lock = simulation_lock
         self.cycles_completed = 0
         """Initialise canvas properties and useful variables."""
         super().__init__(parent, -1,
@@ -83,6 +98,10 @@ class MyGLCanvas(wxcanvas.GLCanvas):
         # Initialise variables for zooming
         self.zoom = 1
 
+        # Vertex arrays of the traces, kept between repaints
+        self.geometry = WaveformGeometry(devices)
+        self.label_spacing = 20  # minimum pixels between axis labels
+
         # Bind events to the canvas
         self.Bind(wx.EVT_PAINT, self.on_paint)
         self.Bind(wx.EVT_SIZE, self.on_size)
@@ -139,11 +158,6 @@ class MyGLCanvas(wxcanvas.GLCanvas):
             x_end = x_start + (self.cycles_completed + 1)*cycle_width
             GL.glVertex2f(x_start, y_val)
             GL.glVertex2f(x_end, y_val)
-
-            par = 10
-            for i in range(self.cycles_completed+1):
-                GL.glVertex2f(x_start+i*cycle_width, y_val+par)
-                GL.glVertex2f(x_start+i*cycle_width, y_val-par)
             GL.glEnd()
             # Draw arrowhead
             GL.glBegin(GL.GL_TRIANGLES)
@@ -155,36 +169,43 @@ class MyGLCanvas(wxcanvas.GLCanvas):
             GL.glVertex2f(x_end - 10, y_val + 5)
             GL.glEnd()
 
+            # Only the cycles and monitors in view are drawn
+            [first_cycle, last_cycle, cycles_per_pixel] = \
+                self.get_visible_cycles(x_start, cycle_width)
+            [bottom, top] = self.get_visible_heights()
+            label_step = self.get_label_step(cycle_width)
+
+            GL.glEnableClientState(GL.GL_VERTEX_ARRAY)
+            par = 10
+            [ticks, tick_count] = self.geometry.get_tick_vertices(
+                first_cycle, last_cycle, label_step)
+            self.draw_vertices(GL.GL_LINES, ticks, tick_count, x_start,
+                               y_val, cycle_width, par)
+
             # label the axis
             self.render_text("Time", 50, y_val)
-            for i in range(self.cycles_completed+1):
+            first_label = -(-first_cycle // label_step) * label_step
+            for i in range(first_label, last_cycle+1, label_step):
                 self.render_text(str(i), x_start+i*cycle_width, y_val-10)
 
             # draw output signals at monitoring points
-            for i in range(len(self.gui_monitors)):
-                monitor_str_list = list(self.gui_monitors.keys())
-                monitor_str = monitor_str_list[i]
+            for i, monitor_str in enumerate(self.gui_monitors):
                 height = y_val + (i+1)*100
+                if height + 20 < bottom or height - 20 > top:
+                    continue
                 self.render_text(monitor_str, 50, height)
                 self.render_text("1", x_start-10, height+20)
                 self.render_text("0", x_start-10, height-20)
-                signal_list = self.gui_monitors[monitor_str]
+                # The traces may be recorded by a simulation thread
+                with self.simulation_lock:
+                    [vertices, count] = self.geometry.get_trace_vertices(
+                        monitor_str, self.gui_monitors[monitor_str],
+                        first_cycle, last_cycle, cycles_per_pixel)
                 GL.glColor3f(0.0, 0.0, 1.0)  # signal trace is blue
-                GL.glBegin(GL.GL_LINE_STRIP)
-                for j in range(self.cycles_completed):
-                    if signal_list[j] == self.devices.LOW:
-                        GL.glVertex2f(x_start+j*cycle_width, height-20)
-                        GL.glVertex2f(x_start+(j+1)*cycle_width, height-20)
-                    elif signal_list[j] == self.devices.HIGH:
-                        GL.glVertex2f(x_start+j*cycle_width, height+20)
-                        GL.glVertex2f(x_start+(j+1)*cycle_width, height+20)
-                    elif signal_list[j] == self.devices.RISING:
-                        GL.glVertex2f(x_start+j*cycle_width, height)
-                        GL.glVertex2f(x_start+(j+1)*cycle_width, height+20)
-                    elif signal_list[j] == self.devices.FALLING:
-                        GL.glVertex2f(x_start+j*cycle_width, height)
-                        GL.glVertex2f(x_start+(j+1)*cycle_width, height-20)
-                GL.glEnd()
+                self.draw_vertices(GL.GL_LINE_STRIP, vertices, count,
+                                   x_start, height, cycle_width, 20)
+            GL.glDisableClientState(GL.GL_VERTEX_ARRAY)
+            self.geometry.remove_stale(self.gui_monitors)
 
         # We have been drawing to the back buffer, flush the graphics pipeline
         # and swap the back buffer to the front
@@ -269,6 +290,54 @@ class MyGLCanvas(wxcanvas.GLCanvas):
             else:
                 GLUT.glutBitmapCharacter(font, ord(character))
 
+    def draw_vertices(self, mode, vertices, count, x_pos, y_pos, x_scale,
+                      y_scale):
+        """Draw a vertex array with one call.
+
+        The vertices are (x, y) pairs of floats, drawn translated to
+        (x_pos, y_pos) and scaled by x_scale and y_scale. The vertex array
+        client state must be enabled.
+        """
+        if count == 0:
+            return
+        GL.glPushMatrix()
+        GL.glTranslatef(x_pos, y_pos, 0.0)
+        GL.glScalef(x_scale, y_scale, 1.0)
+        GL.glVertexPointer(2, GL.GL_FLOAT, 0, vertices)
+        GL.glDrawArrays(mode, 0, count)
+        GL.glPopMatrix()
+
+    def get_visible_cycles(self, x_start, cycle_width):
+        """Return the range of cycles in view and the cycles per pixel.
+
+        The range is [first_cycle, last_cycle] for a time axis starting at
+        x_start, clipped to the cycles completed.
+        """
+        width = self.GetClientSize().width
+        left = (-self.pan_x / self.zoom - x_start) / cycle_width
+        right = ((width - self.pan_x) / self.zoom - x_start) / cycle_width
+        first_cycle = min(max(int(left), 0), self.cycles_completed)
+        last_cycle = min(max(int(right) + 1, 0), self.cycles_completed)
+        return [first_cycle, last_cycle, 1 / (cycle_width * self.zoom)]
+
+    def get_visible_heights(self):
+        """Return the range of heights in view, before panning and zoom."""
+        height = self.GetClientSize().height
+        return [-self.pan_y / self.zoom, (height - self.pan_y) / self.zoom]
+
+    def get_label_step(self, cycle_width):
+        """Return the number of cycles between the ticks and axis labels.
+
+        The step is 1, 2 or 5 times a power of ten, the smallest that keeps
+        the labels label_spacing pixels apart at the current zoom.
+        """
+        scale = 1
+        while True:
+            for step in [scale, 2 * scale, 5 * scale]:
+                if step * cycle_width * self.zoom >= self.label_spacing:
+                    return step
+            scale *= 10
+
     def reset_view(self):
         """Return to the initial view point"""
         self.zoom = 1
@@ -324,9 +393,23 @@ class Gui(wx.Frame):
     on_quit_button(self, event): Event handler for when the user clicks the
                                     quit button.
 
+    on_close(self, event): Event handler for when the window is closed.
+
     on_continue_button(self, event): Event handler for when the user clicks the
                                     continue button
 
+    on_cancel_button(self, event): Event handler for when the user clicks the
+                                   cancel button
+
+    start_simulation(self, cycles): Runs the network for a number of cycles
+                                    in a background thread
+
+    on_simulation_progress(self, run, cycles, cycles_per_second): Redraws
+                                    the traces recorded so far
+
+    on_simulation_done(self, run, cycles, oscillating): Ends a simulation
+                                    run
+
     switch_change(self, switch_id): Event handler for when the user set switc
                                     to the other
 
@@ -348,6 +431,12 @@ class Gui(wx.Frame):
     on_new_file(self): Event handler for when the user clicks the new file
                         button
 
+    on_save_checkpoint(self): Saves the simulation state to a checkpoint
+                              file
+
+    on_load_checkpoint(self): Restores the simulation state from a
+                              checkpoint file
+
     open_file(self): Initialise GUI for new file
     """
 
@@ -359,6 +448,14 @@ class Gui(wx.Frame):
         self.network = network
         self.not_monitored_signal = self.monitors.get_signal_names()[1]
         self.cycles_completed = 0
+        self.profiler = Profiler(network, monitors)
+
+        # Simulation thread, and the lock it holds while executing the
+        # network. Each run has a number, so that late updates from a
+        # cancelled run are ignored.
+        self.simulation_lock = threading.Lock()
+        self.worker = None
+        self.simulation_run = 0
 
         """Initialise widgets and layout."""
         super().__init__(parent=None, title=title, size=(800, 600))
@@ -367,10 +464,22 @@ class Gui(wx.Frame):
         fileMenu = wx.Menu()
         menuBar = wx.MenuBar()
         fileMenu.Append(wx.ID_OPEN, _(u"&New File"))
+        self.save_checkpoint_id = wx.NewIdRef()
+        self.load_checkpoint_id = wx.NewIdRef()
+        fileMenu.Append(self.save_checkpoint_id, _(u"&Save Checkpoint"))
+        fileMenu.Append(self.load_checkpoint_id, _(u"&Load Checkpoint"))
         fileMenu.Append(wx.ID_ABOUT, _(u"&About"))
         fileMenu.Append(wx.ID_EXIT, _(u"&Exit"))
         menuBar.Append(fileMenu, _(u"&File"))
 
+        # Configure the Tools menu
+        tools_menu = wx.Menu()
+        self.profile_id = wx.NewIdRef()
+        self.profile_report_id = wx.NewIdRef()
+        tools_menu.AppendCheckItem(self.profile_id, _(u"&Profile Runs"))
+        tools_menu.Append(self.profile_report_id, _(u"Show P&rofile"))
+        menuBar.Append(tools_menu, _(u"&Tools"))
+
         # Configure the Help menu
         help_menu = wx.Menu()
         help_menu.Append(wx.ID_HELP_COMMANDS, _(u"&Help Commands"))
@@ -379,7 +488,8 @@ class Gui(wx.Frame):
         self.SetMenuBar(menuBar)
 
         # Canvas for drawing signals
-        self.canvas = MyGLCanvas(self, devices, monitors)
+        self.canvas = MyGLCanvas(self, devices, monitors,
+                                 self.simulation_lock)
 
         # Configure sizers for layout
         self.main_sizer = wx.BoxSizer(wx.HORIZONTAL)
@@ -390,6 +500,9 @@ class Gui(wx.Frame):
         self.spin = wx.SpinCtrl(self, wx.ID_ANY, "10", min=1)
         self.run_button = wx.Button(self, wx.ID_ANY, _(u"Run"))
         self.continue_button = wx.Button(self, wx.ID_ANY, _(u"Continue"))
+        self.cancel_button = wx.Button(self, wx.ID_ANY, _(u"Cancel"))
+        self.cancel_button.Disable()
+        self.rate_text = wx.StaticText(self, wx.ID_ANY, "")
         # self.clear_button = wx.Button(self, wx.ID_ANY, _(u"Clear"))
         self.quit_button = wx.Button(self, wx.ID_ANY, _(u"Quit"))
         self.text_switch = wx.StaticText(self, wx.ID_ANY, _(u"Switch:"),
@@ -416,10 +529,12 @@ class Gui(wx.Frame):
         # sizer children for sizer_cycle
         self.sizer_cycle.Add(self.text, 1, wx.ALL, 5)
         self.sizer_cycle.Add(self.spin, 1, wx.ALL, 5)
+        self.sizer_cycle.Add(self.rate_text, 1, wx.ALL, 5)
 
         # sizer children for sizer_run
         self.sizer_run.Add(self.run_button, 1, wx.ALL, 5)
         self.sizer_run.Add(self.continue_button, 1, wx.ALL, 5)
+        self.sizer_run.Add(self.cancel_button, 1, wx.ALL, 5)
         # self.sizer_run.Add(self.clear_button, 1, wx.ALL, 5)
         self.sizer_run.Add(self.quit_button, 1, wx.ALL, 5)
 
@@ -535,9 +650,11 @@ class Gui(wx.Frame):
 
         # Bind events to widgets
         self.Bind(wx.EVT_MENU, self.on_menu)
+        self.Bind(wx.EVT_CLOSE, self.on_close)
         self.spin.Bind(wx.EVT_SPINCTRL, self.on_spin)
         self.run_button.Bind(wx.EVT_BUTTON, self.on_run_button)
         self.continue_button.Bind(wx.EVT_BUTTON, self.on_continue_button)
+        self.cancel_button.Bind(wx.EVT_BUTTON, self.on_cancel_button)
         self.quit_button.Bind(wx.EVT_BUTTON, self.on_quit_button)
         self.monitor_add_button.Bind(wx.EVT_BUTTON, self.on_add_monitor_button)
         self.reset_view_button.Bind(wx.EVT_BUTTON, self.on_reset_view)
@@ -557,10 +674,27 @@ class Gui(wx.Frame):
                           _(u"About Logsim"), wx.ICON_INFORMATION | wx.OK)
         if Id == wx.ID_OPEN:
             self.on_new_file()
+        if Id == self.save_checkpoint_id:
+            self.on_save_checkpoint()
+        if Id == self.load_checkpoint_id:
+            self.on_load_checkpoint()
+        if Id == self.profile_id:
+            if event.IsChecked():
+                self.profiler.enable()
+            else:
+                self.profiler.disable()
+        if Id == self.profile_report_id:
+            if self.profiler.enabled:
+                report = self.profiler.get_report()
+            else:
+                report = _(u"Profiling is off. Select Tools > Profile Runs "
+                           "and run the simulation.")
+            wx.MessageBox(report, _(u"Profile"), wx.OK | wx.ICON_INFORMATION)
         if Id == wx.ID_HELP_COMMANDS:
             wx.MessageBox(_("User Commands\n"
                             "\nRun             -> run the simulation\n"
                             "\nContinue        -> continue simulation\n"
+                            "\nCancel          -> stop the simulation\n"
                             "\nToggle Switch   -> change the switch state\n"
                             "\nAdd             -> set a monitor on signal\n"
                             "\nRemove          -> zap the monior on signal\n"
@@ -576,38 +710,107 @@ class Gui(wx.Frame):
 
     def on_run_button(self, event):
         """Handle the event when the user clicks the run button."""
+        if self.worker is not None:
+            return
         self.cycles_completed = 0
         num_cycles = self.spin.GetValue()
         self.monitored_signal = self.monitors.get_signal_names()[0]
         self.monitors.reset_monitors()
         self.devices.cold_startup()
-        for _ in range(num_cycles):
-            if self.network.execute_network():
-                self.monitors.record_signals()
-                self.cycles_completed += 1
-        self.gui_monitors = self.convert_gui_monitors()
-        self.canvas.render("", self.cycles_completed, self.gui_monitors)
+        self.profiler.reset()
+        self.start_simulation(num_cycles)
 
     def on_continue_button(self, event):
         """Event handler for when the user clicks the continue button"""
+        if self.worker is not None:
+            return
         text = "Continue button pressed."
         self.canvas.render(text)
         if self.cycles_completed > 0:
             num_cycles = self.spin.GetValue()
             self.monitored_signal = self.monitors.get_signal_names()[0]
-            for _ in range(num_cycles):
-                if self.network.execute_network():
-                    self.monitors.record_signals()
-                    self.cycles_completed += 1
+            self.profiler.reset()
+            self.start_simulation(num_cycles)
+
+    def on_cancel_button(self, event):
+        """Event handler for when the user clicks the cancel button"""
+        if self.worker is not None:
+            self.worker.cancel()
+
+    def start_simulation(self, cycles):
+        """Run the network for a number of cycles in a background thread.
+
+        The worker reports back through wx.CallAfter, so that the traces
+        are drawn on the GUI thread as they are recorded.
+        """
+        self.simulation_run += 1
+        run = self.simulation_run
+        first_cycle = self.cycles_completed
+
+        def progress(cycles, cycles_per_second):
+            wx.CallAfter(self.on_simulation_progress, run,
+                         first_cycle + cycles, cycles_per_second)
+
+        def done(cycles, oscillating):
+            wx.CallAfter(self.on_simulation_done, run, first_cycle + cycles,
+                         oscillating)
+
+        self.worker = SimulationWorker(self.network, self.monitors, cycles,
+                                       self.simulation_lock, progress, done)
+        self.run_button.Disable()
+        self.continue_button.Disable()
+        self.cancel_button.Enable()
+        self.worker.start()
+
+    def on_simulation_progress(self, run, cycles, cycles_per_second):
+        """Redraw the traces recorded so far by the simulation thread."""
+        if run != self.simulation_run:
+            return
+        self.cycles_completed = cycles
+        self.rate_text.SetLabel("".join([str(int(cycles_per_second)),
+                                         _(u" cycles/s")]))
+        if cycles > 0:
             self.gui_monitors = self.convert_gui_monitors()
             self.canvas.render("", self.cycles_completed, self.gui_monitors)
 
+    def on_simulation_done(self, run, cycles, oscillating):
+        """End a simulation run and draw its traces."""
+        if run != self.simulation_run:
+            return
+        cancelled = self.worker.cancelled.is_set()
+        self.worker = None
+        self.run_button.Enable()
+        self.continue_button.Enable()
+        self.cancel_button.Disable()
+        self.cycles_completed = cycles
+        if oscillating:
+            text = _(u"Error! The network oscillates.")
+        elif cancelled:
+            text = _(u"Simulation cancelled.")
+        else:
+            text = ""
+        self.gui_monitors = self.convert_gui_monitors()
+        self.canvas.render(text, self.cycles_completed, self.gui_monitors)
+
     def on_quit_button(self, event):
         """Event handler for when the user clicks the quit button."""
         text = "Quit button pressed."
         self.canvas.render(text)
         self.main_sizer.GetContainingWindow().Close()
 
+    def on_close(self, event):
+        """Event handler for when the window is closed.
+
+        Any simulation run is stopped first, and the calls it has already
+        posted are ignored, so that they do not reach deleted widgets.
+        """
+        if self.worker is not None:
+            self.worker.cancel()
+            self.worker.join()
+            self.worker = None
+            self.simulation_run += 1
+        event.Skip()  # destroy the window
+
     def switch_change(self, event):
         """Event handler for when the user set switch to the other."""
         self.tog_btn = event.GetEventObject()
@@ -634,13 +837,18 @@ class Gui(wx.Frame):
                     self.swt_st.SetForegroundColour(wx.Colour(0, 100, 100))
                     new_signal = 1
                     self.tog_btn.SetBackgroundColour(wx.Colour(255, 255, 255))
-                self.devices.set_switch(switch_id, new_signal)
+                # The network may be executing in the simulation thread
+                with self.simulation_lock:
+                    self.devices.set_switch(switch_id, new_signal)
                 self.gui_monitors = self.convert_gui_monitors()
                 text = _(u"switch input is flipped.")
                 self.canvas.render(text)
 
     def on_add_monitor_button(self, event):
         """Event handler for when the user clicks the add monitor button"""
+        if self.worker is not None:
+            self.canvas.render(_(u"Cannot change monitors while running."))
+            return
         monitor = self.monitor_combo.GetValue()
         if monitor is not None:
             [device_id, output_id] = self.devices.get_signal_ids(monitor)
@@ -676,6 +884,10 @@ class Gui(wx.Frame):
     def on_zap_monitor_button(self, monitor):
         """Event handler for when user clicks the remove button"""
         def remove_pushed(event):
+            if self.worker is not None:
+                self.canvas.render(
+                    _(u"Cannot change monitors while running."))
+                return
             obj_monitor = event.GetEventObject()
             obj_sizer = obj_monitor.GetContainingSizer()
             self.sizer_monitor.Hide(obj_sizer)
@@ -719,6 +931,48 @@ class Gui(wx.Frame):
             self.canvas.save_image(file_path)
         dlg.Destroy()
 
+    def on_save_checkpoint(self):
+        """Save the simulation state to a checkpoint file."""
+        if self.worker is not None:
+            self.canvas.render(_(u"Cannot save a checkpoint while running."))
+            return
+        dialog = wx.FileDialog(self, _(u"Save Checkpoint"),
+                               wildcard="Checkpoint (*.lscp)|*.lscp",
+                               style=wx.FD_SAVE | wx.FD_OVERWRITE_PROMPT)
+        if dialog.ShowModal() == wx.ID_OK:
+            checkpoint = Checkpoint(self.names, self.devices, self.network,
+                                    self.monitors)
+            if checkpoint.save(dialog.GetPath(), self.cycles_completed):
+                text = _(u"Checkpoint saved.")
+            else:
+                text = _(u"Error! Could not write the checkpoint file.")
+            self.canvas.render(text)
+        dialog.Destroy()
+
+    def on_load_checkpoint(self):
+        """Restore the simulation state from a checkpoint file."""
+        if self.worker is not None:
+            self.canvas.render(_(u"Cannot load a checkpoint while running."))
+            return
+        dialog = wx.FileDialog(self, _(u"Load Checkpoint"),
+                               wildcard="Checkpoint (*.lscp)|*.lscp",
+                               style=wx.FD_OPEN | wx.FD_FILE_MUST_EXIST)
+        if dialog.ShowModal() == wx.ID_OK:
+            checkpoint = Checkpoint(self.names, self.devices, self.network,
+                                    self.monitors)
+            cycles_completed = checkpoint.restore(dialog.GetPath())
+            if cycles_completed is None:
+                wx.MessageBox(_(u"Not a checkpoint of this circuit!"),
+                              _(u"Error"), wx.OK | wx.ICON_ERROR)
+            else:
+                # the switch states and monitors may have changed
+                self.open_file()
+                self.cycles_completed = cycles_completed
+                self.gui_monitors = self.convert_gui_monitors()
+                self.canvas.render(_(u"Checkpoint loaded."),
+                                   self.cycles_completed, self.gui_monitors)
+        dialog.Destroy()
+
     def on_new_file(self, file=True):
         """Event handler for when the user clicks the new file button"""
         wildcard = "Text file (*.txt)|*.txt"
@@ -735,21 +989,23 @@ class Gui(wx.Frame):
             # Process the selected file (e.g., open it, read data, etc.)
             print("Selected file:", path)
             if Path(path).suffix == ".txt":
-                # initialise network variables
-                names = Names()
-                devices = Devices(names)
-                network = Network(names, devices)
-                monitors = Monitors(names, devices, network)
-                scanner = Scanner(path, names, devices, network, monitors)
-                parser = Parser(names, devices, network, monitors, scanner)
-                if parser.parse_network():
+                # initialise network variables, from the cache if possible
+                circuit = CircuitCache().load_or_parse(path)
+                if circuit is not None:
+                    # stop any run of the old circuit
+                    if self.worker is not None:
+                        self.worker.cancel()
+                        self.worker.join()
+                        self.on_simulation_done(self.simulation_run,
+                                                self.cycles_completed, False)
+                        self.simulation_run += 1
                     # set up gui for new circuit
-                    self.names = names
-                    self.devices = devices
-                    self.network = network
-                    self.monitors = monitors
-                    self.scanner = scanner
-                    self.parser = parser
+                    profiling = self.profiler.disable()
+                    [self.names, self.devices, self.network,
+                     self.monitors] = circuit
+                    self.profiler = Profiler(self.network, self.monitors)
+                    if profiling:
+                        self.profiler.enable()
                     self.open_file()
                 else:
                     wx.MessageBox(_(u"Error reading the file!"),
@@ -17,12 +17,7 @@ import os
 import wx
 import gettext
 
-from names import Names
-from devices import Devices
-from network import Network
-from monitors import Monitors
-from scanner import Scanner
-from parse import Parser
+from cache import CircuitCache
 from userint import UserInterface
 from gui import Gui
 
@@ -46,15 +41,9 @@ def main(arg_list):
         print(usage_message)
         sys.exit()
 
-    # Initialise instances of the four inner simulator classes
-    names = Names()
-    devices = Devices(names)
-    network = Network(names, devices)
-    monitors = Monitors(names, devices, network)
-    # names = None
-    # devices = None
-    # network = None
-    # monitors = None
+    # Builds the instances of the four inner simulator classes, or loads
+    # them if the definition file was opened before
+    circuit_cache = CircuitCache()
 
     # languages supported
     supLang = {u"en_GB.UTF-8": wx.LANGUAGE_ENGLISH,
@@ -66,16 +55,16 @@ def main(arg_list):
             print(usage_message)
             sys.exit()
         elif option == "-c":  # use the command line user interface
-            scanner = Scanner(path, names, devices, network, monitors)
-            parser = Parser(names, devices, network, monitors, scanner)
-            if parser.parse_network():
+            circuit = circuit_cache.load_or_parse(path)
+            if circuit is not None:
+                [names, devices, network, monitors] = circuit
                 # Initialise an instance of the userint.UserInterface() class
                 userint = UserInterface(names, devices, network, monitors)
                 userint.command_interface()
         elif option == "-j":  # Launch GUI in Japanese
-            scanner = Scanner(path, names, devices, network, monitors)
-            parser = Parser(names, devices, network, monitors, scanner)
-            if parser.parse_network():
+            circuit = circuit_cache.load_or_parse(path)
+            if circuit is not None:
+                [names, devices, network, monitors] = circuit
                 app = wx.App()
 
                 # Internationalisation
@@ -99,9 +88,9 @@ def main(arg_list):
             sys.exit()
 
         [path] = arguments
-        scanner = Scanner(path, names, devices, network, monitors)
-        parser = Parser(names, devices, network, monitors, scanner)
-        if parser.parse_network():
+        circuit = circuit_cache.load_or_parse(path)
+        if circuit is not None:
+            [names, devices, network, monitors] = circuit
             # Initialise an instance of the gui.Gui() class
             app = wx.App()
             # Internationalisation
@@ -10,6 +10,9 @@ Monitors - records and displays specified output signals.
 """
 import collections
 
+from traces import SignalTrace
+from vcd import VcdWriter
+
 
 class Monitors:
 
@@ -23,6 +26,7 @@ class Monitors:
     names: instance of the names.Names() class.
     devices: instance of the devices.Devices() class.
     network: instance of the network.Network() class.
+    run_length: True to store the signal traces run-length encoded.
 
     Public methods
     --------------
@@ -35,7 +39,8 @@ class Monitors:
     get_monitor_signal(self, device_id, output_id): Returns the signal level of
                                                     the specified monitor.
 
-    record_signals(self): Records the current signal level of all monitors.
+    record_signals(self, cycles=1): Records the current signal level of all
+                                    monitors for a number of cycles.
 
     get_signal_names(self): Returns two lists of signal names: monitored and
                             not monitored.
@@ -45,21 +50,62 @@ class Monitors:
     get_margin(self): Returns the length of the longest monitor's name.
 
     display_signals(self): Displays signal trace(s) in the text console.
+
+    start_vcd(self, vcd_file, keep_traces=True): Streams the recorded signals
+                                                 to a VCD file.
+
+    stop_vcd(self): Stops streaming and closes the VCD file.
+
+    record_batch_signals(self, netlist): Records the word of every monitor
+                                         from a bit-parallel netlist.
+
+    reset_batch_monitors(self): Clears the recorded words of all monitors.
+
+    get_batch_signals(self, device_id, output_id, pattern): Returns the
+                                signal trace of a monitor under one pattern.
+
+    get_batch_traces(self, pattern_count): Returns the signal traces of all
+                                           monitors under each pattern.
     """
 
-    def __init__(self, names, devices, network):
+    def __init__(self, names, devices, network, run_length=False):
         """Initialise the monitors dictionary and monitor errors."""
         self.names = names
         self.network = network
         self.devices = devices
+        self.run_length = run_length
 
         # monitors_dictionary stores
-        # {(device_id, output_id): [signal_list]}
+        # {(device_id, output_id): signal_trace}, where each signal_trace
+        # is a traces.SignalTrace that behaves like a list of signals
         self.monitors_dictionary = collections.OrderedDict()
 
+        # batch_dictionary stores {(device_id, output_id): [word_list]}
+        # where bit k of each word is the signal under pattern k
+        self.batch_dictionary = collections.OrderedDict()
+
+        # VCD writer the recorded signals are streamed to, if any
+        self.vcd_writer = None
+        self.keep_traces = True
+        # Cycles streamed to the VCD file without being added to the traces
+        self.streamed_cycles = 0
+
         [self.NO_ERROR, self.NOT_OUTPUT,
          self.MONITOR_PRESENT] = self.names.unique_error_codes(3)
 
+    def __getstate__(self):
+        """Return the attributes to pickle, without the runtime state.
+
+        The VCD file being streamed to and any profiler wrapper cannot be
+        pickled, so a copy of the monitors keeps its traces and writes no
+        VCD file.
+        """
+        state = {name: value for name, value in vars(self).items()
+                 if not hasattr(type(self), name)}
+        state["vcd_writer"] = None
+        state["keep_traces"] = True
+        return state
+
     def make_monitor(self, device_id, output_id, cycles_completed=0):
         """Add the specified signal to the monitors dictionary.
 
@@ -74,11 +120,15 @@ class Monitors:
             return self.MONITOR_PRESENT
         else:
             # If n simulation cycles have been completed before making this
-            # monitor, then initialise the signal trace with an n-length list
-            # of BLANK signals. Otherwise, initialise the trace with an empty
-            # list.
-            self.monitors_dictionary[(device_id, output_id)] = [
-                self.devices.BLANK] * cycles_completed
+            # monitor, then initialise the signal trace with n BLANK signals,
+            # less the cycles that were only streamed to a VCD file, so that
+            # it lines up with the other traces. Otherwise, initialise the
+            # trace empty.
+            blank_cycles = max(cycles_completed - self.streamed_cycles, 0)
+            trace = SignalTrace(run_length=self.run_length)
+            if blank_cycles:
+                trace.append(self.devices.BLANK, blank_cycles)
+            self.monitors_dictionary[(device_id, output_id)] = trace
             return self.NO_ERROR
 
     def remove_monitor(self, device_id, output_id):
@@ -102,15 +152,48 @@ class Monitors:
         else:
             return None
 
-    def record_signals(self):
+    def record_signals(self, cycles=1):
         """Record the current signal level for every monitor.
 
-        This function is called at every simulation cycle.
+        This function is called at every simulation cycle, or once for a
+        number of cycles in which the signals do not change. The signals are
+        also streamed to the VCD file, if one was started.
         """
+        signals = {}
         for device_id, output_id in self.monitors_dictionary:
             signal_level = self.get_monitor_signal(device_id, output_id)
-            self.monitors_dictionary[(device_id,
-                                      output_id)].append(signal_level)
+            signals[(device_id, output_id)] = signal_level
+            if self.keep_traces:
+                self.monitors_dictionary[(device_id,
+                                          output_id)].append(signal_level,
+                                                             cycles)
+        if not self.keep_traces:
+            self.streamed_cycles += cycles
+        if self.vcd_writer is not None:
+            self.vcd_writer.write_cycle(signals, cycles)
+
+    def start_vcd(self, vcd_file, keep_traces=True):
+        """Stream the signals recorded from now on to a VCD file.
+
+        vcd_file is a file object opened for writing text. If keep_traces is
+        False, the signal traces are no longer kept in memory, so that long
+        simulations run with bounded memory.
+        """
+        self.stop_vcd()
+        self.vcd_writer = VcdWriter(self.devices, self, vcd_file)
+        self.keep_traces = keep_traces
+
+    def stop_vcd(self):
+        """Stop streaming to the VCD file and close it.
+
+        Return True if a VCD file was being written.
+        """
+        if self.vcd_writer is None:
+            return False
+        self.vcd_writer.close()
+        self.vcd_writer = None
+        self.keep_traces = True
+        return True
 
     def get_signal_names(self):
         """Return two signal name lists: monitored and not monitored."""
@@ -135,8 +218,10 @@ class Monitors:
 
         The list of stored signal levels for each monitor is deleted.
         """
+        self.streamed_cycles = 0
         for device_id, output_id in self.monitors_dictionary:
-            self.monitors_dictionary[(device_id, output_id)] = []
+            self.monitors_dictionary[(device_id, output_id)] = SignalTrace(
+                run_length=self.run_length)
 
     def get_margin(self):
         """Return the length of the longest monitor's name.
@@ -156,7 +241,11 @@ class Monitors:
             return None
 
     def display_signals(self):
-        """Display the signal trace(s) in the text console."""
+        """Display the signal trace(s) in the text console.
+
+        The cycles streamed to a VCD file without keeping the traces are not
+        shown, and their number is printed instead.
+        """
         margin = self.get_margin()
         for device_id, output_id in self.monitors_dictionary:
             monitor_name = self.devices.get_signal_name(device_id, output_id)
@@ -175,3 +264,43 @@ class Monitors:
                 if signal == self.devices.BLANK:
                     print(" ", end="")
             print("\n", end="")
+        if self.streamed_cycles:
+            print("".join([str(self.streamed_cycles), " cycles streamed to "
+                           "the VCD file are not shown."]))
+
+    def record_batch_signals(self, netlist):
+        """Record the word of every monitor from a bit-parallel netlist.
+
+        This function is called at every cycle of a bit-parallel simulation.
+        """
+        for device_id, output_id in self.monitors_dictionary:
+            word = netlist.get_word(device_id, output_id)
+            self.batch_dictionary.setdefault((device_id, output_id),
+                                             []).append(word)
+
+    def reset_batch_monitors(self):
+        """Clear the recorded words of all the monitors."""
+        self.batch_dictionary = collections.OrderedDict()
+
+    def get_batch_signals(self, device_id, output_id, pattern):
+        """Return the signal trace of the monitor under one pattern.
+
+        Return None if no words were recorded for the monitor.
+        """
+        if (device_id, output_id) not in self.batch_dictionary:
+            return None
+        return [(word >> pattern) & 1 for word in
+                self.batch_dictionary[(device_id, output_id)]]
+
+    def get_batch_traces(self, pattern_count):
+        """Return the signal traces of all monitors under each pattern.
+
+        The result is of the form {(device_id, output_id): [signal_list]},
+        with one signal list for each of the first pattern_count patterns.
+        """
+        batch_traces = collections.OrderedDict()
+        for device_id, output_id in self.batch_dictionary:
+            batch_traces[(device_id, output_id)] = [
+                self.get_batch_signals(device_id, output_id, pattern)
+                for pattern in range(pattern_count)]
+        return batch_traces
@@ -0,0 +1,169 @@
+"""Gather statistics of the monitored signals over many cold start-ups.
+
+Used in the Logic Simulator project to see how a circuit behaves whatever
+the random states its D-types and clocks start up in: the circuit is run
+from many seeded cold start-ups across a process pool, and the traces of
+each monitor are reduced to the probability of a HIGH signal at each cycle
+and the number of cycles taken to settle.
+
+Classes
+-------
+MonteCarlo - runs seeded cold start-ups and gathers monitor statistics.
+"""
+import random
+
+from batch import BatchRunner
+
+
+class MonteCarlo:
+
+    """Run seeded cold start-ups of a circuit and gather monitor statistics.
+
+    Each run is a BatchRunner scenario with its own seed, derived from the
+    seed of the whole analysis, so the same analysis always gives the same
+    statistics, however many processes share the runs. The statistics are
+    returned as a dictionary:
+    {"runs": number of runs, "cycles": cycles per run,
+     "oscillating": number of runs that oscillated,
+     "monitors": {(device_id, output_id): {
+         "high_probability": [fraction of runs HIGH at each cycle],
+         "settle_times": [cycles before settling, for each run]}}}
+
+    A monitor settles at the first cycle from which its signal repeats with
+    the period of the network, so a signal driven by a clock settles once it
+    follows the clock. Its settle time is None in the runs where no period
+    was found, such as oscillating runs, so period detection is turned on
+    in the copies of the circuit used by the runs.
+
+    Parameters
+    ----------
+    names: instance of the names.Names() class.
+    devices: instance of the devices.Devices() class.
+    network: instance of the network.Network() class.
+    monitors: instance of the monitors.Monitors() class.
+    processes: number of worker processes, or None for one per core.
+
+    Public methods
+    --------------
+    get_seeds(runs, seed): Returns the seed of each run.
+
+    get_settle_time(signals, period): Returns the first cycle from which the
+                                      signals repeat with the period.
+
+    run(self, runs, cycles, seed=0, switches=None): Runs the cold start-ups
+                                                    and returns the
+                                                    statistics.
+
+    get_report(self, statistics): Returns the statistics as text.
+    """
+
+    def __init__(self, names, devices, network, monitors, processes=None):
+        """Initialise the batch runner of the cold start-ups."""
+        self.names = names
+        self.devices = devices
+        detect_period = network.detect_period
+        network.detect_period = True
+        self.runner = BatchRunner(names, devices, network, monitors,
+                                  processes)
+        network.detect_period = detect_period
+
+    @staticmethod
+    def get_seeds(runs, seed):
+        """Return the seed of each of the runs of the analysis seed.
+
+        The first runs of a longer analysis have the same seeds.
+        """
+        generator = random.Random(seed)
+        return [generator.getrandbits(32) for _ in range(runs)]
+
+    @staticmethod
+    def get_settle_time(signals, period):
+        """Return the first cycle from which the signals repeat.
+
+        Return None if period is None.
+        """
+        if period is None:
+            return None
+        cycle = len(signals) - period
+        while cycle > 0 and signals[cycle - 1] == signals[cycle - 1 + period]:
+            cycle -= 1
+        return max(cycle, 0)
+
+    def run(self, runs, cycles, seed=0, switches=None):
+        """Run the cold start-ups and return the statistics.
+
+        switches maps switch name strings to their state in every run.
+        Return None if a switch is invalid.
+        """
+        scenarios = [self.runner.make_scenario(switches, cycles, run_seed)
+                     for run_seed in self.get_seeds(runs, seed)]
+        results = self.runner.run(scenarios)
+        if any(result["error"] is not None for result in results):
+            return None
+
+        statistics = {"runs": runs, "cycles": cycles, "monitors": {},
+                      "oscillating": sum([result["oscillating"]
+                                          for result in results])}
+        high_signals = [self.devices.HIGH, self.devices.RISING]
+        for result in results:
+            for key, trace in result["traces"].items():
+                if key not in statistics["monitors"]:
+                    # Changes in the number of HIGH and recorded runs at
+                    # each cycle, summed up once all runs are in
+                    statistics["monitors"][key] = {
+                        "high": [0] * (cycles + 1),
+                        "recorded": [0] * (cycles + 1),
+                        "settle_times": []}
+                monitor = statistics["monitors"][key]
+                start = 0
+                for signal, length in trace.get_runs():
+                    if signal in high_signals:
+                        monitor["high"][start] += 1
+                        monitor["high"][start + length] -= 1
+                    start += length
+                monitor["recorded"][0] += 1
+                monitor["recorded"][start] -= 1
+                monitor["settle_times"].append(self.get_settle_time(
+                    list(trace), result["period"]))
+
+        for monitor in statistics["monitors"].values():
+            high = 0
+            recorded = 0
+            probabilities = []
+            for cycle in range(cycles):
+                high += monitor["high"][cycle]
+                recorded += monitor["recorded"][cycle]
+                if not recorded:  # every run oscillated before this cycle
+                    break
+                probabilities.append(high / recorded)
+            monitor["high_probability"] = probabilities
+            del monitor["high"]
+            del monitor["recorded"]
+        return statistics
+
+    def get_report(self, statistics):
+        """Return the statistics as text."""
+        lines = ["Monte Carlo analysis of {} cold start-ups of {} "
+                 "cycles".format(statistics["runs"], statistics["cycles"])]
+        if statistics["oscillating"]:
+            lines.append("{} runs oscillated".format(
+                statistics["oscillating"]))
+        for (device_id, output_id), monitor in sorted(
+                statistics["monitors"].items(), key=lambda item:
+                self.devices.get_signal_name(*item[0])):
+            probabilities = monitor["high_probability"]
+            settle_times = [settle_time for settle_time
+                            in monitor["settle_times"]
+                            if settle_time is not None]
+            line = "{}: P(HIGH) mean {:.3f}".format(
+                self.devices.get_signal_name(device_id, output_id),
+                sum(probabilities) / max(len(probabilities), 1))
+            if settle_times:
+                line += ", settles in {:.1f} cycles (min {}, max {})".format(
+                    sum(settle_times) / len(settle_times), min(settle_times),
+                    max(settle_times))
+            unsettled = len(monitor["settle_times"]) - len(settle_times)
+            if unsettled:
+                line += ", {} runs unsettled".format(unsettled)
+            lines.append(line)
+        return "\n".join(lines)
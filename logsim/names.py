@@ -34,14 +34,18 @@ class Names:
     lookup(self, name_string_list): Returns a list of name IDs for each
                         name string. Adds a name if not already present.
 
+    intern(self, name_string): Returns the name ID for a single name string.
+                        Adds the name if not already present.
+
     get_name_string(self, name_id): Returns the corresponding name string for
                         the name ID. Returns None if the ID is not present.
     """
 
     def __init__(self):
-        """Initialise names list."""
+        """Initialise names list and the name ID dictionary."""
         self.error_code_count = 0  # how many error codes have been declared
-        self.names = []
+        self.names = []  # name strings, indexed by name ID
+        self.name_ids = {}  # {name_string: name_id}
 
     def unique_error_codes(self, num_error_codes):
         """Return a list of unique integer error codes."""
@@ -60,31 +64,47 @@ class Names:
         """
         if not isinstance(name_string, str):
             raise TypeError("Name string must be a string")
-        if name_string in self.names:
-            return self.names.index(name_string)
-        else:
-            return None
+        return self.name_ids.get(name_string)
 
     def lookup(self, name_string_list):
         """Return a list of name IDs for each name string in name_string_list.
 
-        If the name string is not present in the names list, add it.
+        If the name string is not present in the names list, add it. This is
+        the bulk interning path: each name costs one dictionary lookup, so
+        interning many names at once takes time linear in their number.
         """
         if not isinstance(name_string_list, list):
             return TypeError("Input must be a list")
 
         id_list = []
+        names = self.names
+        name_ids = self.name_ids
         for name_string in name_string_list:
-            if not isinstance(name_string, str):
-                raise TypeError("Each member of input list must be a string")
-            if not name_string.isspace():
-                if name_string not in self.names:
-                    self.names.append(name_string)
-                    id_list.append(self.names.index(name_string))
-                else:
-                    id_list.append(self.names.index(name_string))
+            name_id = name_ids.get(name_string)
+            if name_id is None:
+                if not isinstance(name_string, str):
+                    raise TypeError(
+                        "Each member of input list must be a string")
+                if name_string.isspace():
+                    continue
+                name_id = len(names)
+                names.append(name_string)
+                name_ids[name_string] = name_id
+            id_list.append(name_id)
         return id_list
 
+    def intern(self, name_string):
+        """Return the name ID for name_string, adding it if not present.
+
+        Return None if name_string is whitespace, which is never added.
+        """
+        name_id = self.name_ids.get(name_string)
+        if name_id is None:
+            id_list = self.lookup([name_string])
+            if id_list:
+                name_id = id_list[0]
+        return name_id
+
     def get_name_string(self, name_id):
         """Return the corresponding name string for name_id.
 
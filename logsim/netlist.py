@@ -0,0 +1,270 @@
+"""Compile the network into a levelized, array-backed evaluation plan.
+
+Used in the Logic Simulator project to execute the network without the
+repeated dictionary lookups and fixed-point sweeps of Network.execute_network.
+
+Classes
+-------
+CompiledNetlist - stores and executes the compiled evaluation plan.
+"""
+
+
+class CompiledNetlist:
+
+    """Store and execute the compiled evaluation plan of a network.
+
+    Every device output is given a slot in one flat list of signals. Logic
+    gates are sorted into levels, so that a gate only reads slots written by
+    sources, D-types or gates of lower levels, and can be evaluated in a
+    single pass. D-types are the only sequential elements: the graph is cut
+    at them by treating their outputs as level 0 slots, and the loop through
+    them is closed by re-evaluating the gates until no D-type memory changes.
+
+    The slots hold settled signals, HIGH or LOW. The D-types are updated in
+    turn, as execute_network_sweep visits them, and each pass over them is
+    followed by one pass over the gate levels. A signal that has just
+    changed keeps its old value for the D-types until its device is
+    executed again, as execute_network_sweep sees it RISING or FALLING, so
+    a D-type latches whenever its CLK rises, whether it is driven by a
+    source, a gate or another D-type. The gates take no time, however: when
+    one change reaches both the DATA and the CLK of a D-type through gates,
+    the DATA from before the change is latched, while execute_network_sweep
+    depends on the order it visits the gates in.
+
+    Parameters
+    ----------
+    devices: instance of the devices.Devices() class.
+    network: instance of the network.Network() class.
+
+    Public methods
+    --------------
+    compile(self): Builds the evaluation plan. Returns False if the gates
+                   form a combinational loop.
+
+    get_slot(self, device_id, output_id): Returns the slot of the given
+                                          output.
+
+    execute(self): Executes the network for one simulation cycle.
+    """
+
+    def __init__(self, devices, network):
+        """Initialise the plan variables."""
+        self.devices = devices
+        self.network = network
+
+        self.slots = {}  # {(device_id, output_id): slot}
+        self.slot_outputs = []  # [(outputs dictionary, output_id)]
+        self.signals = []  # settled signal of each slot
+
+        self.levels = []  # [[(gate_kind, output_slot, input_slots)]]
+        self.gates = []  # gates of all levels in evaluation order
+        self.d_types = []  # [(device, q, qbar, clk, data, set, clear)]
+        self.switches = []  # [(device, slot)]
+        self.clocks = []  # [(device, slot)] for CLOCK, SIGGEN and RC
+        self.device_count = 0
+
+    def __getstate__(self):
+        """Return the attributes to pickle, without any profiler wrappers."""
+        return {name: value for name, value in vars(self).items()
+                if not hasattr(type(self), name)}
+
+    def get_slot(self, device_id, output_id):
+        """Return the slot of the given output, or None if it is absent."""
+        return self.slots.get((device_id, output_id))
+
+    def compile(self):
+        """Build the evaluation plan.
+
+        Return True if successful, or False if an input is unconnected or
+        the logic gates form a combinational loop.
+        """
+        devices = self.devices
+        self.slots = {}
+        self.slot_outputs = []
+        self.signals = []
+        for device in devices.devices_list:
+            for output_id, signal in device.outputs.items():
+                self.slots[(device.device_id, output_id)] = len(self.signals)
+                self.slot_outputs.append((device.outputs, output_id))
+                self.signals.append(self.settle(signal))
+
+        self.switches = []
+        self.clocks = []
+        self.d_types = []
+        gate_inputs = {}  # {device_id: [input slots]}
+        for device in devices.devices_list:
+            input_slots = []
+            for connected_output in device.inputs.values():
+                if connected_output not in self.slots:  # unconnected
+                    return False
+                input_slots.append(self.slots[connected_output])
+            output_slot = self.slots.get((device.device_id, None))
+
+            if device.device_kind == devices.SWITCH:
+                self.switches.append((device, output_slot))
+            elif device.device_kind in [devices.CLOCK, devices.SIGGEN,
+                                        devices.RC]:
+                self.clocks.append((device, output_slot))
+            elif device.device_kind == devices.D_TYPE:
+                port_slots = [self.slots[device.inputs[input_id]] for
+                              input_id in [devices.CLK_ID, devices.DATA_ID,
+                                           devices.SET_ID,
+                                           devices.CLEAR_ID]]
+                self.d_types.append(
+                    tuple([device,
+                           self.slots[(device.device_id, devices.Q_ID)],
+                           self.slots[(device.device_id, devices.QBAR_ID)]]
+                          + port_slots))
+            elif device.device_kind in devices.gate_types:
+                gate_inputs[device.device_id] = input_slots
+
+        if not self.levelize(gate_inputs):
+            return False
+        self.device_count = len(devices.devices_list)
+        return True
+
+    def levelize(self, gate_inputs):
+        """Sort the gates into levels using Kahn's algorithm.
+
+        Return False if some gates could not be levelized because they form
+        a combinational loop.
+        """
+        devices = self.devices
+        gate_slots = {self.slots[(device_id, None)]: device_id
+                      for device_id in gate_inputs}
+        # Number of inputs of each gate still waiting on an unlevelled gate
+        waiting = {}
+        readers = {}  # {gate output slot: [reading gate IDs]}
+        level_of = {}
+        ready = []
+        for device_id, input_slots in gate_inputs.items():
+            waiting[device_id] = 0
+            for slot in input_slots:
+                if slot in gate_slots:
+                    waiting[device_id] += 1
+                    readers.setdefault(slot, []).append(device_id)
+            if waiting[device_id] == 0:
+                ready.append(device_id)
+                level_of[device_id] = 0
+
+        self.levels = []
+        self.gates = []
+        while ready:
+            device_id = ready.pop()
+            level = level_of[device_id]
+            while len(self.levels) <= level:
+                self.levels.append([])
+            device = devices.get_device(device_id)
+            output_slot = self.slots[(device_id, None)]
+            gate = (device.device_kind, output_slot,
+                    tuple(gate_inputs[device_id]))
+            self.levels[level].append(gate)
+            for reader_id in readers.get(output_slot, []):
+                level_of[reader_id] = max(level_of.get(reader_id, 0),
+                                          level + 1)
+                waiting[reader_id] -= 1
+                if waiting[reader_id] == 0:
+                    ready.append(reader_id)
+
+        for level in self.levels:
+            self.gates.extend(level)
+        return len(self.gates) == len(gate_inputs)
+
+    def settle(self, signal):
+        """Return the signal a RISING or FALLING signal settles to."""
+        if signal == self.devices.RISING:
+            return self.devices.HIGH
+        elif signal == self.devices.FALLING:
+            return self.devices.LOW
+        return signal
+
+    def write(self, slot, signal):
+        """Store the signal in the slot and in the device outputs."""
+        self.signals[slot] = signal
+        (outputs, output_id) = self.slot_outputs[slot]
+        outputs[output_id] = signal
+
+    def evaluate_gates(self):
+        """Evaluate every gate once, in level order."""
+        signals = self.signals
+        slot_outputs = self.slot_outputs
+        devices = self.devices
+        HIGH = devices.HIGH
+        AND, OR, NAND, NOR = devices.AND, devices.OR, devices.NAND, devices.NOR
+        for (gate_kind, output_slot, input_slots) in self.gates:
+            if gate_kind == AND:
+                signal = int(all([signals[slot] == HIGH
+                                  for slot in input_slots]))
+            elif gate_kind == NAND:
+                signal = 1 - all([signals[slot] == HIGH
+                                  for slot in input_slots])
+            elif gate_kind == OR:
+                signal = int(any([signals[slot] == HIGH
+                                  for slot in input_slots]))
+            elif gate_kind == NOR:
+                signal = 1 - any([signals[slot] == HIGH
+                                  for slot in input_slots])
+            else:  # XOR, which has exactly two inputs
+                signal = int(signals[input_slots[0]]
+                             != signals[input_slots[1]])
+            if signal != signals[output_slot]:
+                signals[output_slot] = signal
+                (outputs, output_id) = slot_outputs[output_slot]
+                outputs[output_id] = signal
+
+    def execute(self):
+        """Execute the network for one simulation cycle.
+
+        Return True if successful and the network does not oscillate.
+        """
+        self.network.update_clocks()
+        self.network.update_siggen()
+        self.network.update_rc()
+
+        # The signals as the D-types see them: a signal that has just
+        # changed keeps its old value until its device is executed again,
+        # as execute_network_sweep sees it RISING or FALLING
+        before = list(self.signals)
+        for (device, slot) in self.clocks:
+            self.write(slot, self.settle(device.outputs[None]))
+        for (device, slot) in self.switches:
+            if device.switch_state != self.signals[slot]:
+                self.write(slot, device.switch_state)
+
+        for iteration in range(self.network.iteration_limit):
+            self.network.settle_iterations = iteration + 1
+            self.update_d_types(before)
+            if iteration == 0:
+                for (device, slot) in self.clocks + self.switches:
+                    before[slot] = self.signals[slot]
+            elif self.signals == before:
+                return True
+            for (gate_kind, output_slot, input_slots) in self.gates:
+                before[output_slot] = self.signals[output_slot]
+            self.evaluate_gates()
+        return False
+
+    def update_d_types(self, before):
+        """Update the memory and outputs of every D-type in turn.
+
+        before holds the signals as the D-types see them, and is updated
+        with the outputs of each D-type. A D-type latches its DATA when its
+        CLK has just risen, which can be caused by the sources, the gates or
+        a D-type updated before it.
+        """
+        signals = self.signals
+        HIGH = self.devices.HIGH
+        LOW = self.devices.LOW
+        for (device, q, qbar, clk, data, set_, clear) in self.d_types:
+            if signals[clk] == HIGH and before[clk] == LOW:
+                device.dtype_memory = before[data]
+            if before[set_] == HIGH and signals[set_] == HIGH:
+                device.dtype_memory = HIGH
+            if before[clear] == HIGH and signals[clear] == HIGH:
+                device.dtype_memory = LOW
+            before[q] = signals[q]
+            before[qbar] = signals[qbar]
+            if (signals[q] != device.dtype_memory
+                    or signals[qbar] == device.dtype_memory):
+                self.write(q, device.dtype_memory)
+                self.write(qbar, 1 - device.dtype_memory)
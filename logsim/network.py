@@ -6,6 +6,10 @@ Classes
 --------
 Network - builds and executes the network.
 """
+import heapq
+
+from netlist import CompiledNetlist
+from vectorized import VectorizedNetlist
 
 
 class Network:
@@ -65,8 +69,68 @@ class Network:
     update_siggen(self): If it is time to do so, sets siggen signals to RISING
                          or FALLING.
 
+    set_execution_mode(self, mode): Selects the algorithm used by
+                                    execute_network.
+
+    build_fanout(self): Builds the fanout index and sweep order used by the
+                        event-driven and incremental modes.
+
+    get_changed_cone(self): Returns the devices downstream of the devices
+                            changed since the last settled cycle.
+
+    forget_signals(self): Drops the signals kept by the execution modes
+                          between cycles.
+
+    compile_network(self, vectorized=None): Builds the compiled netlist used
+                                            by the compiled and vectorized
+                                            modes.
+
+    execute_device(self, device_id): Simulates any device according to its
+                                     kind.
+
     execute_network(self): Executes all the devices in the network for one
                            simulation cycle.
+
+    execute_network_sweep(self): Executes every device in fixed kind order
+                                 until the signals settle.
+
+    execute_network_event_driven(self): Executes only the devices whose
+                                        inputs have changed until the signals
+                                        settle.
+
+    get_quiescent_cycles(self): Returns the number of coming cycles in which
+                                no clock, SIGGEN or RC changes state.
+
+    skip_cycles(self, cycles): Advances the clock, SIGGEN and RC counters
+                               over quiescent cycles.
+
+    find_combinational_loops(self): Returns the strongly connected
+                                    components of the gates and D-types.
+
+    is_ring_oscillator(self, loop): Returns True if a loop is a ring of
+                                    inverters that can never settle.
+
+    get_unstable_loops(self): Returns the loops whose outputs changed when
+                              the network last oscillated.
+
+    repeats_iteration(self, states): Records the state after a settle
+                                     iteration and returns True if it
+                                     repeats an earlier one.
+
+    find_unstable_devices(self, states, state=None): Finds the devices
+                                     changed by the last settle iteration.
+
+    get_state(self): Returns the state of the network, which decides its
+                     future.
+
+    get_output_changes(self, old_state, new_state): Returns the device
+                                    outputs that differ between two states.
+
+    execute_cycles(self, cycles, record): Executes the network for a number
+                                          of cycles, skipping the quiescent
+                                          ones in fast-forward mode and
+                                          replaying the periods of a periodic
+                                          network.
     """
 
     def __init__(self, names, devices):
@@ -79,6 +143,83 @@ class Network:
          self.DEVICE_ABSENT] = self.names.unique_error_codes(6)
         self.steady_state = True  # for checking if signals have settled
 
+        # Number of iterations to wait for the signals to settle before
+        # declaring the network unstable
+        self.iteration_limit = 20
+        self.settle_iterations = 0  # iterations used by the last cycle
+
+        self.execution_modes = [self.SWEEP, self.EVENT_DRIVEN,
+                                self.COMPILED,
+                                self.VECTORIZED] = range(4)
+        self.execution_mode = self.SWEEP
+
+        # (x, y) pairs passed to execute_gate for each gate kind
+        self.gate_rules = {
+            self.devices.AND: (self.devices.HIGH, self.devices.HIGH),
+            self.devices.OR: (self.devices.LOW, self.devices.LOW),
+            self.devices.NAND: (self.devices.HIGH, self.devices.LOW),
+            self.devices.NOR: (self.devices.LOW, self.devices.HIGH),
+            self.devices.XOR: (None, None)}
+
+        # Device kinds in the order execute_network_sweep visits them
+        self.sweep_kinds = [self.devices.SWITCH, self.devices.D_TYPE,
+                            self.devices.CLOCK, self.devices.AND,
+                            self.devices.OR, self.devices.NAND,
+                            self.devices.NOR, self.devices.XOR,
+                            self.devices.RC, self.devices.SIGGEN]
+        self.source_kinds = [self.devices.SWITCH, self.devices.CLOCK,
+                             self.devices.RC, self.devices.SIGGEN]
+
+        # Combinational loops, found lazily by find_combinational_loops
+        self.loops = None
+        self.loop_device_count = 0
+        self.unstable_devices = set()  # devices that changed at oscillation
+        # Settle iterations before each one is checked for a repeated state,
+        # which costs a get_state call, so loops that settle are not checked
+        self.repeat_check_iterations = 4
+
+        # Event-driven and incremental state, built lazily by build_fanout
+        self.fanout = None  # {device_id: [sweep positions of readers]}
+        self.sweep_order = []  # device IDs in sweep order
+        self.fanout_device_count = 0
+        self.source_outputs = {}  # {device_id: outputs at end of cycle}
+        self.primed = False  # True once every device is evaluated
+
+        # True to only execute the devices downstream of a change in the
+        # sweep mode, once a cycle has settled
+        self.incremental = False
+        self.cones = {}  # {changed positions: devices to sweep, by kind}
+        self.cone_cache_limit = 1000
+
+        # Levelized evaluation plan, built by compile_network
+        self.compiled_netlist = None
+
+        # True to skip the cycles in which no clock, SIGGEN or RC changes
+        self.fast_forward = False
+
+        # True to replay the signals of a periodic network instead of
+        # executing it, once its state repeats within period_limit stretches
+        # of executed cycles. Each stretch costs a get_state call, so this
+        # is off unless asked for.
+        self.detect_period = False
+        self.period_limit = 10000
+        self.period = None  # period in cycles found by execute_cycles
+        # States after the stretches executed by execute_cycles, kept
+        # across calls that carry on from the last one
+        self.period_states = {}  # {state: index in period_stretches}
+        self.period_stretches = []  # [(state, cycles)]
+        self.period_end_state = None  # state after the last stretch
+
+    def __getstate__(self):
+        """Return the attributes to pickle, without any profiler wrappers.
+
+        A profiler.Profiler installs its timed wrappers as instance
+        attributes that shadow the methods of the class. They cannot be
+        pickled, so a copy of the network gets the methods of the class.
+        """
+        return {name: value for name, value in vars(self).items()
+                if not hasattr(type(self), name)}
+
     def get_connected_output(self, device_id, input_id):
         """Return the output connected to the given input.
 
@@ -122,6 +263,7 @@ class Network:
 
         Return self.NO_ERROR if successful, or the corresponding error if not.
         """
+        self.loops = None  # the connection may close a loop
         first_device = self.devices.get_device(first_device_id)
         second_device = self.devices.get_device(second_device_id)
 
@@ -161,6 +303,10 @@ class Network:
         else:  # first_port_id not a valid input or output port
             error_type = self.PORT_ABSENT
 
+        if error_type == self.NO_ERROR:
+            # The connection graph has changed
+            self.fanout = None
+            self.compiled_netlist = None
         return error_type
 
     def check_network(self):
@@ -400,22 +546,191 @@ class Network:
                     device.outputs[None] = self.devices.RISING
             device.siggen_counter += 1
 
+    def set_execution_mode(self, mode):
+        """Select the algorithm used by execute_network.
+
+        Return True if successful. The compiled and vectorized modes can only
+        be selected if the network compiles, and the vectorized mode also
+        needs NumPy.
+        """
+        if mode not in self.execution_modes:
+            return False
+        if mode in [self.COMPILED, self.VECTORIZED]:
+            if not self.compile_network(mode == self.VECTORIZED):
+                return False
+        self.execution_mode = mode
+        self.fanout = None
+        return True
+
+    def compile_network(self, vectorized=None):
+        """Build the netlist of the compiled and vectorized modes.
+
+        The netlist is vectorized with NumPy if vectorized is True, or if it
+        is None and the vectorized mode is selected. Return True if
+        successful, or False if an input is unconnected, the logic gates form
+        a combinational loop or NumPy is missing for a vectorized netlist.
+        """
+        if vectorized is None:
+            vectorized = self.execution_mode == self.VECTORIZED
+        if vectorized:
+            compiled_netlist = VectorizedNetlist(self.devices, self)
+        else:
+            compiled_netlist = CompiledNetlist(self.devices, self)
+        if not compiled_netlist.compile():
+            self.compiled_netlist = None
+            return False
+        self.compiled_netlist = compiled_netlist
+        return True
+
+    def build_fanout(self):
+        """Build the fanout index and sweep order of the incremental modes.
+
+        They are used by the event-driven mode and the incremental sweep
+        mode. Each device is given its position in the order
+        execute_network_sweep visits it. The fanout index maps every device
+        ID to the sorted positions of the devices reading one of its outputs.
+        """
+        self.sweep_order = []
+        for device_kind in self.sweep_kinds:
+            self.sweep_order.extend(self.devices.find_devices(device_kind))
+        positions = {device_id: position for position, device_id
+                     in enumerate(self.sweep_order)}
+
+        self.fanout = {device_id: [] for device_id in self.sweep_order}
+        for position, device_id in enumerate(self.sweep_order):
+            device = self.devices.get_device(device_id)
+            for connected_output in device.inputs.values():
+                if connected_output is None:  # unconnected input
+                    continue
+                (output_device_id, output_port_id) = connected_output
+                readers = self.fanout.get(output_device_id)
+                if readers is not None and position not in readers:
+                    readers.append(position)
+        for readers in self.fanout.values():
+            readers.sort()
+
+        self.source_positions = [positions[device_id] for device_id
+                                 in self.sweep_order
+                                 if self.devices.get_device(
+                                     device_id).device_kind
+                                 in self.source_kinds]
+        self.d_type_positions = [positions[device_id] for device_id in
+                                 self.devices.find_devices(
+                                     self.devices.D_TYPE)]
+        self.fanout_device_count = len(self.sweep_order)
+        self.source_outputs = {}
+        self.primed = False
+        self.cones = {}
+
+    def get_changed_cone(self):
+        """Return the devices downstream of the changes since the last cycle.
+
+        A device has changed if it is a switch whose output differs from
+        its switch state, a D-type whose Q output differs from its memory,
+        or any other source whose outputs differ from those at the end of
+        the last settled cycle. Every other device has settled, so
+        executing it cannot change its outputs unless one of its inputs
+        changes. The devices reachable from the changed ones through the
+        fanout index are returned as one list per kind of sweep_kinds, in
+        sweep order. The lists are cached by the changed devices.
+        """
+        changed = []
+        for position in self.d_type_positions + self.source_positions:
+            device_id = self.sweep_order[position]
+            device = self.devices.get_device(device_id)
+            if device.device_kind == self.devices.SWITCH:
+                if device.outputs[None] != device.switch_state:
+                    changed.append(position)
+            elif device.device_kind == self.devices.D_TYPE:
+                if device.outputs[self.devices.Q_ID] != device.dtype_memory:
+                    changed.append(position)
+            elif device.outputs != self.source_outputs.get(device_id):
+                changed.append(position)
+        changed = tuple(sorted(changed))
+        if changed in self.cones:
+            return self.cones[changed]
+
+        cone = set(changed)
+        stack = list(changed)
+        while stack:
+            device_id = self.sweep_order[stack.pop()]
+            for reader in self.fanout[device_id]:
+                if reader not in cone:
+                    cone.add(reader)
+                    stack.append(reader)
+        cone_devices = {device_kind: [] for device_kind in self.sweep_kinds}
+        for position in sorted(cone):
+            device_id = self.sweep_order[position]
+            cone_devices[self.devices.get_device(
+                device_id).device_kind].append(device_id)
+        cone_devices = [cone_devices[device_kind]
+                        for device_kind in self.sweep_kinds]
+
+        if len(self.cones) >= self.cone_cache_limit:
+            self.cones.clear()
+        self.cones[changed] = cone_devices
+        return cone_devices
+
+    def forget_signals(self):
+        """Drop the signals kept by the execution modes between cycles.
+
+        Called when the device state is replaced from outside the
+        simulation, such as by restoring a checkpoint. The event-driven and
+        incremental modes then execute every device in the next cycle, and
+        the compiled netlist is rebuilt from the device outputs.
+        """
+        self.fanout = None
+        self.primed = False
+        self.compiled_netlist = None
+        self.period_end_state = None
+
+    def execute_device(self, device_id):
+        """Simulate the device according to its kind.
+
+        Return True if successful.
+        """
+        device = self.devices.get_device(device_id)
+        if device is None:
+            return False
+        device_kind = device.device_kind
+        if device_kind == self.devices.SWITCH:
+            return self.execute_switch(device_id)
+        elif device_kind == self.devices.D_TYPE:
+            return self.execute_d_type(device_id)
+        elif device_kind in [self.devices.CLOCK, self.devices.SIGGEN]:
+            return self.execute_clock(device_id)
+        elif device_kind == self.devices.RC:
+            return self.execute_rc(device_id)
+        elif device_kind in self.gate_rules:
+            (x, y) = self.gate_rules[device_kind]
+            return self.execute_gate(device_id, x, y)
+        return False
+
     def execute_network(self):
         """Execute all the devices in the network for one simulation cycle.
 
-        Return True if successful and the network does not oscillate.
+        The algorithm used depends on the selected execution mode. Return True
+        if successful and the network does not oscillate.
         """
-        clock_devices = self.devices.find_devices(self.devices.CLOCK)
-        switch_devices = self.devices.find_devices(self.devices.SWITCH)
-        d_type_devices = self.devices.find_devices(self.devices.D_TYPE)
-        and_devices = self.devices.find_devices(self.devices.AND)
-        or_devices = self.devices.find_devices(self.devices.OR)
-        nand_devices = self.devices.find_devices(self.devices.NAND)
-        nor_devices = self.devices.find_devices(self.devices.NOR)
-        xor_devices = self.devices.find_devices(self.devices.XOR)
-        rc_devices = self.devices.find_devices(self.devices.RC)
-        siggen_devices = self.devices.find_devices(self.devices.SIGGEN)
+        if self.execution_mode == self.EVENT_DRIVEN:
+            return self.execute_network_event_driven()
+        elif self.execution_mode in [self.COMPILED, self.VECTORIZED]:
+            if (self.compiled_netlist is None
+                    or self.compiled_netlist.device_count
+                    != len(self.devices.devices_list)):
+                if not self.compile_network():
+                    return False
+            return self.compiled_netlist.execute()
+        return self.execute_network_sweep()
 
+    def execute_network_sweep(self):
+        """Execute every device in fixed kind order until signals settle.
+
+        In incremental mode, once a cycle has settled, only the devices
+        downstream of the changes since then are executed, in the same
+        order. The other devices would keep their outputs. Return True if
+        successful and the network does not oscillate.
+        """
         # This sets clock signals to RISING or FALLING, where necessary
         self.update_clocks()
 
@@ -425,12 +740,38 @@ class Network:
         # This sets RC signal to FALLING, where necessary
         self.update_rc()
 
-        # Number of iterations to wait for the signals to settle before
-        # declaring the network unstable
-        iteration_limit = 20
+        if self.incremental and (self.fanout is None
+                                 or self.fanout_device_count
+                                 != len(self.devices.devices_list)):
+            self.build_fanout()
+        if self.incremental and self.primed:
+            [switch_devices, d_type_devices, clock_devices, and_devices,
+             or_devices, nand_devices, nor_devices, xor_devices, rc_devices,
+             siggen_devices] = self.get_changed_cone()
+        else:
+            clock_devices = self.devices.find_devices(self.devices.CLOCK)
+            switch_devices = self.devices.find_devices(self.devices.SWITCH)
+            d_type_devices = self.devices.find_devices(self.devices.D_TYPE)
+            and_devices = self.devices.find_devices(self.devices.AND)
+            or_devices = self.devices.find_devices(self.devices.OR)
+            nand_devices = self.devices.find_devices(self.devices.NAND)
+            nor_devices = self.devices.find_devices(self.devices.NOR)
+            xor_devices = self.devices.find_devices(self.devices.XOR)
+            rc_devices = self.devices.find_devices(self.devices.RC)
+            siggen_devices = self.devices.find_devices(self.devices.SIGGEN)
+        self.primed = False
+
+        # The signals can only fail to settle around a loop. If the network
+        # has loops, the state after each iteration is kept, and the
+        # network oscillates as soon as a state repeats.
+        if (self.loops is None
+                or self.loop_device_count != len(self.devices.devices_list)):
+            self.find_combinational_loops()
+        states = {}
+        self.unstable_devices = set()
 
         iterations = 0
-        while iterations < iteration_limit:
+        while iterations < self.iteration_limit:
             iterations += 1
             self.steady_state = True
 
@@ -473,4 +814,411 @@ class Network:
                     return False
             if self.steady_state:
                 break
+            if (self.loops and iterations >= self.repeat_check_iterations
+                    and self.repeats_iteration(states)):
+                break
+        else:
+            if not self.steady_state:
+                self.find_unstable_devices(states)
+        self.settle_iterations = iterations
+        if self.incremental and self.steady_state:
+            for position in self.source_positions:
+                device_id = self.sweep_order[position]
+                self.source_outputs[device_id] = dict(
+                    self.devices.get_device(device_id).outputs)
+            self.primed = True
         return self.steady_state
+
+    def execute_network_event_driven(self):
+        """Execute only the devices whose inputs changed until signals settle.
+
+        Devices are evaluated in the same order as execute_network_sweep, so
+        RISING and FALLING edges are seen exactly as in the sweep mode. A
+        device whose output changes is scheduled again for the next sweep,
+        and so are the devices in its fanout, in the current sweep if they
+        come later in the order. Return True if successful and the network
+        does not oscillate.
+        """
+        if (self.fanout is None or self.fanout_device_count
+                != len(self.devices.devices_list)):
+            self.build_fanout()
+
+        self.update_clocks()
+        self.update_siggen()
+        self.update_rc()
+
+        if (self.loops is None
+                or self.loop_device_count != len(self.devices.devices_list)):
+            self.find_combinational_loops()
+        states = {}
+        self.unstable_devices = set()
+
+        # Worklist of (sweep, position) pairs, each scheduled at most once
+        worklist = []
+        scheduled = set()
+        sweep = 0
+
+        def schedule(sweep, position):
+            if (sweep, position) not in scheduled:
+                scheduled.add((sweep, position))
+                heapq.heappush(worklist, (sweep, position))
+
+        if not self.primed:
+            for position in range(len(self.sweep_order)):
+                schedule(1, position)
+        else:
+            # D-type memory can be changed by a cold startup
+            for position in self.d_type_positions:
+                schedule(1, position)
+            for position in self.source_positions:
+                schedule(1, position)
+                device_id = self.sweep_order[position]
+                device = self.devices.get_device(device_id)
+                if device.outputs != self.source_outputs.get(device_id):
+                    # Changed outside the simulation or by update_clocks,
+                    # update_siggen and update_rc
+                    for reader in self.fanout[device_id]:
+                        schedule(1, reader)
+
+        while worklist:
+            if (self.loops and worklist[0][0] > sweep
+                    >= self.repeat_check_iterations
+                    and self.repeats_iteration(states)):
+                self.primed = False
+                return False
+            (sweep, position) = heapq.heappop(worklist)
+            if sweep > self.iteration_limit:
+                self.find_unstable_devices(states)
+                self.primed = False
+                self.steady_state = False
+                return False
+            device_id = self.sweep_order[position]
+            self.steady_state = True
+            if not self.execute_device(device_id):
+                self.primed = False
+                return False
+            if not self.steady_state:  # an output of the device changed
+                schedule(sweep + 1, position)
+                for reader in self.fanout[device_id]:
+                    if reader > position:
+                        schedule(sweep, reader)
+                    else:
+                        schedule(sweep + 1, reader)
+
+        for position in self.source_positions:
+            device_id = self.sweep_order[position]
+            self.source_outputs[device_id] = dict(
+                self.devices.get_device(device_id).outputs)
+        self.primed = True
+        self.steady_state = True
+        self.settle_iterations = sweep  # the last sweep is the deepest
+        return True
+
+    def get_quiescent_cycles(self):
+        """Return the number of coming cycles in which no source changes.
+
+        These are the cycles before update_clocks, update_siggen or
+        update_rc next sets an output. Return None if no clock, SIGGEN or
+        RC will ever change state.
+        """
+        quiescent_cycles = None
+        for device_id in self.devices.find_devices(self.devices.CLOCK):
+            device = self.devices.get_device(device_id)
+            if device.clock_counter <= device.clock_half_period:
+                cycles = device.clock_half_period - device.clock_counter
+                if quiescent_cycles is None or cycles < quiescent_cycles:
+                    quiescent_cycles = cycles
+        for device_id in self.devices.find_devices(self.devices.SIGGEN):
+            device = self.devices.get_device(device_id)
+            for switch_point in device.siggen_switch_point + [
+                    device.siggen_period]:
+                if switch_point >= device.siggen_counter:
+                    cycles = switch_point - device.siggen_counter
+                    if quiescent_cycles is None or cycles < quiescent_cycles:
+                        quiescent_cycles = cycles
+        for device_id in self.devices.find_devices(self.devices.RC):
+            device = self.devices.get_device(device_id)
+            if device.clock_counter <= device.simulation_cycles:
+                cycles = device.simulation_cycles - device.clock_counter
+                if quiescent_cycles is None or cycles < quiescent_cycles:
+                    quiescent_cycles = cycles
+        return quiescent_cycles
+
+    def skip_cycles(self, cycles):
+        """Advance the clock, SIGGEN and RC counters by a number of cycles.
+
+        This has the same effect as executing the network for that many
+        cycles, provided the signals have settled and none of the cycles is
+        one where a clock, SIGGEN or RC changes state.
+        """
+        for device_kind in [self.devices.CLOCK, self.devices.RC]:
+            for device_id in self.devices.find_devices(device_kind):
+                self.devices.get_device(device_id).clock_counter += cycles
+        for device_id in self.devices.find_devices(self.devices.SIGGEN):
+            self.devices.get_device(device_id).siggen_counter += cycles
+
+    def find_combinational_loops(self):
+        """Return the strongly connected components of the gates and D-types.
+
+        The graph has an edge from each gate or D-type to every gate that
+        reads its output, and to every D-type that reads it on its SET or
+        CLEAR input, which act without waiting for the clock. Each
+        component with more than one device, or with a device that reads
+        itself, is a loop around which the signals may never settle.
+        Tarjan's algorithm finds them in time linear in the size of the
+        network. The loops are lists of device IDs, also kept in self.loops.
+        """
+        devices = self.devices
+        asynchronous_inputs = [devices.SET_ID, devices.CLEAR_ID]
+        readers = {}  # {device_id: [IDs of the devices reading it]}
+        for device in devices.devices_list:
+            if (device.device_kind in devices.gate_types
+                    or device.device_kind == devices.D_TYPE):
+                readers[device.device_id] = []
+        for device_id in readers:
+            device = devices.get_device(device_id)
+            for input_id, connected_output in device.inputs.items():
+                if connected_output is None:
+                    continue
+                if (device.device_kind == devices.D_TYPE
+                        and input_id not in asynchronous_inputs):
+                    continue
+                if connected_output[0] in readers:
+                    readers[connected_output[0]].append(device_id)
+
+        index = {}  # {device_id: order in which it was visited}
+        lowlink = {}  # {device_id: lowest index reachable from it}
+        stack = []
+        on_stack = set()
+        self.loops = []
+        for root in readers:
+            if root in index:
+                continue
+            index[root] = lowlink[root] = len(index)
+            stack.append(root)
+            on_stack.add(root)
+            path = [(root, iter(readers[root]))]  # depth-first search path
+            while path:
+                (device_id, successors) = path[-1]
+                for successor in successors:
+                    if successor not in index:
+                        index[successor] = lowlink[successor] = len(index)
+                        stack.append(successor)
+                        on_stack.add(successor)
+                        path.append((successor, iter(readers[successor])))
+                        break
+                    elif successor in on_stack:
+                        lowlink[device_id] = min(lowlink[device_id],
+                                                 index[successor])
+                else:  # all successors visited
+                    path.pop()
+                    if path:
+                        parent_id = path[-1][0]
+                        lowlink[parent_id] = min(lowlink[parent_id],
+                                                 lowlink[device_id])
+                    if lowlink[device_id] == index[device_id]:
+                        component = []
+                        while True:
+                            member = stack.pop()
+                            on_stack.discard(member)
+                            component.append(member)
+                            if member == device_id:
+                                break
+                        if (len(component) > 1
+                                or device_id in readers[device_id]):
+                            component.reverse()
+                            self.loops.append(component)
+        self.loop_device_count = len(devices.devices_list)
+        return self.loops
+
+    def is_ring_oscillator(self, loop):
+        """Return True if the loop is a ring of inverters that never settles.
+
+        This is the case if every device of the loop is a gate other than
+        XOR, with all its inputs connected to the same output, and an odd
+        number of them are NAND or NOR gates. Whatever the initial signals,
+        the ring then inverts its own output.
+        """
+        devices = self.devices
+        inversions = 0
+        for device_id in loop:
+            device = devices.get_device(device_id)
+            if (device.device_kind not in devices.gate_types
+                    or device.device_kind == devices.XOR):
+                return False
+            if len(set(device.inputs.values())) != 1:
+                return False
+            if device.device_kind in [devices.NAND, devices.NOR]:
+                inversions += 1
+        return inversions % 2 == 1
+
+    def get_unstable_loops(self):
+        """Return the loops whose outputs changed when the network oscillated.
+
+        These are found by the last call of execute_network in the sweep or
+        event-driven mode that returned False.
+        """
+        if not self.loops:
+            return []
+        return [loop for loop in self.loops
+                if self.unstable_devices.intersection(loop)]
+
+    def repeats_iteration(self, states):
+        """Record the state after a settle iteration.
+
+        states is a dictionary of the states after the earlier iterations of
+        the cycle, in order. Since each iteration only depends on the state,
+        the signals will never settle if the state repeats. Then set
+        steady_state to False and unstable_devices to the devices whose
+        outputs changed in the last iteration, and return True.
+        """
+        state = self.get_state()
+        if state not in states:
+            states[state] = None
+            return False
+        self.find_unstable_devices(states, state)
+        self.steady_state = False
+        return True
+
+    def find_unstable_devices(self, states, state=None):
+        """Set unstable_devices to the devices changed by the last iteration.
+
+        states holds the states after the earlier iterations, in order, and
+        state is the current one, if it is not the last of them.
+        """
+        states = list(states)
+        if state is not None:
+            states.append(state)
+        if len(states) < 2:
+            return
+        self.unstable_devices = set([
+            device.device_id for device, old_device_state, new_device_state
+            in zip(self.devices.devices_list, states[-2], states[-1])
+            if old_device_state[0] != new_device_state[0]])
+
+    def get_state(self):
+        """Return the state of the network, which decides its future.
+
+        The state holds the outputs, D-type memory, switch state and
+        counters of every device. RC counters past the point where the RC
+        falls are all equivalent, so they are stored as one value.
+        """
+        state = []
+        for device in self.devices.devices_list:
+            counter = device.clock_counter
+            if (device.device_kind == self.devices.RC
+                    and counter > device.simulation_cycles):
+                counter = device.simulation_cycles + 1
+            state.append((tuple(device.outputs.values()), device.dtype_memory,
+                          device.switch_state, counter,
+                          device.siggen_counter))
+        return tuple(state)
+
+    def get_output_changes(self, old_state, new_state):
+        """Return the device outputs that differ between two states.
+
+        The result is a list of (outputs, signals) pairs, where outputs is
+        the outputs dictionary of a device and signals its values in
+        new_state.
+        """
+        output_changes = []
+        for device, old_device_state, new_device_state in zip(
+                self.devices.devices_list, old_state, new_state):
+            if old_device_state[0] != new_device_state[0]:
+                output_changes.append((device.outputs,
+                                       new_device_state[0]))
+        return output_changes
+
+    def execute_cycles(self, cycles, record):
+        """Execute the network for the specified number of cycles.
+
+        record(count) is called after each stretch of count cycles that
+        leave the signals unchanged, normally Monitors.record_signals. In
+        fast-forward mode, the network is only executed in the cycles where
+        a clock, SIGGEN or RC changes state. After such a cycle the signals
+        have settled, so every cycle until the next change is skipped and
+        recorded in bulk.
+
+        If period detection is on, the state of the network is compared
+        with the states after earlier stretches, including those of the
+        last call if this one carries on from where it stopped. Once it
+        repeats, the network is periodic: its period in cycles is stored in
+        self.period, and whole periods are replayed from the stored outputs
+        instead of being executed. Return the number of cycles completed
+        before the network oscillated, if it did.
+        """
+        cycles_completed = 0
+        if (not self.detect_period or self.period_end_state is None
+                or self.get_state() != self.period_end_state):
+            self.period = None
+            self.period_states = {}
+            self.period_stretches = []
+        self.period_end_state = None
+        states = self.period_states
+        stretches = self.period_stretches
+        while cycles_completed < cycles:
+            if not self.execute_network():
+                self.period_end_state = None
+                break
+            record(1)
+            stretch_cycles = 1
+            if self.fast_forward:
+                quiescent_cycles = self.get_quiescent_cycles()
+                remaining_cycles = cycles - cycles_completed - 1
+                if (quiescent_cycles is None
+                        or quiescent_cycles > remaining_cycles):
+                    quiescent_cycles = remaining_cycles
+                if quiescent_cycles > 0:
+                    self.skip_cycles(quiescent_cycles)
+                    record(quiescent_cycles)
+                    stretch_cycles += quiescent_cycles
+            cycles_completed += stretch_cycles
+
+            if (not self.detect_period
+                    or (self.period is None
+                        and len(stretches) >= self.period_limit)):
+                self.period_end_state = None
+                continue
+            state = self.get_state()
+            self.period_end_state = state
+            if state not in states:
+                if self.period is None:
+                    stretches.append((state, stretch_cycles))
+                    states[state] = len(stretches) - 1
+                continue
+            if self.period is None:
+                # Only keep the stretches of the period, which ends with
+                # the stretch just executed
+                stretches = self.period_stretches = (
+                    stretches[states[state] + 1:] + [(state, stretch_cycles)])
+                states = self.period_states = {
+                    stretch_state: index for index, (stretch_state, _)
+                    in enumerate(stretches)}
+                self.period = sum([stretch_cycles for (_, stretch_cycles)
+                                   in stretches])
+            if cycles - cycles_completed < self.period:
+                continue
+            # Outputs to set before recording each stretch of the period,
+            # starting from the current state
+            start = states[state] + 1
+            replay = []
+            previous_state = state
+            for (stretch_state, stretch_cycles) in (stretches[start:]
+                                                    + stretches[:start]):
+                replay.append((self.get_output_changes(previous_state,
+                                                       stretch_state),
+                               stretch_cycles))
+                previous_state = stretch_state
+            repeats = (cycles - cycles_completed) // self.period
+            for _ in range(repeats):
+                for (output_changes, stretch_cycles) in replay:
+                    for (outputs, signals) in output_changes:
+                        outputs.update(zip(outputs, signals))
+                    record(stretch_cycles)
+            # The outputs are back to the current state, only the RC
+            # counters need to move on
+            for device_id in self.devices.find_devices(self.devices.RC):
+                self.devices.get_device(device_id).clock_counter += (
+                    repeats * self.period)
+            cycles_completed += repeats * self.period
+        return cycles_completed
@@ -85,6 +85,11 @@ class Parser:
                             return error code if error found otherwise
                             return None
 
+    get_loop_message(loops):
+                            Name the devices of each loop of gates
+                            return the message to add to an
+                            OSCILLATE error
+
     Void methods
     ------------
     set_new_line_word():    Set the expected type of symbol of a 
@@ -704,6 +709,15 @@ class Parser:
         return None, self.expect_type
 
 
+    def get_loop_message(self, loops):
+        """Return the names of the devices in each loop for an error."""
+        if not loops:
+            return ""
+        loop_names = [" ".join([self.names.get_name_string(device_id)
+                                for device_id in loop]) for loop in loops]
+        return "in the loop: " + "; ".join(loop_names)
+
+
     def print_end_message(self):
         print("Failed to compile definition file")
         print("Syntax error count:", self.scanner.error.syntax_error_count)
@@ -718,7 +732,13 @@ class Parser:
         no errors then the file is restarted and each symbol 
         is parsed individually. The function takes care of an error,
         semicolon, and unexpected symbol first before parsing sentences
-        according to the phase it is in"""
+        according to the phase it is in.
+
+        Only rings of inverters are rejected as oscillating without
+        running the circuit. Any other loop is only rejected if it
+        oscillates in one trial cycle with the initial switch states, so
+        a loop that oscillates under other switch states is accepted and
+        reported at run time by execute_network."""
         if not self.check_structure():
             self.print_end_message()
             return False
@@ -731,6 +751,8 @@ class Parser:
         self.connection_holder =  self.init_connection_holder()
         self.new_line = False
 
+        # Cold start the devices once they have all been made
+        self.devices.set_deferred_startup(True)
         while True:
             self.symbol = self.scanner.get_symbol()
 
@@ -813,19 +835,36 @@ class Parser:
             elif self.phase == 3:
                 self.parse_monitor()
 
+        self.devices.set_deferred_startup(False)
+
         # Run whole circuit semantic checks if no previous errors
         if (self.scanner.error.semantic_error_count == 0
             and self.scanner.error.syntax_error_count == 0):
             # Check if all inputs are connected
             if self.network.check_network():
+                # Reject rings of inverters, which never settle. Other
+                # loops can settle, so they are left to the trial cycle.
+                rings = [loop for loop in
+                         self.network.find_combinational_loops()
+                         if self.network.is_ring_oscillator(loop)]
+                if rings:
+                    self.restart_and_get_symbol()
+                    self.handle_error(self.scanner.error.OSCILLATE,
+                                self.scanner.error.SEMANTIC,
+                                optional_mess=self.get_loop_message(rings))
+                    return False
                 # Check if net work oscillate
                 if self.network.execute_network():
+                    # Build the levelized plan for the compiled mode
+                    self.network.compile_network()
                     print("File compiled successfully!")
                     return True
                 else:
                     self.restart_and_get_symbol()
                     self.handle_error(self.scanner.error.OSCILLATE,
-                                self.scanner.error.SEMANTIC)
+                                self.scanner.error.SEMANTIC,
+                                optional_mess=self.get_loop_message(
+                                    self.network.get_unstable_loops()))
                     return False
             else:
                 self.restart_and_get_symbol()
@@ -0,0 +1,209 @@
+"""Profile the execution of the network.
+
+Used in the Logic Simulator project to find out where the simulation cycles
+go: how many iterations the signals take to settle, how many devices of each
+kind are evaluated and how the time splits between the sources, the gates,
+the other devices and the monitors.
+
+Classes
+-------
+Profiler - measures the execution of the network and monitors.
+"""
+import time
+
+
+class Profiler:
+
+    """Measure the execution of the network and monitors.
+
+    When enabled, the profiler replaces the methods of the network and
+    monitors it measures with timed wrappers, stored as instance attributes
+    that shadow the methods of the class. Disabling it deletes the wrappers,
+    so a disabled profiler costs nothing. The number of evaluations of each
+    device kind is counted in the sweep and event-driven modes, which
+    evaluate devices one at a time.
+
+    Parameters
+    ----------
+    network: instance of the network.Network() class.
+    monitors: instance of the monitors.Monitors() class.
+
+    Public methods
+    --------------
+    enable(self): Starts measuring the network and monitors.
+
+    disable(self): Stops measuring the network and monitors.
+
+    reset(self): Clears the measurements.
+
+    get_report(self): Returns the measurements as text.
+    """
+
+    # Methods timed under each heading of the report
+    timed_methods = [("update_clocks", "update_clocks"),
+                     ("update_siggen", "update_siggen"),
+                     ("update_rc", "update_rc"),
+                     ("execute_gate", "gate evaluation"),
+                     ("execute_switch", "other devices"),
+                     ("execute_d_type", "other devices"),
+                     ("execute_clock", "other devices"),
+                     ("execute_rc", "other devices")]
+
+    # Methods that evaluate a single device, whose kind is counted
+    device_methods = ["execute_gate", "execute_switch", "execute_d_type",
+                      "execute_clock", "execute_rc"]
+
+    def __init__(self, network, monitors):
+        """Initialise the measurements."""
+        self.network = network
+        self.monitors = monitors
+        self.enabled = False
+        self.wrapped = []  # [(owner, method_name)] of installed wrappers
+
+        self.cycles_executed = 0
+        self.cycles_recorded = 0
+        self.iterations = {}  # {settle iterations: number of cycles}
+        self.evaluations = {}  # {device_kind: number of evaluations}
+        self.times = {"update_clocks": 0, "update_siggen": 0, "update_rc": 0,
+                      "gate evaluation": 0, "other devices": 0,
+                      "execute_network": 0, "record_signals": 0}
+
+    def reset(self):
+        """Clear the measurements.
+
+        The dictionaries are cleared in place, since the wrappers hold them.
+        """
+        self.cycles_executed = 0
+        self.cycles_recorded = 0
+        self.iterations.clear()
+        self.evaluations.clear()
+        for heading in self.times:
+            self.times[heading] = 0
+
+    def enable(self):
+        """Start measuring the network and monitors.
+
+        Return False if the profiler is already enabled.
+        """
+        if self.enabled:
+            return False
+        for method_name, heading in self.timed_methods:
+            self.wrap(self.network, method_name, heading,
+                      method_name in self.device_methods)
+        self.wrap_execute_network()
+        self.wrap_record_signals()
+        compiled_netlist = self.network.compiled_netlist
+        if compiled_netlist is not None:
+            self.wrap(compiled_netlist, "evaluate_gates", "gate evaluation")
+        self.enabled = True
+        return True
+
+    def disable(self):
+        """Stop measuring the network and monitors.
+
+        Return False if the profiler is not enabled.
+        """
+        if not self.enabled:
+            return False
+        for owner, method_name in self.wrapped:
+            delattr(owner, method_name)
+        self.wrapped = []
+        self.enabled = False
+        return True
+
+    def wrap(self, owner, method_name, heading, count_kind=False):
+        """Replace the method of owner with a timed wrapper.
+
+        If count_kind is True, the first argument of the method is a device
+        ID, and the evaluation of the device is counted by its kind.
+        """
+        method = getattr(owner, method_name)
+        times = self.times
+        evaluations = self.evaluations
+        get_device = self.network.devices.get_device
+        clock = time.perf_counter
+
+        if count_kind:
+            def timed_method(*args):
+                start = clock()
+                result = method(*args)
+                times[heading] += clock() - start
+                device_kind = get_device(args[0]).device_kind
+                evaluations[device_kind] = evaluations.get(device_kind,
+                                                           0) + 1
+                return result
+        else:
+            def timed_method(*args):
+                start = clock()
+                result = method(*args)
+                times[heading] += clock() - start
+                return result
+
+        setattr(owner, method_name, timed_method)
+        self.wrapped.append((owner, method_name))
+
+    def wrap_execute_network(self):
+        """Time execute_network and count the iterations of each cycle."""
+        network = self.network
+        execute_network = network.execute_network
+        clock = time.perf_counter
+
+        def timed_execute_network():
+            start = clock()
+            result = execute_network()
+            self.times["execute_network"] += clock() - start
+            self.cycles_executed += 1
+            self.iterations[network.settle_iterations] = self.iterations.get(
+                network.settle_iterations, 0) + 1
+            return result
+
+        network.execute_network = timed_execute_network
+        self.wrapped.append((network, "execute_network"))
+
+    def wrap_record_signals(self):
+        """Time record_signals and count the cycles recorded."""
+        record_signals = self.monitors.record_signals
+        clock = time.perf_counter
+
+        def timed_record_signals(cycles=1):
+            start = clock()
+            record_signals(cycles)
+            self.times["record_signals"] += clock() - start
+            self.cycles_recorded += cycles
+
+        self.monitors.record_signals = timed_record_signals
+        self.wrapped.append((self.monitors, "record_signals"))
+
+    def get_report(self):
+        """Return the measurements as text."""
+        names = self.network.names
+        lines = ["Profile of {} executed and {} recorded cycles".format(
+            self.cycles_executed, self.cycles_recorded)]
+
+        if self.iterations:
+            total = sum([iterations * cycles for iterations, cycles
+                         in self.iterations.items()])
+            lines.append(
+                "Settle iterations: mean {:.2f}, max {} (limit {})".format(
+                    total / self.cycles_executed, max(self.iterations),
+                    self.network.iteration_limit))
+            for iterations in sorted(self.iterations):
+                lines.append("  {:>3} iterations: {} cycles".format(
+                    iterations, self.iterations[iterations]))
+
+        if self.evaluations:
+            lines.append("Device evaluations:")
+            for device_kind in sorted(self.evaluations,
+                                      key=self.evaluations.get,
+                                      reverse=True):
+                lines.append("  {:<8} {}".format(
+                    names.get_name_string(device_kind),
+                    self.evaluations[device_kind]))
+
+        lines.append("Time (ms):")
+        for heading in ["update_clocks", "update_siggen", "update_rc",
+                        "gate evaluation", "other devices",
+                        "execute_network", "record_signals"]:
+            lines.append("  {:<16} {:10.3f}".format(
+                heading, self.times[heading] * 1e3))
+        return "\n".join(lines)
@@ -9,9 +9,11 @@ Classes
 Scanner - reads definition file and translates characters into symbols. Print
           error messages and check for invalid comments.
 Symbol - encapsulates a symbol and stores its properties.
+SourceBuffer - holds the whole definition file in memory.
 """
 import sys
 import re
+from bisect import bisect_right
 from error import Error
 
 
@@ -28,6 +30,8 @@ class Symbol:
     No public methods.
     """
 
+    __slots__ = ["type", "id", "pos", "line_pos"]
+
     def __init__(self):
         """Initialise symbol properties."""
         self.type = None
@@ -38,6 +42,57 @@ class Symbol:
         self.line_pos = None
 
 
+class SourceBuffer:
+
+    """Hold the whole definition file in memory.
+
+    The buffer can be read, told and seeked like the file opened in text
+    mode: Windows and old Mac line endings are read as a single newline, and
+    positions count the characters of the file as stored on disk, so they
+    match the positions the file itself would report.
+
+    Parameters
+    ----------
+    text: contents of the definition file, with line endings untranslated.
+
+    Public methods
+    --------------
+    read(self, size=1): Returns the next size characters.
+
+    tell(self): Returns the current position.
+
+    seek(self, position): Moves to the given position.
+    """
+
+    def __init__(self, text):
+        """Initialise the text and the reading position."""
+        self.text = text
+        self.position = 0
+
+    def read(self, size=1):
+        """Return the next size characters, or '' at the end of the text."""
+        characters = ""
+        for _ in range(size):
+            if self.position >= len(self.text):
+                break
+            character = self.text[self.position]
+            self.position += 1
+            if character == "\r":
+                if self.text.startswith("\n", self.position):
+                    self.position += 1
+                character = "\n"
+            characters += character
+        return characters
+
+    def tell(self):
+        """Return the current position."""
+        return self.position
+
+    def seek(self, position):
+        """Move to the given position."""
+        self.position = position
+
+
 class Scanner:
 
     """Read circuit definition file and translate the characters into symbols.
@@ -54,12 +109,15 @@ class Scanner:
     devices: instance of the devices.Devices() class.
     network: instance of the network.Network() class.
     monitors: instance of the monitors.Monitors() class.
+    buffered: True to read the whole file into memory and find symbols with
+              a precompiled regular expression, False to read the file one
+              character at a time.
 
     Public methods
     -------------
     read_file(self): Read file for the next character.
 
-    restart(self): Restart reading the file from the beginning.
+    restart(self): Restart reading the symbols from the beginning.
 
     get_name(self): Return the alphabetic string may with "_", update
                     the current character to the next non-alphabetic
@@ -82,21 +140,50 @@ class Scanner:
     get_line_position(self, symbol): Return the line number of the
                                      symbol located in the file.
 
+    get_text(self): Return the text of the file and build the line index.
+
+    get_line(self, line_pos): Return the line that starts at line_pos.
+
     print_error_message(self, symbol, pointer=True, front=False,
                         start_of_sen=False, behind=False, optional_mess=""):
                         Return the complete error message which includes the
                         line number, pointer message, and error message.
 
-    get_symbol(self): Translates the next sequence of characters into a
-                      symbol and returns the symbol.
+    scan_symbol(self): Translates the next sequence of characters into a
+                       symbol and returns the symbol.
+
+    get_symbol(self): Returns the next symbol. Symbols are scanned from the
+                      file only once, and replayed after a restart.
     """
 
-    def __init__(self, path, names, devices, network, monitors):
+    # Regex format for device name
+    name_rule = re.compile(r'\A[A-Z]+\d+$')
+    # Regex format for device input
+    in_rule = re.compile(r'\A[A-Z]+\d+.((I\d+)|DATA|CLK|CLEAR|SET)$')
+    # Regex format for device output
+    out_rule = re.compile(r'\A[A-Z]+\d+(.(Q|QBAR))?$')
+    # Regex format for siggen waveform
+    siggen_rule = re.compile(r'\A"[01]+"$')
+    # Master regex for buffered reading: the spaces and linebreaks before a
+    # symbol, with group 1 ending at the last linebreak, then the characters
+    # of the symbol up to a space, linebreak, semicolon, comment or the end
+    # of the file
+    symbol_rule = re.compile(r'(\s*[\r\n])?[^\S\r\n]*([^\s;/]*)')
+    # Regex format for a newline, as read in text mode
+    line_break = re.compile(r'\r\n?|\n')
+
+    def __init__(self, path, names, devices, network, monitors,
+                 buffered=True):
         """Open specified file and initialise reserved words and IDs."""
         # Open the file
         self.path = path
+        self.buffered = buffered
         try:
-            self.file = open(path, "r")
+            if buffered:
+                with open(path, "r", newline="") as f:
+                    self.file = SourceBuffer(f.read())
+            else:
+                self.file = open(path, "r")
         except IOError:
             print("Error: can\'t find file")
             print("Please check the file path and run again.")
@@ -119,6 +206,19 @@ class Scanner:
                                  self.INIT_MONITOR, self.SEMICOLON,
                                  self.SIGGEN_WAVE, self.EOF] = range(19)
 
+        # Symbol types of the keywords
+        self.keyword_types = {"INIT": self.INIT,
+                              "CONNECT": self.CONNECT,
+                              "MONITOR": self.MONITOR,
+                              "is": self.INIT_IS,
+                              "with": self.INIT_WITH,
+                              "inputs": self.INIT_GATE,
+                              "input": self.INIT_GATE,
+                              "initially_at": self.INIT_SWITCH,
+                              "with_simulation_cycles": self.INIT_CLK,
+                              "connect_to": self.CONNECTION,
+                              "Initial_monitor_at": self.INIT_MONITOR}
+
         # Add keywords to names
         self.device_type_list = ['AND', 'NAND', 'OR', 'NOR', 'XOR',
                                  'SWITCH', 'DTYPE', 'CLOCK', 'RC', 'SIGGEN']
@@ -134,14 +234,26 @@ class Scanner:
         # Whether comment error is raised
         self.invalid_comment = False
 
+        # Text of the file and the position where each of its lines starts,
+        # used to report errors without reopening the file
+        self.text = None
+        self.line_starts = []
+
+        # Symbols scanned so far, and the index of the next one to return
+        self.symbols = []
+        self.symbol_index = 0
+
     def read_file(self):
         """Read file for the next character."""
         return self.file.read(1)
 
     def restart(self):
-        """Go back to the start of the file."""
-        self.file.seek(0)
-        self.last_line_pos = 0
+        """Go back to the first symbol of the file.
+
+        The symbols already scanned are replayed from the symbol list, and
+        scanning resumes in the file where it stopped.
+        """
+        self.symbol_index = 0
 
     def get_name(self):
         """Return alphabetic string may with '_', update current_char."""
@@ -216,6 +328,37 @@ class Scanner:
             self.current_char = self.read_file()
         self.skip_spaces_and_linebreaks()
 
+    def get_text(self):
+        """Return the text of the file, with line endings untranslated.
+
+        The text is read from the file only once, and the line index is
+        built from it at the same time.
+        """
+        if self.text is None:
+            if self.buffered:
+                self.text = self.file.text
+            else:
+                try:
+                    with open(self.path, "r", newline="") as f:
+                        self.text = f.read()
+                except IOError:
+                    print("Error: can\'t find file or read data")
+                    sys.exit()
+            # A line starts at the start of the file and after each newline
+            self.line_starts = [0] + [match.end() for match in
+                                      self.line_break.finditer(self.text)]
+        return self.text
+
+    def get_line(self, line_pos):
+        """Return the line that starts at line_pos, without its newline."""
+        text = self.get_text()
+        line_index = bisect_right(self.line_starts, line_pos)
+        if line_index < len(self.line_starts):
+            line_end = self.line_starts[line_index]
+        else:
+            line_end = len(text)
+        return text[line_pos:line_end].rstrip("\r\n")
+
     def get_pointer(self, symbol, front=False, start_of_sen=False,
                     behind=False):
         """Return the pointer message.
@@ -225,29 +368,17 @@ class Scanner:
         of the symbol or front of the symbol or start of the line, or
         the symbol before.
         """
-        try:
-            f = open(self.path, "r")
-        except IOError:
-            print("Error: can\'t find file or read data")
-            sys.exit()
-
         # extract the line the symbol located
-        f.seek(symbol.line_pos)
-        sentence = ""
+        sentence = self.get_line(symbol.line_pos)
         symbol_pos = symbol.pos - symbol.line_pos
         space_len = 0
         last_space_len = 0
-        cur_char = f.read(1)
-        while cur_char != '\n':
-            sentence += cur_char
+        for cur_char in sentence:
             if cur_char == " ":
                 space_len += 1
             else:
                 last_space_len = space_len
                 space_len = 0
-            cur_char = f.read(1)
-            if cur_char == '':
-                break
         # Create the pointer message
         if start_of_sen or sentence == '':
             pointer_mes = sentence + '\n' + '^'
@@ -260,8 +391,7 @@ class Scanner:
             pointer_mes = sentence + '\n' + pointer
         else:
             symbol_len = 0
-            f.seek(symbol.line_pos)
-            strings = f.read(symbol_pos)
+            strings = self.get_text()[symbol.line_pos:symbol.pos]
             symbol_len = len(strings.split(' ')[-1])
             if symbol_pos - symbol_len >= 1:
                 pointer = " " * (symbol_pos - symbol_len - 1) + '^'
@@ -273,20 +403,13 @@ class Scanner:
         return pointer_mes
 
     def get_line_position(self, symbol):
-        """Return the line number of the symbol located in the file."""
-        try:
-            f = open(self.path, "r")
-        except IOError:
-            print("Error: can\'t find file or read data")
-            sys.exit()
-        line_number = 1
-        cur_char = f.read(1)
-        for i in range(symbol.pos-1):
-            # line number increases when find newline
-            if cur_char == '\n':
-                line_number += 1
-            cur_char = f.read(1)
-        return line_number
+        """Return the line number of the symbol located in the file.
+
+        This is the line of the last character of the symbol, found by a
+        binary search of the line index.
+        """
+        self.get_text()
+        return max(1, bisect_right(self.line_starts, symbol.pos - 1))
 
     def print_error_message(self, symbol, error_type, front=False,
                             start_of_sen=False, behind=False,
@@ -311,27 +434,66 @@ class Scanner:
                                                          optional_mess)
         return error_mes
 
+    def match_symbol_string(self):
+        """Return the plain characters of the next symbol, update current_char.
+
+        Used when the file is buffered: the spaces and linebreaks before the
+        symbol and its characters are matched with the master regex in one
+        step, and current_char is set to the character that ends them, as
+        if they had been read one at a time.
+        """
+        source = self.file
+        text = source.text
+        match = self.symbol_rule.match(text, source.position)
+        if match.end(1) != -1:  # some linebreak was skipped
+            self.last_line_pos = match.end(1)
+        position = match.end()
+        if position < len(text) and text[position] not in '\r/':
+            self.current_char = text[position]
+            source.position = position + 1
+        else:  # linebreaks and comments are read as in the file
+            source.position = position
+            self.current_char = self.read_file()
+        return match.group(2)
+
     def get_symbol(self):
+        """Return the next symbol.
+
+        The symbol is taken from the symbol list if it was scanned before a
+        restart, otherwise it is scanned and added to the list. Once the end
+        of the file is reached, the EOF symbol is returned on every call.
+        """
+        if self.symbol_index < len(self.symbols):
+            symbol_get = self.symbols[self.symbol_index]
+            if symbol_get.type != self.EOF:
+                self.symbol_index += 1
+            return symbol_get
+        symbol_get = self.scan_symbol()
+        self.symbols.append(symbol_get)
+        if symbol_get.type != self.EOF:
+            self.symbol_index += 1
+        return symbol_get
+
+    def scan_symbol(self):
         """Translate the next sequence of characters into a symbol."""
-        self.current_char = self.read_file()
-        self.skip_spaces_and_linebreaks()
+        if self.buffered:
+            symbol_string = self.match_symbol_string()
+        else:
+            symbol_string = ""
+            self.current_char = self.read_file()
+            self.skip_spaces_and_linebreaks()
         symbol_get = Symbol()
-        symbol_string = ""
-        # Regex format for device name
-        name_rule = re.compile(r'\A[A-Z]+\d+$')
-        # Regex format for device input
-        in_rule = re.compile(r'\A[A-Z]+\d+.((I\d+)|DATA|CLK|CLEAR|SET)$')
-        # Regex format for device output
-        out_rule = re.compile(r'\A[A-Z]+\d+(.(Q|QBAR))?$')
-        # Regex format for siggen waveform
-        siggen_rule = re.compile(r'\A"[01]+"$')
-
-        if self.current_char == '':
+        name_rule = self.name_rule
+        in_rule = self.in_rule
+        out_rule = self.out_rule
+        siggen_rule = self.siggen_rule
+
+        if self.current_char == '' and not symbol_string:
             symbol_get.type = self.EOF
             symbol_get.pos = self.file.tell()
             symbol_get.line_pos = self.last_line_pos
             return symbol_get
-        if self.current_char == ';':
+        if self.current_char == ';' and not symbol_string:
             symbol_get.type = self.SEMICOLON
             symbol_get.pos = self.file.tell()
             symbol_get.line_pos = self.last_line_pos
@@ -378,45 +540,28 @@ class Scanner:
                 symbol_string += str(self.current_char)
                 self.current_char = self.read_file()
         # set symbol type and id
-        if symbol_string == "INIT":
-            symbol_get.type = self.INIT
-        elif symbol_string == "CONNECT":
-            symbol_get.type = self.CONNECT
-        elif symbol_string == "MONITOR":
-            symbol_get.type = self.MONITOR
-        elif symbol_string == "is":
-            symbol_get.type = self.INIT_IS
-        elif symbol_string == "with":
-            symbol_get.type = self.INIT_WITH
-        elif symbol_string == "inputs" or symbol_string == "input":
-            symbol_get.type = self.INIT_GATE
-        elif symbol_string == "initially_at":
-            symbol_get.type = self.INIT_SWITCH
-        elif symbol_string == "with_simulation_cycles":
-            symbol_get.type = self.INIT_CLK
-        elif symbol_string == "connect_to":
-            symbol_get.type = self.CONNECTION
-        elif symbol_string == "Initial_monitor_at":
-            symbol_get.type = self.INIT_MONITOR
+        keyword_type = self.keyword_types.get(symbol_string)
+        if keyword_type is not None:
+            symbol_get.type = keyword_type
         elif name_rule.match(symbol_string):
             symbol_get.type = self.DEVICE_NAME
-            [symbol_get.id] = self.names.lookup([symbol_string])
+            symbol_get.id = self.names.intern(symbol_string)
         elif symbol_string.isdigit():
             symbol_get.type = self.NUMBER
-            [symbol_get.id] = self.names.lookup([symbol_string])
+            symbol_get.id = self.names.intern(symbol_string)
         elif in_rule.match(symbol_string):
             symbol_get.type = self.DEVICE_IN
-            [symbol_get.id] = self.names.lookup([symbol_string])
+            symbol_get.id = self.names.intern(symbol_string)
         elif symbol_string in self.device_type_list:
             symbol_get.type = self.DEVICE_TYPE
-            [symbol_get.id] = self.names.lookup([symbol_string])
+            symbol_get.id = self.names.intern(symbol_string)
         elif out_rule.match(symbol_string):
             symbol_get.type = self.DEVICE_OUT
-            [symbol_get.id] = self.names.lookup([symbol_string])
+            symbol_get.id = self.names.intern(symbol_string)
         elif siggen_rule.match(symbol_string):
             symbol_get.type = self.SIGGEN_WAVE
             # store the siggen waveform without quotation marks
-            [symbol_get.id] = self.names.lookup([symbol_string[1:-1]])
+            symbol_get.id = self.names.intern(symbol_string[1:-1])
         else:
             symbol_get.type = self.ERROR
         if symbol_get.pos is None:
@@ -0,0 +1,86 @@
+"""Test the batch module."""
+import pytest
+
+from names import Names
+from devices import Devices
+from network import Network
+from monitors import Monitors
+from batch import BatchRunner
+
+
+@pytest.fixture
+def circuit():
+    """Return (names, devices, network, monitors) of a small circuit."""
+    names = Names()
+    devices = Devices(names)
+    network = Network(names, devices)
+    monitors = Monitors(names, devices, network)
+    [SW1, CL1, D1, AND1, I1, I2] = names.lookup(["Sw1", "Clock1", "D1",
+                                                 "And1", "I1", "I2"])
+    devices.make_device(SW1, devices.SWITCH, 0)
+    devices.make_device(CL1, devices.CLOCK, 1)
+    devices.make_device(D1, devices.D_TYPE)
+    devices.make_device(AND1, devices.AND, 2)
+    network.make_connection(SW1, None, AND1, I1)
+    network.make_connection(D1, devices.QBAR_ID, AND1, I2)
+    network.make_connection(AND1, None, D1, devices.DATA_ID)
+    network.make_connection(CL1, None, D1, devices.CLK_ID)
+    network.make_connection(SW1, None, D1, devices.SET_ID)
+    network.make_connection(SW1, None, D1, devices.CLEAR_ID)
+    monitors.make_monitor(D1, devices.Q_ID)
+    monitors.make_monitor(AND1, None)
+    return names, devices, network, monitors
+
+
+def test_run_does_not_change_circuit(circuit):
+    """Test if running scenarios leaves the caller's circuit untouched."""
+    (names, devices, network, monitors) = circuit
+    runner = BatchRunner(names, devices, network, monitors, 1)
+    [result] = runner.run([runner.make_scenario({"Sw1": 1}, 5)])
+    assert result["cycles_completed"] == 5
+    assert all(len(trace) == 5 for trace in result["traces"].values())
+    assert devices.get_device(names.query("Sw1")).switch_state == 0
+    assert all(trace == [] for trace in
+               monitors.monitors_dictionary.values())
+
+
+def test_invalid_switch(circuit):
+    """Test if an unknown switch name is reported in the result."""
+    runner = BatchRunner(*circuit, processes=1)
+    [result] = runner.run([runner.make_scenario({"And1": 1})])
+    assert result["error"] is not None
+    assert result["traces"] is None
+
+
+def test_pool_matches_in_process(circuit):
+    """Test if the process pool gives the same traces as one process."""
+    runner = BatchRunner(*circuit, processes=2)
+    scenarios = [runner.make_scenario({"Sw1": state}, 8, seed)
+                 for state in [0, 1] for seed in range(3)]
+    sequential = BatchRunner(*circuit, processes=1).run(scenarios)
+    assert runner.run(scenarios) == sequential
+    assert sequential[0]["traces"] != sequential[3]["traces"]
+
+
+def test_unseeded_scenarios_differ():
+    """Test if scenarios without a seed get their own cold start-ups."""
+    names = Names()
+    devices = Devices(names)
+    network = Network(names, devices)
+    monitors = Monitors(names, devices, network)
+    [SW1] = names.lookup(["Sw1"])
+    devices.make_device(SW1, devices.SWITCH, 0)
+    # D-types that are never clocked keep their random start-up memory
+    for d_type in names.lookup(["D{}".format(i) for i in range(16)]):
+        devices.make_device(d_type, devices.D_TYPE)
+        for input_id in devices.dtype_input_ids:
+            network.make_connection(SW1, None, d_type, input_id)
+        monitors.make_monitor(d_type, devices.Q_ID)
+
+    runner = BatchRunner(names, devices, network, monitors, 1)
+    [first, second] = runner.run([runner.make_scenario(cycles=2),
+                                  runner.make_scenario(cycles=2)])
+    assert first["traces"] != second["traces"]
+    [first, second] = runner.run([runner.make_scenario(cycles=2, seed=5),
+                                  runner.make_scenario(cycles=2, seed=5)])
+    assert first["traces"] == second["traces"]
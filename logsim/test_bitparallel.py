@@ -0,0 +1,149 @@
+"""Test the bitparallel module."""
+import itertools
+
+import pytest
+
+from names import Names
+from devices import Devices
+from network import Network
+from monitors import Monitors
+from bitparallel import BitParallelNetlist
+from test_netlist import build_ripple_counter
+
+
+def build_network(seed):
+    """Return (devices, network, monitors, switch IDs) of a test network."""
+    names = Names()
+    devices = Devices(names)
+    network = Network(names, devices)
+    monitors = Monitors(names, devices, network)
+    devices.set_seed(seed)
+    [SW1, SW2, SW3, CL1, D1, AND1, OR1, XOR1, NAND1, I1, I2,
+     I3] = names.lookup(["Sw1", "Sw2", "Sw3", "Clock1", "D1", "And1", "Or1",
+                         "Xor1", "Nand1", "I1", "I2", "I3"])
+    for switch_id in [SW1, SW2, SW3]:
+        devices.make_device(switch_id, devices.SWITCH, 0)
+    devices.make_device(CL1, devices.CLOCK, 2)
+    devices.make_device(D1, devices.D_TYPE)
+    devices.make_device(AND1, devices.AND, 2)
+    devices.make_device(OR1, devices.OR, 3)
+    devices.make_device(XOR1, devices.XOR)
+    devices.make_device(NAND1, devices.NAND, 2)
+
+    network.make_connection(SW1, None, AND1, I1)
+    network.make_connection(D1, devices.QBAR_ID, AND1, I2)
+    network.make_connection(AND1, None, OR1, I1)
+    network.make_connection(SW2, None, OR1, I2)
+    network.make_connection(CL1, None, OR1, I3)
+    network.make_connection(OR1, None, XOR1, I1)
+    network.make_connection(D1, devices.Q_ID, XOR1, I2)
+    network.make_connection(XOR1, None, D1, devices.DATA_ID)
+    network.make_connection(CL1, None, D1, devices.CLK_ID)
+    network.make_connection(SW3, None, D1, devices.SET_ID)
+    network.make_connection(SW2, None, NAND1, I1)
+    network.make_connection(SW3, None, NAND1, I2)
+    network.make_connection(NAND1, None, D1, devices.CLEAR_ID)
+    for device_id in [D1, XOR1, NAND1]:
+        monitors.make_monitor(device_id, None if device_id != D1
+                              else devices.Q_ID)
+    return devices, network, monitors, [SW1, SW2, SW3]
+
+
+def build_ripple_network(seed):
+    """Return (devices, network, monitors, Sw1 ID) of a ripple counter."""
+    names = Names()
+    devices = Devices(names)
+    network = Network(names, devices)
+    monitors = Monitors(names, devices, network)
+    devices.set_seed(seed)
+    [SW1, CL1, D1, D2, D3] = build_ripple_counter(network)
+    for d_type in [D1, D2, D3]:
+        monitors.make_monitor(d_type, devices.Q_ID)
+    return devices, network, monitors, SW1
+
+
+def test_width_must_be_positive():
+    """Test if an invalid width raises an error."""
+    devices, network, monitors, switches = build_network(0)
+    with pytest.raises(TypeError):
+        BitParallelNetlist(devices, network, 2.5)
+    with pytest.raises(ValueError):
+        BitParallelNetlist(devices, network, 0)
+
+
+def test_set_switch_patterns():
+    """Test if switch patterns are packed into words."""
+    devices, network, monitors, [SW1, SW2, SW3] = build_network(0)
+    netlist = BitParallelNetlist(devices, network, 4)
+    assert netlist.compile()
+
+    assert netlist.set_switch_patterns(SW1, [1, 0, 1, 1])
+    assert netlist.switch_words[SW1] == 0b1101
+    assert not netlist.set_switch_patterns(SW1, [1, 0, 1, 1, 0])
+    assert not netlist.set_switch_patterns(SW1, [2])
+    [D1] = devices.names.lookup(["D1"])
+    assert not netlist.set_switch_patterns(D1, [1])
+
+
+def test_patterns_match_scalar_runs():
+    """Test if each pattern matches a separate compiled-mode run."""
+    patterns = list(itertools.product([0, 1], repeat=3))
+    cycles = 12
+
+    devices, network, monitors, switches = build_network(4)
+    netlist = BitParallelNetlist(devices, network)
+    assert netlist.compile()
+    for i, switch_id in enumerate(switches):
+        assert netlist.set_switch_patterns(
+            switch_id, [pattern[i] for pattern in patterns])
+    assert netlist.run(cycles, monitors)
+    batch_traces = monitors.get_batch_traces(len(patterns))
+
+    for k, pattern in enumerate(patterns):
+        devices, network, monitors, switches = build_network(4)
+        assert network.set_execution_mode(network.COMPILED)
+        for switch_id, state in zip(switches, pattern):
+            devices.set_switch(switch_id, state)
+        for _ in range(cycles):
+            assert network.execute_network()
+            monitors.record_signals()
+        for monitor, signal_list in monitors.monitors_dictionary.items():
+            assert batch_traces[monitor][k] == signal_list
+
+
+def test_ripple_counter_patterns():
+    """Test if D-types clocked by other D-types count in every pattern."""
+    patterns = [0, 1, 1, 0]  # states of Sw1, which holds the count at 0
+    cycles = 16
+
+    devices, network, monitors, SW1 = build_ripple_network(7)
+    netlist = BitParallelNetlist(devices, network, len(patterns))
+    assert netlist.compile()
+    assert netlist.set_switch_patterns(SW1, patterns)
+    assert netlist.run(cycles, monitors)
+    batch_traces = monitors.get_batch_traces(len(patterns))
+
+    for k, pattern in enumerate(patterns):
+        devices, network, monitors, SW1 = build_ripple_network(7)
+        assert network.set_execution_mode(network.SWEEP)
+        devices.set_switch(SW1, pattern)
+        for _ in range(cycles):
+            assert network.execute_network()
+            monitors.record_signals()
+        for monitor, signal_list in monitors.monitors_dictionary.items():
+            assert batch_traces[monitor][k] == signal_list
+        counts = set(zip(*monitors.monitors_dictionary.values()))
+        assert len(counts) == (1 if pattern else 8)
+
+
+def test_reset_batch_monitors():
+    """Test if reset_batch_monitors clears the recorded words."""
+    devices, network, monitors, switches = build_network(0)
+    netlist = BitParallelNetlist(devices, network, 8)
+    assert netlist.compile()
+    assert netlist.run(3, monitors)
+    [D1] = devices.names.lookup(["D1"])
+    assert len(monitors.get_batch_signals(D1, devices.Q_ID, 5)) == 3
+
+    monitors.reset_batch_monitors()
+    assert monitors.get_batch_signals(D1, devices.Q_ID, 5) is None
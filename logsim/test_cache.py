@@ -0,0 +1,159 @@
+"""Test the cache module."""
+import os
+import pickle
+import shutil
+import zlib
+
+import pytest
+
+import cache
+from cache import CircuitCache
+
+
+@pytest.fixture
+def definition_path(tmp_path):
+    """Return the path of a copy of a correct definition file."""
+    path = tmp_path / "circuit.txt"
+    shutil.copy(os.path.join(os.path.dirname(__file__),
+                             "definition_file_correct.txt"), path)
+    return str(path)
+
+
+@pytest.fixture
+def circuit_cache(tmp_path):
+    """Return a CircuitCache instance using a temporary directory."""
+    return CircuitCache(str(tmp_path / "cache"))
+
+
+def get_state(circuit):
+    """Return the device and monitor names and signals of a circuit."""
+    [names, devices, network, monitors] = circuit
+    device_names = [names.get_name_string(device_id)
+                    for device_id in devices.find_devices()]
+    network.execute_network()
+    signals = [network.get_output_signal(device.device_id, output_id)
+               for device in devices.devices_list
+               for output_id in device.outputs]
+    return [device_names, monitors.get_signal_names(), signals]
+
+
+def test_miss_parses_and_saves(circuit_cache, definition_path):
+    """Test if a file that is not cached is parsed and then cached."""
+    assert circuit_cache.load(definition_path) is None
+    circuit = circuit_cache.load_or_parse(definition_path)
+    assert circuit is not None
+    key = circuit_cache.get_key(definition_path)
+    assert os.path.exists(circuit_cache.get_cache_path(key))
+    assert circuit_cache.load(definition_path) is not None
+
+
+def test_hit_skips_parser(circuit_cache, definition_path, monkeypatch):
+    """Test if a cached file loads the same circuit without parsing."""
+    parsed = circuit_cache.load_or_parse(definition_path)
+
+    def fail(*args):
+        raise AssertionError("The file was scanned again.")
+
+    monkeypatch.setattr(cache, "Scanner", fail)
+    loaded = circuit_cache.load_or_parse(definition_path)
+    assert loaded is not None
+    assert get_state(loaded) == get_state(parsed)
+
+
+def test_changed_file_misses(circuit_cache, definition_path):
+    """Test if editing the file makes the cached entry unreachable."""
+    circuit_cache.load_or_parse(definition_path)
+    old_key = circuit_cache.get_key(definition_path)
+    with open(definition_path, "a") as definition_file:
+        definition_file.write("\n")
+    assert circuit_cache.get_key(definition_path) != old_key
+    assert circuit_cache.load(definition_path) is None
+
+
+def test_corrupt_entry_misses(circuit_cache, definition_path):
+    """Test if a corrupt cache file is treated as a miss."""
+    circuit_cache.load_or_parse(definition_path)
+    key = circuit_cache.get_key(definition_path)
+    with open(circuit_cache.get_cache_path(key), "wb") as cache_file:
+        cache_file.write(b"not a circuit")
+    assert circuit_cache.load(definition_path) is None
+    assert circuit_cache.load_or_parse(definition_path) is not None
+
+
+def test_pickled_entry_not_loaded(circuit_cache, definition_path, tmp_path):
+    """Test if a pickled cache file is refused without being unpickled."""
+    marker_path = str(tmp_path / "unpickled")
+
+    class Payload:
+        """Create the marker file when unpickled."""
+
+        def __reduce__(self):
+            return (open, (marker_path, "w"))
+
+    circuit_cache.load_or_parse(definition_path)
+    key = circuit_cache.get_key(definition_path)
+    with open(circuit_cache.get_cache_path(key), "wb") as cache_file:
+        cache_file.write(zlib.compress(pickle.dumps(Payload())))
+    assert circuit_cache.load(definition_path) is None
+    assert not os.path.exists(marker_path)
+
+
+def test_entry_rebuilds_devices(circuit_cache, definition_path):
+    """Test if every device is rebuilt with its kind, property and state."""
+    [names, devices, network, monitors] = circuit_cache.load_or_parse(
+        definition_path)
+    [loaded_names, loaded_devices, loaded_network,
+     loaded_monitors] = circuit_cache.load(definition_path)
+    assert len(loaded_devices.devices_list) == len(devices.devices_list)
+    for device in devices.devices_list:
+        [device_id] = loaded_names.lookup([
+            names.get_name_string(device.device_id)])
+        loaded_device = loaded_devices.get_device(device_id)
+        assert (loaded_names.get_name_string(loaded_device.device_kind)
+                == names.get_name_string(device.device_kind))
+        for attribute in ["clock_half_period", "clock_counter",
+                          "switch_state", "dtype_memory",
+                          "simulation_cycles", "siggen_counter",
+                          "siggen_initial", "siggen_period",
+                          "siggen_switch_point"]:
+            assert (getattr(loaded_device, attribute)
+                    == getattr(device, attribute))
+        assert (list(loaded_device.outputs.values())
+                == list(device.outputs.values()))
+    assert loaded_network.compiled_netlist is not None
+
+
+def test_failed_parse_not_cached(circuit_cache, tmp_path):
+    """Test if a file with errors returns None and is not cached."""
+    path = tmp_path / "wrong.txt"
+    path.write_text("DEVICES { ; }")
+    assert circuit_cache.load_or_parse(str(path)) is None
+    assert not os.path.exists(circuit_cache.cache_dir) or not os.listdir(
+        circuit_cache.cache_dir)
+
+
+def test_hits_start_up_apart(circuit_cache, tmp_path):
+    """Test if cache hits only share cold start-ups when seeded alike."""
+    path = tmp_path / "counter.txt"
+    d_types = ["D{}".format(i) for i in range(12)]
+    path.write_text(
+        "INIT;\nCK1 is CLOCK with_simulation_cycles 50;\n"
+        "SW1 is SWITCH initially_at 0;\n"
+        + "".join([d_type + " is DTYPE;\n" for d_type in d_types])
+        + "CONNECT;\n"
+        + "".join(["CK1 connect_to {0}.CLK;\nSW1 connect_to {0}.SET;\n"
+                   "SW1 connect_to {0}.CLEAR;\n{0}.QBAR connect_to "
+                   "{0}.DATA;\n".format(d_type) for d_type in d_types])
+        + "MONITOR;\nInitial_monitor_at D0.Q;\n")
+    assert circuit_cache.load_or_parse(str(path)) is not None
+
+    def get_start_up(seed):
+        [names, devices, network, monitors] = circuit_cache.load(str(path))
+        if seed is not None:
+            devices.set_seed(seed)
+        devices.cold_startup()
+        return [(device.dtype_memory, device.clock_counter)
+                for device in devices.devices_list]
+
+    assert len(set([repr(get_start_up(None)) for _ in range(4)])) > 1
+    assert get_start_up(8) == get_start_up(8)
@@ -0,0 +1,90 @@
+"""Test the checkpoint module."""
+import pytest
+
+from names import Names
+from devices import Devices
+from network import Network
+from monitors import Monitors
+from checkpoint import Checkpoint
+
+
+def make_circuit(execution_mode=0):
+    """Return a checkpoint of a clocked D-type counter and an XOR gate."""
+    names = Names()
+    devices = Devices(names)
+    network = Network(names, devices)
+    monitors = Monitors(names, devices, network)
+    [SW1, CL1, D1, X1, I1, I2] = names.lookup(["Sw1", "Clock1", "D1",
+                                               "Xor1", "I1", "I2"])
+    devices.make_device(SW1, devices.SWITCH, 0)
+    devices.make_device(CL1, devices.CLOCK, 3)
+    devices.make_device(D1, devices.D_TYPE)
+    devices.make_device(X1, devices.XOR)
+    network.make_connection(CL1, None, D1, devices.CLK_ID)
+    network.make_connection(D1, devices.QBAR_ID, D1, devices.DATA_ID)
+    network.make_connection(SW1, None, D1, devices.SET_ID)
+    network.make_connection(SW1, None, D1, devices.CLEAR_ID)
+    network.make_connection(D1, devices.Q_ID, X1, I1)
+    network.make_connection(CL1, None, X1, I2)
+    monitors.make_monitor(X1, None)
+    monitors.make_monitor(D1, devices.Q_ID)
+    network.set_execution_mode(execution_mode)
+    return Checkpoint(names, devices, network, monitors)
+
+
+def get_traces(checkpoint):
+    """Return the runs of each monitored signal of the checkpoint."""
+    return {key: trace.get_runs() for key, trace
+            in checkpoint.monitors.monitors_dictionary.items()}
+
+
+@pytest.mark.parametrize("execution_mode", [0, 1, 2])
+def test_restore_continues_run(tmp_path, execution_mode):
+    """Test if a restored run continues exactly as the saved one."""
+    path = str(tmp_path / "run.lscp")
+    original = make_circuit(execution_mode)
+    network = original.network
+    record_signals = original.monitors.record_signals
+    assert network.execute_cycles(17, record_signals) == 17
+    assert original.save(path, 17)
+    assert network.execute_cycles(20, record_signals) == 20
+
+    restored = make_circuit(execution_mode)
+    # Run the copy elsewhere first, so the checkpoint must replace its state
+    restored.network.execute_cycles(5, restored.monitors.record_signals)
+    assert restored.restore(path) == 17
+    assert restored.network.execute_cycles(
+        20, restored.monitors.record_signals) == 20
+    assert get_traces(restored) == get_traces(original)
+
+
+def test_restore_other_circuit(tmp_path):
+    """Test if a checkpoint of another circuit is refused."""
+    path = str(tmp_path / "run.lscp")
+    original = make_circuit()
+    original.network.execute_cycles(4, original.monitors.record_signals)
+    assert original.save(path, 4)
+
+    other = make_circuit()
+    [CL1] = other.names.lookup(["Clock1"])
+    other.devices.get_device(CL1).clock_half_period = 5
+    assert other.get_fingerprint() != original.get_fingerprint()
+    assert other.restore(path) is None
+    assert get_traces(other) == {key: [] for key in get_traces(original)}
+
+
+def test_restore_bad_file(tmp_path):
+    """Test if missing, truncated and foreign files are refused."""
+    checkpoint = make_circuit()
+    checkpoint.network.execute_cycles(4, checkpoint.monitors.record_signals)
+    assert checkpoint.restore(str(tmp_path / "missing.lscp")) is None
+
+    path = tmp_path / "run.lscp"
+    assert checkpoint.save(str(path), 4)
+    data = path.read_bytes()
+    path.write_bytes(data[:len(data) - 5])
+    assert checkpoint.restore(str(path)) is None
+    path.write_bytes(b"not a checkpoint")
+    assert checkpoint.restore(str(path)) is None
+
+    assert not checkpoint.save(str(tmp_path / "missing" / "run.lscp"), 4)
@@ -186,3 +186,64 @@ def test_set_switch(new_devices):
     # Set switch Sw1 to LOW
     new_devices.set_switch(SW1_ID, new_devices.LOW)
     assert switch_object.switch_state == new_devices.LOW
+
+
+def test_find_devices_returns_copy(devices_with_items):
+    """Test if changing a find_devices result leaves the kind index intact."""
+    devices = devices_with_items
+    [AND1_ID] = devices.names.lookup(["And1"])
+
+    and_devices = devices.find_devices(devices.AND)
+    and_devices.append(AND1_ID)
+    assert devices.find_devices(devices.AND) == [AND1_ID]
+
+
+def test_make_devices_single_cold_startup(new_devices, monkeypatch):
+    """Test if make_devices cold starts the new devices only once."""
+    names = new_devices.names
+    startups = []
+    cold_startup = new_devices.cold_startup
+    monkeypatch.setattr(new_devices, "cold_startup",
+                        lambda: startups.append(cold_startup()))
+    [CL1_ID, D1_ID, D2_ID, RC1_ID, SG1_ID, D3_ID] = names.lookup(
+        ["Clock1", "D1", "D2", "Rc1", "Sg1", "D3"])
+    errors = new_devices.make_devices([
+        (CL1_ID, new_devices.CLOCK, 3),
+        (D1_ID, new_devices.D_TYPE, None),
+        (D2_ID, new_devices.D_TYPE, None),
+        (RC1_ID, new_devices.RC, 2),
+        (SG1_ID, new_devices.SIGGEN, "10"),
+        (D1_ID, new_devices.D_TYPE, None)])
+    assert errors == [new_devices.NO_ERROR] * 5 + [new_devices.DEVICE_PRESENT]
+    assert len(startups) == 1
+    assert not new_devices.deferred_startup
+
+    clock = new_devices.get_device(CL1_ID)
+    assert clock.clock_counter in range(3)
+    assert clock.outputs[None] in [new_devices.LOW, new_devices.HIGH]
+    assert new_devices.get_device(D2_ID).dtype_memory is not None
+    assert new_devices.get_device(SG1_ID).outputs[None] == new_devices.HIGH
+
+    # Outside make_devices each sequential device still cold starts
+    new_devices.make_device(D3_ID, new_devices.D_TYPE)
+    assert len(startups) == 2
+
+
+def test_seeded_cold_startup():
+    """Test if seeded cold start-ups are reproducible and independent."""
+    states = []
+    for seed in [4, 4, None]:
+        names = Names()
+        devices = Devices(names)
+        device_ids = names.lookup(["D" + str(i) for i in range(20)]
+                                  + ["Clock" + str(i) for i in range(20)])
+        devices.set_seed(seed)
+        for device_id in device_ids[:20]:
+            devices.make_device(device_id, devices.D_TYPE)
+        for device_id in device_ids[20:]:
+            devices.make_device(device_id, devices.CLOCK, 50)
+        states.append([(device.dtype_memory, device.clock_counter,
+                        dict(device.outputs))
+                       for device in devices.devices_list])
+    assert states[0] == states[1]
+    assert states[0] != states[2]
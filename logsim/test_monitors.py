@@ -197,3 +197,21 @@ def test_display_signals(capsys, new_monitors):
             "Clock1: -__--__--__--__--__-" in traces)
 
     assert "" in traces  # additional empty line at the end
+
+
+def test_run_length_monitors():
+    """Test if run-length encoded monitors record the same signals."""
+    names = Names()
+    devices = Devices(names)
+    network = Network(names, devices)
+    monitors = Monitors(names, devices, network, run_length=True)
+    [SW1_ID] = names.lookup(["Sw1"])
+    devices.make_device(SW1_ID, devices.SWITCH, 1)
+    monitors.make_monitor(SW1_ID, None, 2)
+    for _ in range(3):
+        network.execute_network()
+        monitors.record_signals()
+    trace = monitors.monitors_dictionary[(SW1_ID, None)]
+    assert trace.run_length
+    assert trace == [devices.BLANK] * 2 + [devices.HIGH] * 3
+    assert trace.get_runs() == [[devices.BLANK, 2], [devices.HIGH, 3]]
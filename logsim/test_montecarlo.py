@@ -0,0 +1,117 @@
+"""Test the montecarlo module."""
+import pytest
+
+from names import Names
+from devices import Devices
+from network import Network
+from monitors import Monitors
+from montecarlo import MonteCarlo
+from profiler import Profiler
+
+
+@pytest.fixture
+def divider():
+    """Return (names, devices, network, monitors) of a clock divider."""
+    names = Names()
+    devices = Devices(names)
+    network = Network(names, devices)
+    monitors = Monitors(names, devices, network)
+    [SW1, CL1, D1] = names.lookup(["Sw1", "Clock1", "D1"])
+    devices.make_device(SW1, devices.SWITCH, 0)
+    devices.make_device(CL1, devices.CLOCK, 2)
+    devices.make_device(D1, devices.D_TYPE)
+    network.make_connection(CL1, None, D1, devices.CLK_ID)
+    network.make_connection(D1, devices.QBAR_ID, D1, devices.DATA_ID)
+    network.make_connection(SW1, None, D1, devices.SET_ID)
+    network.make_connection(SW1, None, D1, devices.CLEAR_ID)
+    monitors.make_monitor(D1, devices.Q_ID)
+    monitors.make_monitor(SW1, None)
+    return names, devices, network, monitors
+
+
+def test_get_settle_time():
+    """Test if the settle time is the start of the repeating signals."""
+    assert MonteCarlo.get_settle_time([0, 0, 1, 0, 1, 0, 1], 2) == 1
+    assert MonteCarlo.get_settle_time([1, 1, 1], 1) == 0
+    assert MonteCarlo.get_settle_time([1, 0, 0, 0], 4) == 0
+    assert MonteCarlo.get_settle_time([1, 0, 0, 0], None) is None
+
+
+def test_get_seeds():
+    """Test if the run seeds are reproducible and extend with the runs."""
+    seeds = MonteCarlo.get_seeds(10, 3)
+    assert MonteCarlo.get_seeds(10, 3) == seeds
+    assert MonteCarlo.get_seeds(4, 3) == seeds[:4]
+    assert MonteCarlo.get_seeds(10, 4) != seeds
+    assert len(set(seeds)) == 10
+
+
+def test_statistics(divider):
+    """Test the statistics of the monitors over seeded cold start-ups."""
+    (names, devices, network, monitors) = divider
+    [SW1, D1] = names.lookup(["Sw1", "D1"])
+    monte_carlo = MonteCarlo(*divider, processes=1)
+    statistics = monte_carlo.run(40, 24, seed=2)
+    assert statistics["runs"] == 40
+    assert statistics["oscillating"] == 0
+
+    switch = statistics["monitors"][(SW1, None)]
+    assert switch["high_probability"] == [0] * 24
+    assert switch["settle_times"] == [0] * 40
+
+    # The random start-ups spread the phase of the divided clock
+    output = statistics["monitors"][(D1, devices.Q_ID)]
+    assert len(output["high_probability"]) == 24
+    assert all(0 < probability < 1
+               for probability in output["high_probability"])
+    assert all(settle_time is not None
+               for settle_time in output["settle_times"])
+    assert monte_carlo.run(40, 24, seed=2) == statistics
+
+    report = monte_carlo.get_report(statistics)
+    assert "40 cold start-ups of 24 cycles" in report
+    assert "Sw1: P(HIGH) mean 0.000" in report
+    assert "D1.Q: P(HIGH) mean" in report
+
+    assert monte_carlo.run(2, 5, switches={"Clock1": 1}) is None
+
+
+def test_pool_matches_in_process(divider):
+    """Test if the process pool gives the same statistics as one process."""
+    sequential = MonteCarlo(*divider, processes=1).run(12, 16, seed=5)
+    assert MonteCarlo(*divider, processes=2).run(12, 16, seed=5) == sequential
+
+
+def test_high_probability_of_oscillating_runs(divider):
+    """Test if oscillating runs record no cycles and never settle."""
+    (names, devices, network, monitors) = divider
+    [NOR1, I1] = names.lookup(["Nor1", "I1"])
+    devices.make_device(NOR1, devices.NOR, 1)
+    network.make_connection(NOR1, None, NOR1, I1)
+    statistics = MonteCarlo(*divider, processes=1).run(3, 10)
+    assert statistics["oscillating"] == 3
+    for monitor in statistics["monitors"].values():
+        assert monitor["high_probability"] == []
+        assert monitor["settle_times"] == [None] * 3
+
+
+@pytest.mark.parametrize("execution_mode", [0, 2])
+def test_runs_while_profiling_and_streaming(divider, tmp_path,
+                                            execution_mode):
+    """Test if a profiled circuit streaming to a VCD file can be analysed."""
+    (names, devices, network, monitors) = divider
+    assert network.set_execution_mode(execution_mode)
+    expected = MonteCarlo(*divider, processes=1).run(6, 12, seed=1)
+
+    profiler = Profiler(network, monitors)
+    profiler.enable()
+    vcd_path = tmp_path / "run.vcd"
+    monitors.start_vcd(open(str(vcd_path), "w"), keep_traces=False)
+    assert MonteCarlo(*divider, processes=1).run(6, 12, seed=1) == expected
+
+    # The caller's profiler and VCD file are left in place
+    assert "execute_network" in vars(network)
+    assert monitors.vcd_writer is not None
+    assert not monitors.keep_traces
+    assert monitors.stop_vcd()
+    assert profiler.disable()
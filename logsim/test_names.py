@@ -115,3 +115,13 @@ def test_get_name_string(used_names, default_name, name_id, expected_string):
     assert used_names.get_name_string(name_id) == expected_string
     # Name is absent
     assert default_name.get_name_string(name_id) is None
+
+
+def test_intern(used_names):
+    """Test if intern returns the same IDs as lookup and query."""
+    assert used_names.intern("B12") == 1
+    assert used_names.intern("D4") == 3
+    assert used_names.query("D4") == 3
+    assert used_names.lookup(["D4", "A1", "E5", "E5"]) == [3, 0, 4, 4]
+    assert used_names.intern(" ") is None
+    assert used_names.names == ["A1", "B12", "C7", "D4", "E5"]
@@ -0,0 +1,202 @@
+"""Test the netlist module."""
+import pytest
+
+from names import Names
+from devices import Devices
+from network import Network
+from netlist import CompiledNetlist
+
+
+@pytest.fixture
+def new_network():
+    """Return a new instance of the Network class."""
+    new_names = Names()
+    new_devices = Devices(new_names)
+    return Network(new_names, new_devices)
+
+
+def build_counter(network):
+    """Build a 2-bit counter from D-types and return its device IDs."""
+    devices = network.devices
+    names = devices.names
+    [SW1, CL1, D1, D2, XOR1, I1, I2] = names.lookup(["Sw1", "Clock1", "D1",
+                                                     "D2", "Xor1", "I1",
+                                                     "I2"])
+    devices.make_device(SW1, devices.SWITCH, 0)
+    devices.make_device(CL1, devices.CLOCK, 1)
+    devices.make_device(D1, devices.D_TYPE)
+    devices.make_device(D2, devices.D_TYPE)
+    devices.make_device(XOR1, devices.XOR)
+
+    for d_type in [D1, D2]:
+        network.make_connection(CL1, None, d_type, devices.CLK_ID)
+        network.make_connection(SW1, None, d_type, devices.SET_ID)
+        network.make_connection(SW1, None, d_type, devices.CLEAR_ID)
+    network.make_connection(D1, devices.QBAR_ID, D1, devices.DATA_ID)
+    network.make_connection(D1, devices.Q_ID, XOR1, I1)
+    network.make_connection(D2, devices.Q_ID, XOR1, I2)
+    network.make_connection(XOR1, None, D2, devices.DATA_ID)
+    return [SW1, CL1, D1, D2, XOR1]
+
+
+def build_ripple_counter(network):
+    """Build a 3-bit ripple counter, each bit clocked by the one before."""
+    devices = network.devices
+    names = devices.names
+    [SW1, CL1, D1, D2, D3] = names.lookup(["Sw1", "Clock1", "D1", "D2",
+                                           "D3"])
+    devices.make_device(SW1, devices.SWITCH, 0)
+    devices.make_device(CL1, devices.CLOCK, 1)
+    clock = (CL1, None)
+    for d_type in [D1, D2, D3]:
+        devices.make_device(d_type, devices.D_TYPE)
+        network.make_connection(clock[0], clock[1], d_type, devices.CLK_ID)
+        network.make_connection(d_type, devices.QBAR_ID, d_type,
+                                devices.DATA_ID)
+        network.make_connection(SW1, None, d_type, devices.SET_ID)
+        network.make_connection(SW1, None, d_type, devices.CLEAR_ID)
+        clock = (d_type, devices.QBAR_ID)
+    return [SW1, CL1, D1, D2, D3]
+
+
+def build_gated_counter(network):
+    """Build a 2-bit counter whose clock is gated by a switch.
+
+    The second bit is clocked through a NOR gate from the first one. The
+    gating switch starts off, so the clock is idle until it is turned on.
+    """
+    devices = network.devices
+    names = devices.names
+    [SW1, SW2, CL1, D1, D2, AND1, NOR1, I1, I2] = names.lookup(
+        ["Sw1", "Sw2", "Clock1", "D1", "D2", "And1", "Nor1", "I1", "I2"])
+    devices.make_device(SW1, devices.SWITCH, 0)
+    devices.make_device(SW2, devices.SWITCH, 0)
+    devices.make_device(CL1, devices.CLOCK, 1)
+    devices.make_device(AND1, devices.AND, 2)
+    devices.make_device(NOR1, devices.NOR, 1)
+    devices.make_device(D1, devices.D_TYPE)
+    devices.make_device(D2, devices.D_TYPE)
+    network.make_connection(CL1, None, AND1, I1)
+    network.make_connection(SW2, None, AND1, I2)
+    network.make_connection(D1, devices.Q_ID, NOR1, I1)
+    for d_type, clock in [(D1, AND1), (D2, NOR1)]:
+        network.make_connection(clock, None, d_type, devices.CLK_ID)
+        network.make_connection(d_type, devices.QBAR_ID, d_type,
+                                devices.DATA_ID)
+        network.make_connection(SW1, None, d_type, devices.SET_ID)
+        network.make_connection(SW1, None, d_type, devices.CLEAR_ID)
+    return [SW1, SW2, CL1, D1, D2, AND1, NOR1]
+
+
+def get_mode_trace(build, mode, seed, cycles=40):
+    """Return the outputs of every device after each cycle in a mode.
+
+    The network is made by build. Sw1 drives the SET and CLEAR inputs and
+    is set HIGH for two cycles, and Sw2, if any, is turned on, then off
+    for a while.
+    """
+    names = Names()
+    devices = Devices(names)
+    network = Network(names, devices)
+    devices.set_seed(seed)
+    build(network)
+    assert network.set_execution_mode(getattr(network, mode))
+    [SW1, SW2] = [names.query("Sw1"), names.query("Sw2")]
+
+    trace = []
+    for cycle in range(cycles):
+        if cycle in [12, 14]:
+            devices.set_switch(SW1, 1 - devices.get_device(
+                SW1).switch_state)
+        if SW2 is not None and cycle in [4, 20, 27]:
+            devices.set_switch(SW2, 1 - devices.get_device(
+                SW2).switch_state)
+        assert network.execute_network()
+        trace.append([dict(devices.get_device(device_id).outputs)
+                      for device_id in devices.find_devices()])
+    return trace
+
+
+def test_levelize_chain(new_network):
+    """Test if a chain of gates is sorted into one level per gate."""
+    network = new_network
+    devices = network.devices
+    names = devices.names
+    [SW1, AND1, OR1, NOR1, I1, I2] = names.lookup(["Sw1", "And1", "Or1",
+                                                   "Nor1", "I1", "I2"])
+    devices.make_device(NOR1, devices.NOR, 1)
+    devices.make_device(OR1, devices.OR, 2)
+    devices.make_device(AND1, devices.AND, 1)
+    devices.make_device(SW1, devices.SWITCH, 1)
+    network.make_connection(SW1, None, AND1, I1)
+    network.make_connection(AND1, None, OR1, I1)
+    network.make_connection(SW1, None, OR1, I2)
+    network.make_connection(OR1, None, NOR1, I1)
+
+    netlist = CompiledNetlist(devices, network)
+    assert netlist.compile()
+    assert [[gate[0] for gate in level] for level in netlist.levels] == [
+        [devices.AND], [devices.OR], [devices.NOR]]
+
+    # A single pass settles the whole chain
+    assert netlist.execute()
+    assert netlist.signals[netlist.get_slot(NOR1, None)] == devices.LOW
+    assert network.get_output_signal(OR1, None) == devices.HIGH
+
+
+def test_compile_rejects_combinational_loop(new_network):
+    """Test if gates connected in a loop do not compile."""
+    network = new_network
+    devices = network.devices
+    names = devices.names
+    [NOR1, I1] = names.lookup(["Nor1", "I1"])
+    devices.make_device(NOR1, devices.NOR, 1)
+    network.make_connection(NOR1, None, NOR1, I1)
+
+    assert not network.compile_network()
+    assert not network.set_execution_mode(network.COMPILED)
+    assert network.execution_mode == network.SWEEP
+
+
+def test_compile_rejects_unconnected_input(new_network):
+    """Test if a network with an unconnected input does not compile."""
+    network = new_network
+    devices = network.devices
+    [AND1] = devices.names.lookup(["And1"])
+    devices.make_device(AND1, devices.AND, 2)
+
+    assert not network.compile_network()
+
+
+@pytest.mark.parametrize("build", [build_counter, build_ripple_counter,
+                                   build_gated_counter])
+def test_compiled_matches_sweep(build):
+    """Test if the compiled mode reproduces the sweep mode cycle by cycle."""
+    for seed in range(4):
+        assert (get_mode_trace(build, "COMPILED", seed)
+                == get_mode_trace(build, "SWEEP", seed))
+
+
+def test_compiled_ripple_counter():
+    """Test if D-types clocked by other D-types count in the compiled mode.
+    """
+    names = Names()
+    devices = Devices(names)
+    network = Network(names, devices)
+    [SW1, CL1, D1, D2, D3] = build_ripple_counter(network)
+    assert network.set_execution_mode(network.COMPILED)
+    counts = []
+    clocks = []
+    for cycle in range(16):
+        assert network.execute_network()
+        counts.append(sum([network.get_output_signal(
+            d_type, devices.Q_ID) << bit
+            for bit, d_type in enumerate([D1, D2, D3])]))
+        clocks.append(network.get_output_signal(CL1, None))
+    # The count goes up by one on every rising edge of the clock
+    steps = [(later - earlier) % 8 for earlier, later
+             in zip(counts, counts[1:])]
+    rises = [int(later > earlier) for earlier, later
+             in zip(clocks, clocks[1:])]
+    assert steps == rises
+    assert steps.count(1) >= 7
@@ -416,3 +416,349 @@ def test_oscillating_network(new_network):
     network.make_connection(NOR1, None, NOR1, I1)
 
     assert not network.execute_network()
+
+
+def build_sequential_network(network):
+    """Build a network with every device kind and return its device IDs."""
+    devices = network.devices
+    names = devices.names
+    [SW1, SW2, CL1, SG1, RC1, D1, AND1, NOR1, XOR1, OR1, NAND1, I1,
+     I2] = names.lookup(["Sw1", "Sw2", "Clock1", "Sg1", "Rc1", "D1", "And1",
+                         "Nor1", "Xor1", "Or1", "Nand1", "I1", "I2"])
+    devices.make_device(SW1, devices.SWITCH, 1)
+    devices.make_device(SW2, devices.SWITCH, 0)
+    devices.make_device(CL1, devices.CLOCK, 2)
+    devices.make_device(SG1, devices.SIGGEN, "0011010")
+    devices.make_device(RC1, devices.RC, 3)
+    devices.make_device(D1, devices.D_TYPE)
+    devices.make_device(AND1, devices.AND, 2)
+    devices.make_device(NOR1, devices.NOR, 2)
+    devices.make_device(XOR1, devices.XOR)
+    devices.make_device(OR1, devices.OR, 2)
+    devices.make_device(NAND1, devices.NAND, 2)
+
+    network.make_connection(CL1, None, D1, devices.CLK_ID)
+    network.make_connection(XOR1, None, D1, devices.DATA_ID)
+    network.make_connection(RC1, None, D1, devices.SET_ID)
+    network.make_connection(SW2, None, D1, devices.CLEAR_ID)
+    network.make_connection(D1, devices.QBAR_ID, XOR1, I1)
+    network.make_connection(SG1, None, XOR1, I2)
+    network.make_connection(D1, devices.Q_ID, AND1, I1)
+    network.make_connection(SW1, None, AND1, I2)
+    network.make_connection(AND1, None, NOR1, I1)
+    network.make_connection(SG1, None, NOR1, I2)
+    network.make_connection(NOR1, None, OR1, I1)
+    network.make_connection(CL1, None, OR1, I2)
+    network.make_connection(OR1, None, NAND1, I1)
+    network.make_connection(XOR1, None, NAND1, I2)
+    return [SW1, SW2]
+
+
+def test_event_driven_matches_sweep():
+    """Test if the event-driven mode reproduces the sweep mode cycle by cycle.
+    """
+    traces = []
+    for mode in ["SWEEP", "EVENT_DRIVEN"]:
+        names = Names()
+        devices = Devices(names)
+        network = Network(names, devices)
+        devices.set_seed(3)
+        [SW1, SW2] = build_sequential_network(network)
+        assert network.set_execution_mode(getattr(network, mode))
+
+        trace = []
+        for cycle in range(40):
+            if cycle == 15:
+                devices.set_switch(SW1, devices.LOW)
+            if cycle == 25:
+                devices.set_switch(SW2, devices.HIGH)
+            if cycle == 30:
+                devices.set_seed(5)
+                devices.cold_startup()
+            assert network.execute_network()
+            trace.append([dict(devices.get_device(device_id).outputs)
+                          for device_id in devices.find_devices()])
+        traces.append(trace)
+    assert traces[0] == traces[1]
+
+
+def test_event_driven_oscillating_network(new_network):
+    """Test if the event-driven mode detects oscillating networks."""
+    network = new_network
+    devices = network.devices
+    names = devices.names
+
+    [NOR1, I1] = names.lookup(["Nor1", "I1"])
+    devices.make_device(NOR1, devices.NOR, 1)
+    network.make_connection(NOR1, None, NOR1, I1)
+
+    assert not network.set_execution_mode(5)
+    assert network.set_execution_mode(network.EVENT_DRIVEN)
+    assert not network.execute_network()
+
+
+def test_fast_forward_matches_cycle_by_cycle():
+    """Test if skipping quiescent cycles reproduces every cycle's signals."""
+    traces = []
+    for fast_forward in [False, True]:
+        names = Names()
+        devices = Devices(names)
+        network = Network(names, devices)
+        devices.set_seed(3)
+        [SW1, SW2] = build_sequential_network(network)
+        network.fast_forward = fast_forward
+
+        trace = []
+
+        def record(cycles):
+            outputs = [dict(devices.get_device(device_id).outputs)
+                       for device_id in devices.find_devices()]
+            trace.extend([outputs] * cycles)
+
+        assert network.execute_cycles(15, record) == 15
+        devices.set_switch(SW1, devices.LOW)
+        assert network.execute_cycles(25, record) == 25
+        traces.append(trace)
+    assert len(traces[0]) == 40
+    assert traces[0] == traces[1]
+
+
+def test_get_quiescent_cycles(new_network):
+    """Test if the cycles before the next source change are counted."""
+    network = new_network
+    devices = network.devices
+    names = devices.names
+    [CL1, SG1, RC1] = names.lookup(["Clock1", "Sg1", "Rc1"])
+
+    devices.make_device(CL1, devices.CLOCK, 1000)
+    devices.get_device(CL1).clock_counter = 400
+    assert network.get_quiescent_cycles() == 600
+
+    # Every cycle executed, unless fast-forward is turned on
+    calls = []
+    assert not network.fast_forward
+    assert network.execute_cycles(10, calls.append) == 10
+    assert calls == [1] * 10
+    assert devices.get_device(CL1).clock_counter == 410
+
+    # One executed cycle, then the rest skipped in a single stretch
+    calls = []
+    network.fast_forward = True
+    assert network.execute_cycles(490, calls.append) == 490
+    assert calls == [1, 489]
+    assert devices.get_device(CL1).clock_counter == 900
+
+    devices.make_device(RC1, devices.RC, 30)
+    assert network.get_quiescent_cycles() == 30
+
+    devices.make_device(SG1, devices.SIGGEN, "0001")
+    devices.get_device(SG1).siggen_counter = 1
+    assert network.get_quiescent_cycles() == 2
+
+
+def build_periodic_network(network):
+    """Build a network with a period of 12 cycles and return its XOR ID."""
+    devices = network.devices
+    names = devices.names
+    [CL1, SG1, XOR1, I1, I2] = names.lookup(["Clock1", "Sg1", "Xor1", "I1",
+                                             "I2"])
+    devices.make_device(CL1, devices.CLOCK, 2)
+    devices.make_device(SG1, devices.SIGGEN, "011")
+    devices.make_device(XOR1, devices.XOR)
+    network.make_connection(CL1, None, XOR1, I1)
+    network.make_connection(SG1, None, XOR1, I2)
+    return XOR1
+
+
+@pytest.mark.parametrize("fast_forward", [False, True])
+def test_period_detection(new_network, fast_forward):
+    """Test if a periodic network is detected and its period replayed."""
+    network = new_network
+    devices = network.devices
+    XOR1 = build_periodic_network(network)
+    network.fast_forward = fast_forward
+
+    traces = []
+    for detect_period in [False, True]:
+        devices.set_seed(1)
+        devices.cold_startup()
+        network.detect_period = detect_period
+        trace = []
+
+        def record(cycles):
+            trace.extend([network.get_output_signal(XOR1, None)] * cycles)
+
+        assert network.execute_cycles(100, record) == 100
+        traces.append(trace)
+
+    # The clock period is 4 cycles and the SIGGEN period 3 cycles
+    assert network.period == 12
+    assert traces[0] == traces[1]
+    assert traces[1][:88] == traces[1][12:]
+
+
+def test_period_kept_across_calls(new_network):
+    """Test if the period found by one call is replayed by the next ones."""
+    network = new_network
+    devices = network.devices
+    XOR1 = build_periodic_network(network)
+    network.fast_forward = False
+    assert not network.detect_period
+
+    traces = []
+    for detect_period in [False, True]:
+        devices.set_seed(1)
+        devices.cold_startup()
+        network.detect_period = detect_period
+        trace = []
+
+        def record(cycles):
+            trace.extend([network.get_output_signal(XOR1, None)] * cycles)
+
+        executed = []
+        execute_network = network.execute_network
+
+        def counted_execute_network():
+            executed.append(1)
+            return execute_network()
+
+        network.execute_network = counted_execute_network
+        for _ in range(4):
+            assert network.execute_cycles(25, record) == 25
+        del network.execute_network
+        traces.append(trace)
+
+    # The period is found after 13 cycles, then each call only executes
+    # the cycle that brings the network back to a known state
+    assert len(executed) == 13 + 3
+    assert network.period == 12
+    assert traces[0] == traces[1]
+
+    # A network changed between calls starts the detection again
+    [SW1] = devices.names.lookup(["Sw1"])
+    devices.make_device(SW1, devices.SWITCH, 0)
+    assert network.execute_cycles(5, record) == 5
+    assert network.period is None
+
+
+def test_find_combinational_loops(new_network):
+    """Test if loops of gates are found and inverter rings recognised."""
+    network = new_network
+    devices = network.devices
+    names = devices.names
+    [SW1, SW2, NOR1, NOR2, NAND1, NAND2, NAND3, AND1, I1,
+     I2] = names.lookup(["Sw1", "Sw2", "Nor1", "Nor2", "Nand1", "Nand2",
+                         "Nand3", "And1", "I1", "I2"])
+    devices.make_device(SW1, devices.SWITCH, 0)
+    devices.make_device(SW2, devices.SWITCH, 0)
+    devices.make_device(AND1, devices.AND, 2)
+    for NOR in [NOR1, NOR2]:
+        devices.make_device(NOR, devices.NOR, 2)
+    for NAND in [NAND1, NAND2, NAND3]:
+        devices.make_device(NAND, devices.NAND, 1)
+
+    # SR latch of two NOR gates, which is stable
+    network.make_connection(SW1, None, NOR1, I1)
+    network.make_connection(NOR2, None, NOR1, I2)
+    network.make_connection(SW2, None, NOR2, I1)
+    network.make_connection(NOR1, None, NOR2, I2)
+    # Ring of three inverters, which never settles
+    network.make_connection(NAND1, None, NAND2, I1)
+    network.make_connection(NAND2, None, NAND3, I1)
+    network.make_connection(NAND3, None, NAND1, I1)
+    # Gate outside any loop
+    network.make_connection(NOR1, None, AND1, I1)
+    network.make_connection(NAND1, None, AND1, I2)
+
+    loops = [sorted(loop) for loop in network.find_combinational_loops()]
+    assert sorted(loops) == sorted([sorted([NOR1, NOR2]),
+                                    sorted([NAND1, NAND2, NAND3])])
+    [latch] = [loop for loop in network.find_combinational_loops()
+               if NOR1 in loop]
+    [ring] = [loop for loop in network.find_combinational_loops()
+              if NAND1 in loop]
+    assert not network.is_ring_oscillator(latch)
+    assert network.is_ring_oscillator(ring)
+
+
+@pytest.mark.parametrize("mode", ["SWEEP", "EVENT_DRIVEN"])
+def test_unstable_loop_stops_early(new_network, mode):
+    """Test if an oscillating loop is reported before the iteration limit."""
+    network = new_network
+    devices = network.devices
+    names = devices.names
+    [SW1, XOR1, AND1, I1, I2] = names.lookup(["Sw1", "Xor1", "And1", "I1",
+                                              "I2"])
+    devices.make_device(SW1, devices.SWITCH, 1)
+    devices.make_device(XOR1, devices.XOR)
+    devices.make_device(AND1, devices.AND, 2)
+    network.make_connection(SW1, None, XOR1, I1)
+    network.make_connection(AND1, None, XOR1, I2)
+    network.make_connection(XOR1, None, AND1, I1)
+    network.make_connection(SW1, None, AND1, I2)
+    assert network.set_execution_mode(getattr(network, mode))
+
+    # The loop is not a ring of inverters, but oscillates with Sw1 HIGH
+    [loop] = network.find_combinational_loops()
+    assert not network.is_ring_oscillator(loop)
+    assert not network.execute_network()
+    assert network.settle_iterations < network.iteration_limit
+    assert [sorted(loop) for loop in network.get_unstable_loops()] == [
+        sorted([XOR1, AND1])]
+
+    # With Sw1 LOW the loop settles
+    devices.set_switch(SW1, devices.LOW)
+    assert network.execute_network()
+    assert network.get_unstable_loops() == []
+
+
+def test_incremental_sweep(new_network):
+    """Test if only the fanout of a toggled switch is executed again."""
+    network = new_network
+    devices = network.devices
+    names = devices.names
+    [SW1, SW2, AND1, AND2, OR1, I1,
+     I2] = names.lookup(["Sw1", "Sw2", "And1", "And2", "Or1", "I1", "I2"])
+    devices.make_device(SW1, devices.SWITCH, 1)
+    devices.make_device(SW2, devices.SWITCH, 1)
+    devices.make_device(AND1, devices.AND, 1)
+    devices.make_device(AND2, devices.AND, 1)
+    devices.make_device(OR1, devices.OR, 2)
+    network.make_connection(SW1, None, AND1, I1)
+    network.make_connection(SW2, None, AND2, I1)
+    network.make_connection(AND1, None, OR1, I1)
+    network.make_connection(AND2, None, OR1, I2)
+
+    executed = []
+    execute_gate = network.execute_gate
+
+    def counted_execute_gate(device_id, x=None, y=None):
+        executed.append(device_id)
+        return execute_gate(device_id, x, y)
+
+    network.execute_gate = counted_execute_gate
+    assert not network.incremental
+    network.incremental = True
+    assert network.execute_network()
+    assert set(executed) == set([AND1, AND2, OR1])
+
+    # Nothing has changed, so nothing is executed
+    del executed[:]
+    assert network.execute_network()
+    assert executed == []
+
+    # Only the fanout of Sw1 is executed, in sweep order
+    devices.set_switch(SW1, devices.LOW)
+    assert network.execute_network()
+    assert set(executed) == set([AND1, OR1])
+    assert executed[:2] == [AND1, OR1]
+    assert network.get_output_signal(OR1, None) == devices.HIGH
+    devices.set_switch(SW2, devices.LOW)
+    assert network.execute_network()
+    assert network.get_output_signal(OR1, None) == devices.LOW
+
+    # Every device is executed when the incremental mode is off
+    del executed[:]
+    network.incremental = False
+    assert network.execute_network()
+    assert set(executed) == set([AND1, AND2, OR1])
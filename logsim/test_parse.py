@@ -512,3 +512,44 @@ def test_parse_network_unused_inputs(parse_check_unused):
     scanner = parse_check_unused.scanner
     # The error is missing start mark
     assert scanner.error.error_code == scanner.error.UNUSED_INPUTS
+
+
+def get_parser(path):
+    """Return a Parser instance using the file at path."""
+    names = Names()
+    devices = Devices(names)
+    network = Network(names, devices)
+    monitors = Monitors(names, devices, network)
+    scanner = Scanner(path, names, devices, network, monitors)
+    return Parser(names, devices, network, monitors, scanner)
+
+
+def test_parse_network_non_ring_loop():
+    """Test if a loop that is not a ring of inverters is run to check it.
+
+    An XOR fed back to itself inverts its output while its other input
+    is HIGH, and is rejected by the trial cycle with the initial switch
+    states only.
+    """
+    parser = get_parser('parse_test_files/check_network_oscillate_xor.txt')
+    assert parser.parse_network() is False
+    assert parser.scanner.error.error_code == parser.scanner.error.OSCILLATE
+    [loop] = parser.network.find_combinational_loops()
+    assert not parser.network.is_ring_oscillator(loop)
+
+    parser = get_parser('parse_test_files/check_network_settle_xor.txt')
+    assert parser.parse_network() is True
+    network = parser.network
+    [SW1, X1] = parser.names.lookup(["SW1", "X1"])
+    parser.devices.set_switch(SW1, parser.devices.HIGH)
+    assert not network.execute_network()
+    assert network.get_unstable_loops() == [[X1]]
+
+
+def test_parse_network_oscillate_names_loop(parse_check_oscillate):
+    """Test if the oscillation error names the devices of the loop."""
+    parser = parse_check_oscillate
+    [A1] = parser.names.lookup(["A1"])
+    assert parser.parse_network() is False
+    assert parser.get_loop_message([[A1]]) == "in the loop: A1"
+    assert parser.get_loop_message([]) == ""
@@ -0,0 +1,103 @@
+"""Test the profiler module."""
+import pytest
+
+from names import Names
+from devices import Devices
+from network import Network
+from monitors import Monitors
+from profiler import Profiler
+
+
+@pytest.fixture
+def new_profiler():
+    """Return a Profiler instance for a clocked D-type and an AND gate."""
+    names = Names()
+    devices = Devices(names)
+    network = Network(names, devices)
+    monitors = Monitors(names, devices, network)
+    [SW1, CL1, D1, AND1, I1, I2] = names.lookup(["Sw1", "Clock1", "D1",
+                                                 "And1", "I1", "I2"])
+    devices.make_device(SW1, devices.SWITCH, 0)
+    devices.make_device(CL1, devices.CLOCK, 1)
+    devices.make_device(D1, devices.D_TYPE)
+    devices.make_device(AND1, devices.AND, 2)
+    network.make_connection(CL1, None, D1, devices.CLK_ID)
+    network.make_connection(D1, devices.QBAR_ID, D1, devices.DATA_ID)
+    network.make_connection(SW1, None, D1, devices.SET_ID)
+    network.make_connection(SW1, None, D1, devices.CLEAR_ID)
+    network.make_connection(D1, devices.Q_ID, AND1, I1)
+    network.make_connection(CL1, None, AND1, I2)
+    monitors.make_monitor(AND1, None)
+    network.fast_forward = False
+    network.detect_period = False
+    network.incremental = False
+    devices.set_seed(1)
+    return Profiler(network, monitors)
+
+
+def test_profile_sweep(new_profiler):
+    """Test if the sweep mode cycles, iterations and evaluations are counted.
+    """
+    profiler = new_profiler
+    network = profiler.network
+    devices = network.devices
+    assert profiler.enable()
+    assert not profiler.enable()
+    assert network.execute_cycles(10, profiler.monitors.record_signals) == 10
+
+    assert profiler.cycles_executed == 10
+    assert profiler.cycles_recorded == 10
+    assert sum(profiler.iterations.values()) == 10
+    assert max(profiler.iterations) <= network.iteration_limit
+    # Every device is evaluated once per settle iteration
+    iterations = sum([iterations * cycles for iterations, cycles
+                      in profiler.iterations.items()])
+    for device_kind in [devices.SWITCH, devices.CLOCK, devices.D_TYPE,
+                        devices.AND]:
+        assert profiler.evaluations[device_kind] == iterations
+    assert profiler.times["execute_network"] > profiler.times[
+        "gate evaluation"] > 0
+    assert profiler.times["record_signals"] > 0
+
+    report = profiler.get_report()
+    assert "Profile of 10 executed and 10 recorded cycles" in report
+    assert "(limit 20)" in report
+    assert "DTYPE" in report
+
+    profiler.reset()
+    assert profiler.cycles_executed == 0
+    assert profiler.evaluations == {}
+    assert profiler.times["execute_network"] == 0
+    network.execute_cycles(2, profiler.monitors.record_signals)
+    assert profiler.cycles_executed == 2
+    assert profiler.evaluations[devices.AND] > 0
+    assert profiler.times["gate evaluation"] > 0
+
+
+def test_disabled_profiler_removes_wrappers(new_profiler):
+    """Test if disabling the profiler restores the methods of the class."""
+    profiler = new_profiler
+    network = profiler.network
+    assert not profiler.disable()
+    profiler.enable()
+    assert "execute_network" in vars(network)
+    assert profiler.disable()
+    assert "execute_network" not in vars(network)
+    assert "update_clocks" not in vars(network)
+    assert "record_signals" not in vars(profiler.monitors)
+
+    network.execute_cycles(5, profiler.monitors.record_signals)
+    assert profiler.cycles_executed == 0
+
+
+def test_profile_compiled(new_profiler):
+    """Test if the compiled mode cycles and iterations are counted."""
+    profiler = new_profiler
+    network = profiler.network
+    assert network.set_execution_mode(network.COMPILED)
+    profiler.enable()
+    assert network.execute_cycles(6, profiler.monitors.record_signals) == 6
+    assert profiler.cycles_executed == 6
+    assert min(profiler.iterations) >= 1
+    assert profiler.times["update_clocks"] > 0
+    assert profiler.evaluations == {}
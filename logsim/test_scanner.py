@@ -181,3 +181,62 @@ def test_print_error_message(scanner_example_3):
                     + '\n' + "INIT; d1 is DTYPE;"
                     + '\n' + "       ^" + '\n'
                     + "SYNTAX[Invalid Initialisation]: Invalid device name ")
+
+
+@pytest.mark.parametrize("filename", [
+    'scanner_test_files/scanner_example_file_1.txt',
+    'scanner_test_files/scanner_example_file_2.txt',
+    'scanner_test_files/scanner_example_file_3.txt',
+    'parse_test_files/check_error_propogation.txt',
+    'definition_file_correct.txt'])
+def test_buffered_matches_file(filename):
+    """Test if the buffered scanner gives the same symbols as the file one."""
+    symbol_lists = []
+    for buffered in [True, False]:
+        names = Names()
+        devices = Devices(names)
+        network = Network(names, devices)
+        monitors = Monitors(names, devices, network)
+        scanner = Scanner(filename, names, devices, network, monitors,
+                          buffered)
+        symbols = []
+        sym = scanner.get_symbol()
+        while sym.type != scanner.EOF:
+            symbols.append((sym.type, sym.id, sym.pos, sym.line_pos))
+            sym = scanner.get_symbol()
+        symbols.append((sym.type, sym.id, sym.pos, sym.line_pos))
+        symbol_lists.append(symbols)
+    assert symbol_lists[0] == symbol_lists[1]
+
+
+def test_restart_replays_symbols(scanner_example_1):
+    """Test if restart replays the scanned symbols without rescanning."""
+    scanner = scanner_example_1
+    first_pass = [scanner.get_symbol() for _ in range(6)]
+    assert first_pass[-1].type == scanner.EOF
+    assert scanner.get_symbol() is first_pass[-1]
+    position = scanner.file.tell()
+
+    scanner.restart()
+    second_pass = [scanner.get_symbol() for _ in range(6)]
+    assert second_pass == first_pass
+    assert scanner.file.tell() == position
+
+
+def test_error_location_from_line_index(tmp_path):
+    """Test if errors are located without reopening the file."""
+    path = tmp_path / "definition.txt"
+    path.write_text("INIT;\r\nD1 is DTYPE;\n\nd2 is DTYPE;")
+    names = Names()
+    devices = Devices(names)
+    network = Network(names, devices)
+    monitors = Monitors(names, devices, network)
+    scanner = Scanner(str(path), names, devices, network, monitors)
+    symbols = [scanner.get_symbol() for _ in range(8)]
+    path.unlink()
+
+    assert [scanner.get_line_position(sym) for sym in symbols] == [
+        1, 1, 2, 2, 2, 2, 4, 4]
+    assert scanner.get_pointer(symbols[6]) == "d2 is DTYPE;" + '\n' + " ^"
+    assert scanner.get_pointer(symbols[3], front=True) == (
+        "D1 is DTYPE;" + '\n' + "  ^")
@@ -0,0 +1,57 @@
+"""Test the traces module."""
+import pytest
+
+from traces import SignalTrace
+
+SIGNALS = [0, 0, 0, 1, 1, 2, 4, 4, None, 3, 3, 3]
+
+
+@pytest.mark.parametrize("run_length", [False, True])
+def test_trace_behaves_like_list(run_length):
+    """Test if a trace gives the same signals as the list it stores."""
+    trace = SignalTrace(run_length=run_length)
+    assert trace == []
+    assert len(trace) == 0
+    for signal in SIGNALS:
+        trace.append(signal)
+    assert trace == SIGNALS
+    assert len(trace) == len(SIGNALS)
+    assert list(trace) == SIGNALS
+    assert [trace[cycle] for cycle in range(len(SIGNALS))] == SIGNALS
+    assert trace[-1] == 3
+    assert trace[2:9] == SIGNALS[2:9]
+    with pytest.raises(IndexError):
+        trace[len(SIGNALS)]
+    assert trace == SignalTrace(SIGNALS, not run_length)
+    assert trace != SIGNALS[:-1]
+
+
+@pytest.mark.parametrize("run_length", [False, True])
+def test_append_repeated(run_length):
+    """Test if a signal appended count times is stored as repeated."""
+    trace = SignalTrace([1], run_length)
+    trace.append(1, 3)
+    trace.append(None, 2)
+    trace.append(0)
+    assert trace == [1, 1, 1, 1, None, None, 0]
+    assert trace.get_runs() == [[1, 4], [None, 2], [0, 1]]
+
+
+def test_get_runs():
+    """Test if both encodings give the same runs."""
+    runs = [[0, 3], [1, 2], [2, 1], [4, 2], [None, 1], [3, 3]]
+    assert SignalTrace(SIGNALS).get_runs() == runs
+    assert SignalTrace(SIGNALS, True).get_runs() == runs
+    # Runs from a cycle inside a run start with the rest of that run
+    for start in [4, 9, 12]:
+        assert SignalTrace(SIGNALS).get_runs(start) == SignalTrace(
+            SIGNALS[start:]).get_runs()
+        assert SignalTrace(SIGNALS, True).get_runs(start) == SignalTrace(
+            SIGNALS[start:]).get_runs()
+
+
+def test_run_length_size():
+    """Test if a stable trace is stored in a few bytes when encoded."""
+    signals = [1] * 10000 + [0] * 10000
+    assert SignalTrace(signals).get_size() == 20000
+    assert SignalTrace(signals, True).get_size() < 100
@@ -0,0 +1,98 @@
+"""Test the vcd module."""
+import io
+
+import pytest
+
+from names import Names
+from devices import Devices
+from network import Network
+from monitors import Monitors
+from vcd import VcdWriter
+
+
+@pytest.fixture
+def new_monitors():
+    """Return a Monitors instance monitoring a switch and a D-type."""
+    names = Names()
+    devices = Devices(names)
+    network = Network(names, devices)
+    monitors = Monitors(names, devices, network)
+    [SW1_ID, D1_ID] = names.lookup(["Sw1", "D1"])
+    devices.make_device(SW1_ID, devices.SWITCH, 0)
+    devices.make_device(D1_ID, devices.D_TYPE)
+    monitors.make_monitor(SW1_ID, None)
+    monitors.make_monitor(D1_ID, devices.QBAR_ID)
+    return monitors
+
+
+class UnclosedStringIO(io.StringIO):
+
+    """Keep the written text readable after the writer closes the file."""
+
+    def close(self):
+        """Do not discard the buffer."""
+
+
+def test_get_identifier():
+    """Test if identifier codes are unique printable strings."""
+    identifiers = [VcdWriter.get_identifier(index) for index in range(10000)]
+    assert identifiers[0] == "!"
+    assert identifiers[93] == "~"
+    assert identifiers[94] == "!!"
+    assert len(set(identifiers)) == len(identifiers)
+    assert all(33 <= ord(character) <= 126 for identifier in identifiers
+               for character in identifier)
+
+
+def test_vcd_streams_changes(new_monitors):
+    """Test if only the signals that change are written to the VCD file."""
+    monitors = new_monitors
+    devices = monitors.devices
+    [SW1_ID] = monitors.names.lookup(["Sw1"])
+    vcd_file = UnclosedStringIO()
+    monitors.start_vcd(vcd_file, keep_traces=False)
+    for switch_state in [0, 0, 1, 1]:
+        devices.set_switch(SW1_ID, switch_state)
+        monitors.network.execute_network()
+        monitors.record_signals()
+    assert monitors.stop_vcd()
+    assert not monitors.stop_vcd()
+
+    text = vcd_file.getvalue()
+    assert "$var wire 1 ! Sw1 $end" in text
+    assert "$var wire 1 \" D1.QBAR $end" in text
+    dump = text.split("$enddefinitions $end\n")[1]
+    assert dump.split("\n") == ["#0", "0!", "0\"", "#2", "1!", "#4", ""]
+    assert all(trace == [] for trace in
+               monitors.monitors_dictionary.values())
+
+
+def test_streamed_cycles_line_up(capsys, new_monitors):
+    """Test if monitors made after streaming line up with the other traces.
+    """
+    monitors = new_monitors
+    devices = monitors.devices
+    [SW1_ID, D1_ID] = monitors.names.lookup(["Sw1", "D1"])
+    for _ in range(2):
+        monitors.record_signals()
+    monitors.start_vcd(UnclosedStringIO(), keep_traces=False)
+    for _ in range(3):
+        monitors.record_signals()
+    assert monitors.streamed_cycles == 3
+    assert monitors.make_monitor(D1_ID, devices.Q_ID, 5) == \
+        monitors.NO_ERROR
+    monitors.stop_vcd()
+    monitors.record_signals()
+
+    assert [len(trace) for trace in
+            monitors.monitors_dictionary.values()] == [3, 3, 3]
+    assert monitors.monitors_dictionary[(D1_ID, devices.Q_ID)][:2] == [
+        devices.BLANK, devices.BLANK]
+    monitors.display_signals()
+    lines = capsys.readouterr()[0].split("\n")
+    assert "Sw1    : ___" in lines
+    assert "D1.Q   :   _" in lines
+    assert "3 cycles streamed to the VCD file are not shown." in lines
+
+    monitors.reset_monitors()
+    assert monitors.streamed_cycles == 0
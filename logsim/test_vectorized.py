@@ -0,0 +1,91 @@
+"""Test the vectorized module."""
+import pytest
+
+from names import Names
+from devices import Devices
+from network import Network
+from test_netlist import (build_counter, build_ripple_counter,
+                          build_gated_counter, get_mode_trace)
+
+np = pytest.importorskip("numpy")
+
+
+@pytest.fixture
+def new_network():
+    """Return a new instance of the Network class."""
+    new_names = Names()
+    new_devices = Devices(new_names)
+    return Network(new_names, new_devices)
+
+
+def test_vectorized_gates(new_network):
+    """Test if each gate kind gives the correct output with padded inputs."""
+    network = new_network
+    devices = network.devices
+    names = devices.names
+    [SW1, SW2, AND1, OR1, NAND1, NOR1, XOR1, I1, I2] = names.lookup(
+        ["Sw1", "Sw2", "And1", "Or1", "Nand1", "Nor1", "Xor1", "I1", "I2"])
+    devices.make_device(SW1, devices.SWITCH, 1)
+    devices.make_device(SW2, devices.SWITCH, 0)
+    devices.make_device(AND1, devices.AND, 1)  # narrower than OR1
+    devices.make_device(OR1, devices.OR, 2)
+    devices.make_device(NAND1, devices.NAND, 2)
+    devices.make_device(NOR1, devices.NOR, 1)
+    devices.make_device(XOR1, devices.XOR)
+    network.make_connection(SW1, None, AND1, I1)
+    network.make_connection(SW1, None, OR1, I1)
+    network.make_connection(SW2, None, OR1, I2)
+    network.make_connection(AND1, None, NAND1, I1)
+    network.make_connection(OR1, None, NAND1, I2)
+    network.make_connection(NAND1, None, NOR1, I1)
+    network.make_connection(NOR1, None, XOR1, I1)
+    network.make_connection(SW2, None, XOR1, I2)
+
+    assert network.set_execution_mode(network.VECTORIZED)
+    assert network.execute_network()
+    assert [network.get_output_signal(device_id, None) for device_id in
+            [AND1, OR1, NAND1, NOR1, XOR1]] == [devices.HIGH, devices.HIGH,
+                                                devices.LOW, devices.HIGH,
+                                                devices.HIGH]
+
+    devices.set_switch(SW1, devices.LOW)
+    assert network.execute_network()
+    assert [network.get_output_signal(device_id, None) for device_id in
+            [AND1, OR1, NAND1, NOR1, XOR1]] == [devices.LOW, devices.LOW,
+                                                devices.HIGH, devices.LOW,
+                                                devices.LOW]
+
+
+@pytest.mark.parametrize("build", [build_counter, build_ripple_counter,
+                                   build_gated_counter])
+def test_vectorized_matches_sweep(build):
+    """Test if the vectorized mode reproduces the sweep mode cycle by cycle.
+    """
+    for seed in range(4):
+        assert (get_mode_trace(build, "VECTORIZED", seed)
+                == get_mode_trace(build, "SWEEP", seed))
+
+
+def test_vectorized_matches_compiled():
+    """Test if the vectorized mode reproduces the compiled mode."""
+    traces = []
+    for mode in ["COMPILED", "VECTORIZED"]:
+        names = Names()
+        devices = Devices(names)
+        network = Network(names, devices)
+        devices.set_seed(11)
+        [SW1, CL1, D1, D2, XOR1] = build_counter(network)
+        assert network.set_execution_mode(getattr(network, mode))
+
+        trace = []
+        for cycle in range(30):
+            if cycle in [12, 14]:
+                devices.set_switch(SW1, 1 - devices.get_device(
+                    SW1).switch_state)
+            assert network.execute_network()
+            trace.append([network.get_output_signal(D1, devices.Q_ID),
+                          network.get_output_signal(D2, devices.QBAR_ID),
+                          network.get_output_signal(XOR1, None),
+                          network.get_output_signal(CL1, None)])
+        traces.append(trace)
+    assert traces[0] == traces[1]
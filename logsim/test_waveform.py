@@ -0,0 +1,112 @@
+"""Test the waveform module."""
+from array import array
+
+import pytest
+
+from names import Names
+from devices import Devices
+from traces import SignalTrace
+from waveform import WaveformGeometry
+
+
+@pytest.fixture
+def new_geometry():
+    """Return a new instance of the WaveformGeometry class."""
+    new_names = Names()
+    new_devices = Devices(new_names)
+    return WaveformGeometry(new_devices)
+
+
+def get_points(vertices):
+    """Return the (x, y) points of vertices stored as bytes."""
+    floats = array("f")
+    floats.frombytes(vertices)
+    return list(zip(floats[0::2], floats[1::2]))
+
+
+@pytest.mark.parametrize("run_length", [False, True])
+def test_trace_vertices(new_geometry, run_length):
+    """Test if runs of levels become single segments and edges slopes."""
+    geometry = new_geometry
+    devices = geometry.devices
+    trace = SignalTrace([devices.BLANK, devices.LOW, devices.LOW,
+                         devices.RISING, devices.HIGH, devices.HIGH,
+                         devices.HIGH], run_length)
+    [vertices, count] = geometry.get_trace_vertices("Sw1", trace)
+    assert count == 6
+    assert get_points(vertices) == [(1, -1), (3, -1), (3, 0), (4, 1),
+                                    (4, 1), (7, 1)]
+
+    # Cycles appended by a continue only extend the vertices
+    trace.append(devices.HIGH, 3)
+    trace.append(devices.FALLING)
+    [vertices, count] = geometry.get_trace_vertices("Sw1", trace)
+    assert get_points(vertices) == [(1, -1), (3, -1), (3, 0), (4, 1),
+                                    (4, 1), (10, 1), (10, 0), (11, -1)]
+    assert geometry.get_trace_vertices("Sw1", trace)[0] == vertices
+
+    # A new trace for the same monitor is rebuilt
+    [vertices, count] = geometry.get_trace_vertices(
+        "Sw1", SignalTrace([devices.LOW], run_length))
+    assert get_points(vertices) == [(0, -1), (1, -1)]
+
+    geometry.remove_stale({})
+    assert geometry.traces == {}
+
+
+def test_visible_vertices(new_geometry):
+    """Test if only the segments of the cycles in view are returned."""
+    geometry = new_geometry
+    devices = geometry.devices
+    trace = SignalTrace([devices.LOW] * 10 + [devices.HIGH] * 10
+                        + [devices.LOW] * 10)
+    [vertices, count] = geometry.get_trace_vertices("Sw1", trace, 12, 15)
+    assert get_points(vertices) == [(10, 1), (20, 1)]
+    [vertices, count] = geometry.get_trace_vertices("Sw1", trace, 5, 15)
+    assert get_points(vertices) == [(0, -1), (10, -1), (10, 1), (20, 1)]
+    assert geometry.get_trace_vertices("Sw1", trace, 40, 50) == (b"", 0)
+
+
+def test_pyramid_vertices(new_geometry):
+    """Test if many cycles per pixel are drawn as min/max buckets."""
+    geometry = new_geometry
+    devices = geometry.devices
+    # A clock toggling every cycle, then a stable HIGH
+    signals = [devices.LOW, devices.HIGH] * 8 + [devices.HIGH] * 16
+    trace = SignalTrace(signals, True)
+    [vertices, count] = geometry.get_trace_vertices("Clk", trace, 0, 32, 4)
+    assert get_points(vertices) == [(0, -1), (4, 1), (4, -1), (8, 1),
+                                    (8, -1), (12, 1), (12, -1), (16, 1),
+                                    (16, 1), (20, 1), (20, 1), (24, 1),
+                                    (24, 1), (28, 1), (28, 1), (32, 1)]
+    # The cycles in view are rounded out to whole buckets
+    [vertices, count] = geometry.get_trace_vertices("Clk", trace, 14, 18, 4)
+    assert get_points(vertices) == [(12, -1), (16, 1), (16, 1), (20, 1)]
+
+    # Appended cycles update the partial buckets, and blanks are skipped
+    trace.append(devices.LOW, 3)
+    trace.append(devices.BLANK, 5)
+    [vertices, count] = geometry.get_trace_vertices("Clk", trace, 32, 40, 4)
+    assert get_points(vertices) == [(32, -1), (36, -1)]
+    [vertices, count] = geometry.get_trace_vertices("Clk", trace, 0, 40, 32)
+    assert get_points(vertices) == [(0, -1), (32, 1), (32, -1), (64, -1)]
+    # Zoomed out beyond the whole trace, the top of the pyramid is drawn
+    [vertices, count] = geometry.get_trace_vertices("Clk", trace, 0, 40,
+                                                    1000)
+    assert get_points(vertices) == [(0, -1), (64, 1)]
+
+    # The pyramid matches one built from scratch
+    rebuilt = WaveformGeometry(devices)
+    rebuilt.update("Clk", SignalTrace(list(trace)))
+    assert rebuilt.traces["Clk"].pyramid == geometry.traces["Clk"].pyramid
+
+
+def test_tick_vertices(new_geometry):
+    """Test if the ticks in view are placed every step cycles."""
+    geometry = new_geometry
+    [ticks, count] = geometry.get_tick_vertices(0, 2)
+    assert get_points(ticks) == [(0, -1), (0, 1), (1, -1), (1, 1), (2, -1),
+                                 (2, 1)]
+    [ticks, count] = geometry.get_tick_vertices(3, 25, 10)
+    assert count == 4
+    assert get_points(ticks) == [(10, -1), (10, 1), (20, -1), (20, 1)]
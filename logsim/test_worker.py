@@ -0,0 +1,76 @@
+"""Test the worker module."""
+import threading
+
+import pytest
+
+from names import Names
+from devices import Devices
+from network import Network
+from monitors import Monitors
+from worker import SimulationWorker
+
+
+@pytest.fixture
+def clocked_network():
+    """Return a network and monitors for a monitored clock."""
+    names = Names()
+    devices = Devices(names)
+    network = Network(names, devices)
+    monitors = Monitors(names, devices, network)
+    [CL1] = names.lookup(["Clock1"])
+    devices.make_device(CL1, devices.CLOCK, 1)
+    monitors.make_monitor(CL1, None)
+    return [network, monitors]
+
+
+def run_worker(network, monitors, cycles, on_progress=None):
+    """Run a worker to its end and return its progress and done calls."""
+    calls = {"progress": [], "done": []}
+
+    def progress(cycles, cycles_per_second):
+        calls["progress"].append(cycles)
+        assert cycles_per_second >= 0
+        if on_progress is not None:
+            on_progress(worker)
+
+    def done(cycles, oscillating):
+        calls["done"].append((cycles, oscillating))
+
+    worker = SimulationWorker(network, monitors, cycles, threading.Lock(),
+                              progress, done)
+    worker.start()
+    worker.join(10)
+    assert not worker.is_alive()
+    return calls
+
+
+def test_worker_runs_all_cycles(clocked_network):
+    """Test if the worker executes and records every cycle in chunks."""
+    [network, monitors] = clocked_network
+    calls = run_worker(network, monitors, 1000)
+    assert calls["done"] == [(1000, False)]
+    assert calls["progress"][-1] == 1000
+    assert calls["progress"] == sorted(calls["progress"])
+    assert len(calls["progress"]) > 1  # the first chunk is one cycle
+    [trace] = monitors.monitors_dictionary.values()
+    assert len(trace) == 1000
+
+
+def test_worker_cancel(clocked_network):
+    """Test if a cancelled worker stops after the current chunk."""
+    [network, monitors] = clocked_network
+    calls = run_worker(network, monitors, 10 ** 9,
+                       lambda worker: worker.cancel())
+    assert calls["progress"] == [1]
+    assert calls["done"] == [(1, False)]
+
+
+def test_worker_oscillating(clocked_network):
+    """Test if the worker reports an oscillating network."""
+    [network, monitors] = clocked_network
+    devices = network.devices
+    [NOR1, I1] = devices.names.lookup(["Nor1", "I1"])
+    devices.make_device(NOR1, devices.NOR, 1)
+    network.make_connection(NOR1, None, NOR1, I1)
+    calls = run_worker(network, monitors, 100)
+    assert calls["done"] == [(0, True)]
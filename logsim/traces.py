@@ -0,0 +1,145 @@
+"""Store signal traces compactly.
+
+Used in the Logic Simulator project to keep the signal trace of each monitor
+in one byte per cycle, or in one entry per run of equal signals.
+
+Classes
+-------
+SignalTrace - stores the signal trace of one monitor.
+"""
+from array import array
+from bisect import bisect_right
+
+
+class SignalTrace:
+
+    """Store the signal trace of one monitor.
+
+    The trace behaves like the list of signals it replaces: it can be
+    appended to, indexed, sliced, iterated over and compared with a list.
+    Signals are stored in an array of signed bytes, with None stored as -1.
+
+    With run-length encoding, consecutive equal signals are stored as one
+    run: values holds the signal of each run and ends holds the cycle just
+    after its last one, so cycle k is found by a binary search over ends.
+    Clocks and nets that rarely change then take a few runs for any number
+    of cycles.
+
+    Parameters
+    ----------
+    signals: initial list of signals.
+    run_length: True to store the trace run-length encoded.
+
+    Public methods
+    --------------
+    append(self, signal, count=1): Adds a signal to the end of the trace
+                                   count times.
+
+    extend(self, signals): Adds a list of signals to the end of the trace.
+
+    get_runs(self, start=0): Returns the trace from a cycle on as a list of
+                             [signal, length] runs.
+
+    get_size(self): Returns the number of bytes used to store the trace.
+    """
+
+    NONE = -1  # stored in place of None
+
+    def __init__(self, signals=(), run_length=False):
+        """Initialise the trace arrays."""
+        self.run_length = run_length
+        self.values = array("b")
+        self.ends = array("q")  # only used with run-length encoding
+        self.extend(signals)
+
+    def append(self, signal, count=1):
+        """Add the signal to the end of the trace count times."""
+        value = self.NONE if signal is None else signal
+        if not self.run_length:
+            if count == 1:
+                self.values.append(value)
+            else:
+                self.values.extend(array("b", [value]) * count)
+        elif self.values and self.values[-1] == value:
+            self.ends[-1] += count
+        else:
+            self.ends.append(len(self) + count)
+            self.values.append(value)
+
+    def extend(self, signals):
+        """Add the signals to the end of the trace."""
+        if not self.run_length:
+            self.values.extend(self.NONE if signal is None else signal
+                               for signal in signals)
+            return
+        for signal in signals:
+            self.append(signal)
+
+    def decode(self, value):
+        """Return the signal stored as value."""
+        return None if value == self.NONE else value
+
+    def __len__(self):
+        """Return the number of cycles in the trace."""
+        if not self.run_length:
+            return len(self.values)
+        elif self.ends:
+            return self.ends[-1]
+        return 0
+
+    def __getitem__(self, index):
+        """Return the signal at a cycle, or a list of signals for a slice."""
+        if isinstance(index, slice):
+            return [self[cycle] for cycle in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("Trace index out of range.")
+        if not self.run_length:
+            return self.decode(self.values[index])
+        return self.decode(self.values[bisect_right(self.ends, index)])
+
+    def __iter__(self):
+        """Iterate over the signals of the trace."""
+        if not self.run_length:
+            for value in self.values:
+                yield self.decode(value)
+            return
+        for signal, length in self.get_runs():
+            for _ in range(length):
+                yield signal
+
+    def __eq__(self, other):
+        """Return True if both traces hold the same signals."""
+        if isinstance(other, (SignalTrace, list)):
+            return len(self) == len(other) and list(self) == list(other)
+        return NotImplemented
+
+    def __repr__(self):
+        """Return the trace as a list of signals."""
+        return repr(list(self))
+
+    def get_runs(self, start=0):
+        """Return the trace from the start cycle on as a list of runs.
+
+        Each run is a [signal, length] pair.
+        """
+        runs = []
+        if self.run_length:
+            first_run = bisect_right(self.ends, start)
+            for value, end in zip(self.values[first_run:],
+                                  self.ends[first_run:]):
+                runs.append([self.decode(value), end - start])
+                start = end
+            return runs
+        for value in self.values[start:]:
+            if runs and runs[-1][0] == self.decode(value):
+                runs[-1][1] += 1
+            else:
+                runs.append([self.decode(value), 1])
+        return runs
+
+    def get_size(self):
+        """Return the number of bytes used to store the trace."""
+        return (self.values.itemsize * len(self.values)
+                + self.ends.itemsize * len(self.ends))
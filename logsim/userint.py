@@ -7,6 +7,9 @@ Classes:
 --------
 UserInterface - reads and parses user commands.
 """
+from checkpoint import Checkpoint
+from montecarlo import MonteCarlo
+from profiler import Profiler
 
 
 class UserInterface:
@@ -64,6 +67,21 @@ class UserInterface:
     run_command(self): Runs the simulation from scratch.
 
     continue_command(self): Continues a previously run simulation.
+
+    vcd_command(self): Starts or stops streaming the monitored signals to a
+                       VCD file.
+
+    profile_command(self): Turns the profiling of each run on or off.
+
+    save_command(self): Saves the simulation state to a checkpoint file.
+
+    load_command(self): Restores the simulation state from a checkpoint
+                        file.
+
+    seed_command(self): Seeds the random states of the cold start-ups.
+
+    analyse_command(self): Runs many seeded cold start-ups and prints the
+                           statistics of the monitored signals.
     """
 
     def __init__(self, names, devices, network, monitors):
@@ -74,6 +92,9 @@ class UserInterface:
         self.network = network
 
         self.cycles_completed = 0  # number of simulation cycles completed
+        self.profiler = Profiler(network, monitors)
+        self.checkpoint = Checkpoint(names, devices, network, monitors)
+        self.seed = 0  # seed of the Monte Carlo analyses
 
         self.character = ""  # current character
         self.line = ""  # current string entered by the user
@@ -98,10 +119,23 @@ class UserInterface:
                 self.run_command()
             elif command == "c":
                 self.continue_command()
+            elif command == "v":
+                self.vcd_command()
+            elif command == "p":
+                self.profile_command()
+            elif command == "w":
+                self.save_command()
+            elif command == "l":
+                self.load_command()
+            elif command == "e":
+                self.seed_command()
+            elif command == "a":
+                self.analyse_command()
             else:
                 print("Invalid command. Enter 'h' for help.")
             self.get_line()  # get the user entry
             command = self.read_command()  # read the first character
+        self.monitors.stop_vcd()  # close the VCD file, if one is open
 
     def get_line(self):
         """Print prompt for the user and update the user entry."""
@@ -207,6 +241,14 @@ class UserInterface:
         print("s X N     - set switch X to N (0 or 1)")
         print("m X       - set a monitor on signal X")
         print("z X       - zap the monitor on signal X")
+        print("v F       - stream monitored signals to VCD file F")
+        print("v -s F    - stream to VCD file F without keeping the traces")
+        print("v         - stop streaming to the VCD file")
+        print("p         - turn profiling of each run on or off")
+        print("w F       - save the simulation state to checkpoint file F")
+        print("l F       - restore the simulation state from checkpoint F")
+        print("e N       - seed the random cold start-ups with N")
+        print("a N R     - analyse R cold start-ups of N cycles each")
         print("h         - help (this command)")
         print("q         - quit the program")
 
@@ -248,12 +290,14 @@ class UserInterface:
 
         Return True if successful.
         """
-        for _ in range(cycles):
-            if self.network.execute_network():
-                self.monitors.record_signals()
-            else:
-                print("Error! Network oscillating.")
-                return False
+        self.profiler.reset()
+        cycles_completed = self.network.execute_cycles(
+            cycles, self.monitors.record_signals)
+        if self.profiler.enabled:
+            print(self.profiler.get_report())
+        if cycles_completed < cycles:
+            print("Error! Network oscillating.")
+            return False
         self.monitors.display_signals()
         return True
 
@@ -279,3 +323,90 @@ class UserInterface:
                 self.cycles_completed += cycles
                 print(" ".join(["Continuing for", str(cycles), "cycles.",
                                 "Total:", str(self.cycles_completed)]))
+
+    def vcd_command(self):
+        """Start or stop streaming the monitored signals to a VCD file.
+
+        With the -s flag, the signal traces are no longer kept in memory, so
+        that long simulations run with bounded memory.
+        """
+        file_name = self.line[self.cursor:].strip()
+        keep_traces = True
+        if file_name.split()[:1] == ["-s"]:
+            keep_traces = False
+            file_name = file_name[2:].strip()
+            if not file_name:
+                print("Error! Expected a file name.")
+                return
+        if not file_name:
+            if self.monitors.stop_vcd():
+                print("Stopped writing the VCD file.")
+            else:
+                print("Error! No VCD file is being written.")
+            return
+        try:
+            vcd_file = open(file_name, "w")
+        except OSError:
+            print("Error! Could not open the VCD file.")
+            return
+        self.monitors.start_vcd(vcd_file, keep_traces)
+        if keep_traces:
+            print("".join(["Writing monitored signals to ", file_name]))
+        else:
+            print("".join(["Streaming monitored signals to ", file_name,
+                           " without keeping them in memory"]))
+
+    def profile_command(self):
+        """Turn the profiling of each run on or off."""
+        if self.profiler.disable():
+            print("Profiling off.")
+        else:
+            self.profiler.enable()
+            print("Profiling on. A profile is printed after each run.")
+
+    def save_command(self):
+        """Save the simulation state to a checkpoint file."""
+        file_name = self.line[self.cursor:].strip()
+        if not file_name:
+            print("Error! Expected a file name.")
+        elif self.checkpoint.save(file_name, self.cycles_completed):
+            print("".join(["Saved ", str(self.cycles_completed),
+                           " cycles to ", file_name]))
+        else:
+            print("Error! Could not write the checkpoint file.")
+
+    def load_command(self):
+        """Restore the simulation state from a checkpoint file."""
+        file_name = self.line[self.cursor:].strip()
+        if not file_name:
+            print("Error! Expected a file name.")
+            return
+        cycles_completed = self.checkpoint.restore(file_name)
+        if cycles_completed is None:
+            print("Error! Not a checkpoint of this circuit.")
+        else:
+            self.cycles_completed = cycles_completed
+            print("".join(["Restored ", str(cycles_completed),
+                           " cycles from ", file_name]))
+
+    def seed_command(self):
+        """Seed the random states of the cold start-ups."""
+        seed = self.read_number(0, None)
+        if seed is not None:
+            self.devices.set_seed(seed)
+            self.seed = seed
+            print("".join(["Seeded the cold start-ups with ", str(seed)]))
+
+    def analyse_command(self):
+        """Run many seeded cold start-ups and print the signal statistics."""
+        cycles = self.read_number(1, None)
+        if cycles is None:
+            return
+        runs = self.read_number(1, None)
+        if runs is not None:
+            print("".join(["Analysing ", str(runs), " cold start-ups"]))
+            # Made for each analysis, to run the present switches and monitors
+            monte_carlo = MonteCarlo(self.names, self.devices, self.network,
+                                     self.monitors)
+            statistics = monte_carlo.run(runs, cycles, self.seed)
+            print(monte_carlo.get_report(statistics))
@@ -0,0 +1,108 @@
+"""Write monitored signals to a Value Change Dump file.
+
+Used in the Logic Simulator project to stream the monitored signals to disk
+as the simulation runs, so that they can be inspected in standard waveform
+viewers.
+
+Classes
+-------
+VcdWriter - writes value changes of the monitored signals to a VCD file.
+"""
+import datetime
+
+
+class VcdWriter:
+
+    """Write value changes of the monitored signals to a VCD file.
+
+    The header declares one wire for each signal monitored when the writer
+    is created, named by Devices.get_signal_name. Each call to write_cycle
+    is one time step, and only the signals that differ from the previous
+    step are written. HIGH and RISING are dumped as 1, LOW and FALLING as 0,
+    and BLANK as x.
+
+    Parameters
+    ----------
+    devices: instance of the devices.Devices() class.
+    monitors: instance of the monitors.Monitors() class.
+    vcd_file: file object opened for writing text.
+
+    Public methods
+    --------------
+    get_identifier(index): Returns the VCD identifier code of a signal.
+
+    write_header(self): Writes the VCD header and signal declarations.
+
+    write_cycle(self, signals, cycles=1): Writes the signals that changed
+                                          in a cycle repeated cycles times.
+
+    close(self): Closes the VCD file.
+    """
+
+    def __init__(self, devices, monitors, vcd_file):
+        """Write the header and initialise the last dumped values."""
+        self.devices = devices
+        self.vcd_file = vcd_file
+
+        # {(device_id, output_id): identifier code}
+        self.identifiers = {}
+        for index, monitor in enumerate(monitors.monitors_dictionary):
+            self.identifiers[monitor] = self.get_identifier(index)
+        self.values = {}  # {(device_id, output_id): last dumped value}
+        self.time = 0
+
+        self.write_header()
+
+    @staticmethod
+    def get_identifier(index):
+        """Return the identifier code of a signal from printable ASCII."""
+        identifier = ""
+        index += 1
+        while index > 0:
+            index, digit = divmod(index - 1, 94)
+            identifier = "".join([chr(33 + digit), identifier])
+        return identifier
+
+    def write_header(self):
+        """Write the VCD header and the signal declarations."""
+        lines = ["$date", datetime.datetime.now().strftime("%c"), "$end",
+                 "$version Logic Simulator $end",
+                 "$timescale 1 ns $end",  # one simulation cycle
+                 "$scope module logsim $end"]
+        for (device_id, output_id), identifier in self.identifiers.items():
+            signal_name = self.devices.get_signal_name(device_id, output_id)
+            lines.append(" ".join(["$var wire 1", identifier, signal_name,
+                                   "$end"]))
+        lines.extend(["$upscope $end", "$enddefinitions $end", ""])
+        self.vcd_file.write("\n".join(lines))
+
+    def get_value(self, signal):
+        """Return the VCD value of a signal."""
+        if signal in [self.devices.HIGH, self.devices.RISING]:
+            return "1"
+        elif signal in [self.devices.LOW, self.devices.FALLING]:
+            return "0"
+        return "x"
+
+    def write_cycle(self, signals, cycles=1):
+        """Write the signals that changed since the previous cycle.
+
+        signals is a dictionary {(device_id, output_id): signal}, which
+        holds for the given number of cycles. Monitors made after the header
+        was written are ignored.
+        """
+        changes = []
+        for monitor, identifier in self.identifiers.items():
+            value = self.get_value(signals.get(monitor))
+            if self.values.get(monitor) != value:
+                self.values[monitor] = value
+                changes.append("".join([value, identifier]))
+        if changes or self.time == 0:
+            self.vcd_file.write("".join(["#", str(self.time), "\n"]))
+            self.vcd_file.write("".join([change + "\n" for change in changes]))
+        self.time += cycles
+
+    def close(self):
+        """Write the final time and close the VCD file."""
+        self.vcd_file.write("".join(["#", str(self.time), "\n"]))
+        self.vcd_file.close()
@@ -0,0 +1,177 @@
+"""Execute the compiled netlist with NumPy vector operations.
+
+Used in the Logic Simulator project to evaluate wide networks a whole level
+of gates at a time. NumPy is optional: without it the vectorized netlist does
+not compile and the other execution modes remain available.
+
+Classes
+-------
+VectorizedNetlist - executes the compiled evaluation plan with NumPy.
+"""
+try:
+    import numpy as np
+except ImportError:  # NumPy is an optional dependency
+    np = None
+
+from netlist import CompiledNetlist
+
+
+class VectorizedNetlist(CompiledNetlist):
+
+    """Execute the compiled evaluation plan with NumPy vector operations.
+
+    The signals are stored in a NumPy vector with two extra constant slots,
+    one LOW and one HIGH. The gates of each level are grouped by kind, and
+    each group gets an (n_gates x max_inputs) matrix of input slots, padded
+    with the constant slot that leaves the gate output unchanged: HIGH for
+    AND and NAND, LOW for OR and NOR. A group is then evaluated with one
+    reduction along the rows. The D-types are updated in turn, as in
+    CompiledNetlist, since a D-type can clock the ones after it.
+
+    Parameters
+    ----------
+    devices: instance of the devices.Devices() class.
+    network: instance of the network.Network() class.
+
+    Public methods
+    --------------
+    compile(self): Builds the evaluation plan and its index matrices.
+                   Returns False if NumPy is not installed or the network
+                   does not compile.
+
+    execute(self): Executes the network for one simulation cycle.
+    """
+
+    def __init__(self, devices, network):
+        """Initialise the vector variables."""
+        super().__init__(devices, network)
+        self.groups = []  # [(gate_kind, output_slots, input_matrix)]
+
+    def compile(self):
+        """Build the evaluation plan and the index matrices of each level.
+
+        Return True if successful.
+        """
+        if np is None or not super().compile():
+            return False
+        devices = self.devices
+
+        slot_count = len(self.signals)
+        self.low_slot = slot_count
+        self.high_slot = slot_count + 1
+        self.written = np.array([outputs[output_id] for
+                                 (outputs, output_id) in self.slot_outputs],
+                                dtype=np.int8)
+        self.signals = np.array(self.signals + [devices.LOW, devices.HIGH],
+                                dtype=np.int8)
+
+        padding = {devices.AND: self.high_slot, devices.NAND: self.high_slot,
+                   devices.OR: self.low_slot, devices.NOR: self.low_slot,
+                   devices.XOR: self.low_slot}
+        self.groups = []
+        for level in self.levels:
+            for gate_kind in devices.gate_types:
+                gates = [gate for gate in level if gate[0] == gate_kind]
+                if not gates:
+                    continue
+                width = max(len(gate[2]) for gate in gates)
+                if width > devices.max_gate_inputs:
+                    return False
+                input_matrix = np.full((len(gates), width),
+                                       padding[gate_kind], dtype=np.intp)
+                for row, (kind, output_slot, input_slots) in enumerate(gates):
+                    input_matrix[row, :len(input_slots)] = input_slots
+                output_slots = self.index_array(
+                    [gate[1] for gate in gates])
+                self.groups.append((gate_kind, output_slots, input_matrix))
+
+        self.switch_devices = [device for (device, slot) in self.switches]
+        self.switch_slots = self.index_array(
+            [slot for (device, slot) in self.switches])
+        self.source_slots = self.index_array(
+            [slot for (device, slot) in self.clocks + self.switches])
+        self.gate_slots = self.index_array(
+            [gate[1] for gate in self.gates])
+        return True
+
+    @staticmethod
+    def index_array(slot_list):
+        """Return the list of slots as a NumPy index array."""
+        return np.array(slot_list, dtype=np.intp)
+
+    def evaluate_gates(self):
+        """Evaluate every gate once, a group of one level at a time."""
+        signals = self.signals
+        devices = self.devices
+        for (gate_kind, output_slots, input_matrix) in self.groups:
+            inputs = signals[input_matrix]
+            if gate_kind == devices.AND:
+                signals[output_slots] = inputs.min(axis=1)
+            elif gate_kind == devices.NAND:
+                signals[output_slots] = 1 - inputs.min(axis=1)
+            elif gate_kind == devices.OR:
+                signals[output_slots] = inputs.max(axis=1)
+            elif gate_kind == devices.NOR:
+                signals[output_slots] = 1 - inputs.max(axis=1)
+            else:  # XOR
+                signals[output_slots] = np.bitwise_xor(inputs[:, 0],
+                                                       inputs[:, 1])
+
+    def write_back(self):
+        """Copy the slots that changed to the device outputs."""
+        slot_count = len(self.slot_outputs)
+        signals = self.signals[:slot_count]
+        for slot in np.flatnonzero(signals != self.written).tolist():
+            (outputs, output_id) = self.slot_outputs[slot]
+            outputs[output_id] = int(signals[slot])
+        self.written = signals.copy()
+
+    def update_d_types(self, before):
+        """Update the memory and outputs of every D-type in turn.
+
+        The D-types are updated one at a time by
+        CompiledNetlist.update_d_types, on lists of the signals.
+        """
+        if not self.d_types:
+            return
+        signals = self.signals
+        seen = before.tolist()
+        self.signals = signals.tolist()
+        super().update_d_types(seen)
+        signals[:] = self.signals
+        self.signals = signals
+        before[:] = seen
+
+    def execute(self):
+        """Execute the network for one simulation cycle.
+
+        Return True if successful and the network does not oscillate.
+        """
+        signals = self.signals
+
+        self.network.update_clocks()
+        self.network.update_siggen()
+        self.network.update_rc()
+
+        # The signals as the D-types see them, as in CompiledNetlist
+        before = signals.copy()
+        for (device, slot) in self.clocks:
+            signal = self.settle(device.outputs[None])
+            signals[slot] = self.written[slot] = signal
+            device.outputs[None] = signal
+        signals[self.switch_slots] = [device.switch_state for device
+                                      in self.switch_devices]
+
+        settled = False
+        for iteration in range(self.network.iteration_limit):
+            self.network.settle_iterations = iteration + 1
+            self.update_d_types(before)
+            if iteration == 0:
+                before[self.source_slots] = signals[self.source_slots]
+            elif np.array_equal(signals, before):
+                settled = True
+                break
+            before[self.gate_slots] = signals[self.gate_slots]
+            self.evaluate_gates()
+        self.write_back()
+        return settled
@@ -0,0 +1,240 @@
+"""Build the geometry of the signal traces drawn by the GUI.
+
+Used in the Logic Simulator project to turn the signal traces of the
+monitors into vertex arrays that the canvas draws with one glDrawArrays call
+each, instead of one glVertex2f call per cycle. Only the cycles in view are
+drawn, and when several cycles fall on one pixel the traces are drawn from a
+min/max level-of-detail pyramid, so the cost of a frame depends on the size
+of the canvas rather than the length of the run.
+
+Classes
+-------
+TraceGeometry - stores the vertices and pyramid of one trace.
+WaveformGeometry - builds and caches the geometry of the signal traces.
+"""
+from array import array
+from bisect import bisect_left, bisect_right
+
+
+class TraceGeometry:
+
+    """Store the vertices and level-of-detail pyramid of one trace.
+
+    Parameters
+    ----------
+    trace: the signal trace, a traces.SignalTrace.
+
+    Public methods
+    --------------
+    No public methods.
+    """
+
+    def __init__(self, trace):
+        """Initialise empty geometry for the trace."""
+        self.trace = trace
+        self.cycles = 0  # cycles of the trace built so far
+
+        # (x, y) pairs of the detailed line strip, the x of each vertex, for
+        # binary searches, and the bytes of the pairs, once drawn
+        self.vertices = array("f")
+        self.x_values = array("f")
+        self.buffer = None
+        self.level = None  # y of the last segment if it is flat
+
+        # [(minima, maxima)] of y, where level n holds buckets of 2**n
+        # cycles. A bucket of BLANK signals has its minimum above its maximum
+        self.pyramid = [(array("b"), array("b"))]
+
+
+class WaveformGeometry:
+
+    """Build and cache the geometry of the signal traces.
+
+    The vertices of a trace are (x, y) pairs of 32-bit floats for a
+    GL_LINE_STRIP, where x is in cycles and y is -1 for LOW, 0 for the start
+    of an edge and 1 for HIGH, so that the canvas places and scales each
+    trace with its modelview matrix. A run of equal LOW or HIGH signals is
+    one segment, so a trace takes a few vertices for each change, whatever
+    its length. The geometry is kept for each monitor and only the cycles
+    recorded since the last update are added, so continuing a run does not
+    rebuild the traces.
+
+    When a pixel spans two cycles or more, the trace is drawn from the level
+    of the pyramid whose buckets are the widest that fit in a pixel: each
+    bucket becomes a segment from its minimum to its maximum, as waveform
+    viewers do, so a fast signal shows as a solid band.
+
+    Parameters
+    ----------
+    devices: instance of the devices.Devices() class.
+
+    Public methods
+    --------------
+    get_trace_vertices(self, key, trace, first_cycle=0, last_cycle=None,
+                       cycles_per_pixel=1): Returns the vertices and vertex
+                                            count of the cycles of a trace in
+                                            view.
+
+    get_tick_vertices(self, first_cycle, last_cycle, step=1): Returns the
+                                            vertices and vertex count of the
+                                            ticks of the time axis in view.
+
+    remove_stale(self, keys): Forgets the traces that are not in keys.
+    """
+
+    BLANK_BUCKET = (2, -2)  # (minimum, maximum) of a bucket with no signal
+
+    def __init__(self, devices):
+        """Initialise the cache of trace geometry."""
+        self.devices = devices
+        # y of the signals drawn flat
+        self.levels = {devices.LOW: -1, devices.HIGH: 1}
+        # y reached by the edges, which start from 0
+        self.edges = {devices.RISING: 1, devices.FALLING: -1}
+        # (minimum, maximum) of y over one cycle of each signal
+        self.ranges = {devices.LOW: (-1, -1), devices.HIGH: (1, 1),
+                       devices.RISING: (0, 1), devices.FALLING: (-1, 0)}
+
+        self.traces = {}  # {key: TraceGeometry}
+
+    def add_run(self, geometry, signal, start, length):
+        """Add the vertices of a run of equal signals to a trace geometry.
+
+        A flat run continuing the last segment at the same level moves the
+        end of that segment. Signals that are neither a level nor an edge,
+        such as BLANK, add no vertices.
+        """
+        vertices = geometry.vertices
+        end = start + length
+        level = self.levels.get(signal)
+        if level is not None:
+            if geometry.level == level and vertices[-2] == start:
+                vertices[-2] = end
+                geometry.x_values[-1] = end
+            else:
+                vertices.extend([start, level, end, level])
+                geometry.x_values.extend([start, end])
+            geometry.level = level
+            return
+        geometry.level = None
+        target = self.edges.get(signal)
+        if target is not None:
+            for cycle in range(start, end):
+                vertices.extend([cycle, 0, cycle + 1, target])
+                geometry.x_values.extend([cycle, cycle + 1])
+
+    def extend_pyramid(self, geometry, start):
+        """Rebuild the pyramid buckets from the start cycle on.
+
+        Level 0 must already hold every cycle. The last bucket of each level
+        may have been partial, so it is rebuilt with the new ones.
+        """
+        pyramid = geometry.pyramid
+        level = 1
+        while len(pyramid[level - 1][0]) > 1:
+            (lower_minima, lower_maxima) = pyramid[level - 1]
+            if level == len(pyramid):
+                pyramid.append((array("b"), array("b")))
+            (minima, maxima) = pyramid[level]
+            start //= 2
+            del minima[start:]
+            del maxima[start:]
+            first = 2 * start
+            pairs = zip(lower_minima[first::2], lower_minima[first + 1::2])
+            minima.extend([min(pair) for pair in pairs])
+            pairs = zip(lower_maxima[first::2], lower_maxima[first + 1::2])
+            maxima.extend([max(pair) for pair in pairs])
+            if len(lower_minima) % 2:  # the last bucket holds one
+                minima.append(lower_minima[-1])
+                maxima.append(lower_maxima[-1])
+            level += 1
+
+    def update(self, key, trace):
+        """Return the geometry of a trace, extended to its last cycle.
+
+        The geometry last built for key is extended with the cycles recorded
+        since. It is rebuilt if the trace is a new one or has got shorter.
+        """
+        geometry = self.traces.get(key)
+        if (geometry is None or geometry.trace is not trace
+                or geometry.cycles > len(trace)):
+            geometry = TraceGeometry(trace)
+            self.traces[key] = geometry
+        if geometry.cycles < len(trace):
+            start = geometry.cycles
+            (minima, maxima) = geometry.pyramid[0]
+            for signal, length in trace.get_runs(start):
+                self.add_run(geometry, signal, start, length)
+                (minimum, maximum) = self.ranges.get(signal,
+                                                     self.BLANK_BUCKET)
+                minima.extend(array("b", [minimum]) * length)
+                maxima.extend(array("b", [maximum]) * length)
+                start += length
+            self.extend_pyramid(geometry, geometry.cycles)
+            geometry.cycles = start
+            geometry.buffer = None
+        return geometry
+
+    def get_trace_vertices(self, key, trace, first_cycle=0, last_cycle=None,
+                           cycles_per_pixel=1):
+        """Return the vertices of a trace in view as bytes and their count.
+
+        Only the cycles from first_cycle to last_cycle, or to the end of the
+        trace, are returned, with the segments that cross into them. With
+        two or more cycles per pixel, they come from the pyramid.
+        """
+        geometry = self.update(key, trace)
+        if last_cycle is None or last_cycle > geometry.cycles:
+            last_cycle = geometry.cycles
+        if first_cycle >= last_cycle:
+            return (b"", 0)
+        if cycles_per_pixel >= 2:
+            return self.get_pyramid_vertices(geometry, first_cycle,
+                                             last_cycle, cycles_per_pixel)
+
+        if geometry.buffer is None:
+            geometry.buffer = geometry.vertices.tobytes()
+        first = max(bisect_right(geometry.x_values, first_cycle) - 1, 0)
+        last = bisect_left(geometry.x_values, last_cycle) + 1
+        last = min(last, len(geometry.x_values))
+        size = geometry.vertices.itemsize * 2  # bytes per vertex
+        return (geometry.buffer[first * size:last * size], max(last - first,
+                                                               0))
+
+    def get_pyramid_vertices(self, geometry, first_cycle, last_cycle,
+                             cycles_per_pixel):
+        """Return the vertices of the buckets of the cycles in view.
+
+        The buckets are those of the highest level no wider than a pixel.
+        Each one adds a segment from its minimum, at its start, to its
+        maximum, at its end.
+        """
+        level = min(int(cycles_per_pixel).bit_length() - 1,
+                    len(geometry.pyramid) - 1)
+        width = 2 ** level
+        (minima, maxima) = geometry.pyramid[level]
+        vertices = array("f")
+        for bucket in range(first_cycle // width,
+                            min((last_cycle - 1) // width + 1, len(minima))):
+            if minima[bucket] <= maxima[bucket]:
+                vertices.extend([bucket * width, minima[bucket],
+                                 (bucket + 1) * width, maxima[bucket]])
+        return (vertices.tobytes(), len(vertices) // 2)
+
+    def get_tick_vertices(self, first_cycle, last_cycle, step=1):
+        """Return the vertices of the time axis ticks as bytes and their count.
+
+        There is one vertical GL_LINES tick from y = -1 to 1 at every
+        multiple of step from first_cycle to last_cycle, with x in cycles.
+        """
+        vertices = array("f")
+        for cycle in range(-(-first_cycle // step) * step, last_cycle + 1,
+                           step):
+            vertices.extend([cycle, -1, cycle, 1])
+        return (vertices.tobytes(), len(vertices) // 2)
+
+    def remove_stale(self, keys):
+        """Forget the geometry of the traces whose key is not in keys."""
+        for key in list(self.traces):
+            if key not in keys:
+                del self.traces[key]
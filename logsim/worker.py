@@ -0,0 +1,92 @@
+"""Run the simulation in a background thread.
+
+Used in the Logic Simulator project so that the GUI stays responsive during
+long runs: the network is executed in chunks in a worker thread, which
+reports its progress after each chunk and can be cancelled between chunks.
+
+Classes
+-------
+SimulationWorker - executes the network for a number of cycles in a thread.
+"""
+import threading
+import time
+
+
+class SimulationWorker(threading.Thread):
+
+    """Execute the network for a number of cycles in a background thread.
+
+    The cycles are executed with Network.execute_cycles in chunks, each one
+    while holding lock, so that the thread owning the traces can read them
+    safely by taking the lock too. The chunks start at one cycle and are
+    doubled or halved to take about chunk_time seconds each. After every
+    chunk, progress(cycles_completed, cycles_per_second) is called, and when
+    the run ends, done(cycles_completed, oscillating). Both are called from
+    the worker thread: a GUI should pass functions that forward the call to
+    its own thread, such as with wx.CallAfter. done is called even if the
+    run raises an exception.
+
+    Parameters
+    ----------
+    network: instance of the network.Network() class.
+    monitors: instance of the monitors.Monitors() class.
+    cycles: number of cycles to execute.
+    lock: threading.Lock() held while the network is executed.
+    progress: function called after each chunk.
+    done: function called when the run ends.
+    chunk_time: target duration of a chunk in seconds.
+
+    Public methods
+    --------------
+    run(self): Executes the cycles in chunks, until done or cancelled.
+
+    cancel(self): Stops the run after the current chunk.
+    """
+
+    def __init__(self, network, monitors, cycles, lock, progress, done,
+                 chunk_time=0.05):
+        """Initialise the run."""
+        super().__init__(daemon=True)
+        self.network = network
+        self.monitors = monitors
+        self.cycles = cycles
+        self.lock = lock
+        self.progress = progress
+        self.done = done
+        self.chunk_time = chunk_time
+        self.cancelled = threading.Event()
+
+    def cancel(self):
+        """Stop the run after the current chunk."""
+        self.cancelled.set()
+
+    def run(self):
+        """Execute the cycles in chunks, until done or cancelled."""
+        cycles_completed = 0
+        oscillating = False
+        chunk_cycles = 1
+        start = time.perf_counter()
+        try:
+            while (cycles_completed < self.cycles
+                   and not self.cancelled.is_set()):
+                chunk_cycles = min(chunk_cycles,
+                                   self.cycles - cycles_completed)
+                chunk_start = time.perf_counter()
+                with self.lock:
+                    executed = self.network.execute_cycles(
+                        chunk_cycles, self.monitors.record_signals)
+                now = time.perf_counter()
+                cycles_completed += executed
+                self.progress(cycles_completed,
+                              cycles_completed / max(now - start, 1e-9))
+                if executed < chunk_cycles:  # the network oscillates
+                    oscillating = True
+                    break
+                if now - chunk_start < self.chunk_time / 2:
+                    chunk_cycles *= 2
+                elif (now - chunk_start > self.chunk_time * 2
+                      and chunk_cycles > 1):
+                    chunk_cycles //= 2
+        finally:
+            # The GUI waits for done even if the run failed
+            self.done(cycles_completed, oscillating)